@@ -1,25 +1,20 @@
 """
 Career analytics API endpoints
 """
-import os
+import hmac
 import re
-import uuid
 from pathlib import Path
-from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Query, Form
+from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Query, Form, Header
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.services.career.analytics_service import CareerAnalytics
 from app.services.career.company_suggestion_service import CompanySuggestionService
-
-try:
-    from app.services.career.rag_service import RAGEngine
-    _rag_engine = RAGEngine()
-except Exception:
-    _rag_engine = None
+from app.services.career.engine_manager import RAGEngineManager
+from app.services.career.jobs_reloader import JobsReloader
 from app.services.llm.llm_service import LLMService
 from app.services.resume.parser import ResumeParser
+from app.api.v1.resume import parse_http_error
 from app.config import settings
 from app.database.base import get_db
 from app.database.models.pathfinder import (
@@ -35,6 +30,26 @@ from app.database.models.pathfinder import (
 router = APIRouter()
 resume_parser = ResumeParser()
 
+# RAG engine is warmed in the background (started from the app lifespan)
+rag_engines = RAGEngineManager()
+
+
+def _require_rag_engine(feature: str):
+    """Return the warm RAG engine, or raise 503 (with Retry-After while warming up)."""
+    engine = rag_engines.get()
+    if engine is not None:
+        return engine
+    if rag_engines.is_warming:
+        raise HTTPException(
+            status_code=503,
+            detail=f"{feature} is warming up. Retry shortly.",
+            headers={"Retry-After": str(settings.RAG_WARMUP_RETRY_AFTER_SECONDS)},
+        )
+    raise HTTPException(
+        status_code=503,
+        detail=f"{feature} unavailable on this build. Use full requirements for full features."
+    )
+
 # Labels from transcript PDFs that are not course names (Student Information block, etc.)
 _NON_COURSE_LABELS = frozenset({
     "student information", "student id", "student name", "phone", "address", "advisor",
@@ -151,56 +166,53 @@ def _assign_grade_credits_from_cells(cells: list, start_idx: int, credits_col: i
     return (grade or None, credits or None)
 
 
-def _extract_course_grades_from_pdf_tables(file_path: str) -> list:
+def _course_grades_from_tables(tables: list) -> list:
     """
     Extract course, credits, and grade from PDF tables (e.g. SFBU transcript).
     Uses header row when present (Credits / Grade columns); else detects by format.
-    Returns list of dicts: [{"course", "grade", "credits"}].
+    Takes pdfplumber tables; returns list of dicts: [{"course", "grade", "credits"}].
     """
     try:
-        import pdfplumber
         out = []
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                tables = page.extract_tables()
-                for table in (tables or []):
-                    if not table or len(table) < 2:
-                        continue
-                    credits_col, grade_col = None, None
-                    header_skipped = False
-                    for i, row in enumerate(table):
-                        if not row or not any(cell and str(cell).strip() for cell in row):
-                            continue
-                        cells = [str(c or "").strip() for c in row]
-                        # Detect header: row containing "Credits" and/or "Grade"
-                        if i == 0 or not header_skipped:
-                            cr_idx, gr_idx = _find_credits_grade_columns(cells)
-                            if cr_idx is not None or gr_idx is not None:
-                                credits_col, grade_col = cr_idx, gr_idx
-                                header_skipped = True
-                                if cells and cells[0].lower() in ("course", "course name", "subject", "code", "credits", "grade"):
-                                    continue
-                        if i == 0 and cells and cells[0].lower() in ("course", "course name", "subject", "code"):
-                            continue
-                        # Course: first column is often code (CS501) or combined code+name
-                        course = (cells[0] or "").strip() or None
-                        if not _is_course_row(course):
+        for table in tables:
+            if not table or len(table) < 2:
+                continue
+            credits_col, grade_col = None, None
+            header_skipped = False
+            for i, row in enumerate(table):
+                if not row or not any(cell and str(cell).strip() for cell in row):
+                    continue
+                cells = [str(c or "").strip() for c in row]
+                # Detect header: row containing "Credits" and/or "Grade"
+                if i == 0 or not header_skipped:
+                    cr_idx, gr_idx = _find_credits_grade_columns(cells)
+                    if cr_idx is not None or gr_idx is not None:
+                        credits_col, grade_col = cr_idx, gr_idx
+                        header_skipped = True
+                        if cells and cells[0].lower() in ("course", "course name", "subject", "code", "credits", "grade"):
                             continue
-                        # If we have a second column that looks like a long title and first is short code, use both for course
-                        if len(cells) >= 2 and cells[1] and _looks_like_credits(cells[1]) is False and _looks_like_grade(cells[1]) is False:
-                            maybe_name = (cells[1] or "").strip()
-                            if len(maybe_name) > len(course or "") and " - " in maybe_name:
-                                course = maybe_name  # e.g. "DS512 - Data Engineering"
-                        start_idx = 1 if course == (cells[0] or "").strip() else 2
-                        grade, credits = _assign_grade_credits_from_cells(cells, start_idx, credits_col, grade_col)
-                        out.append({"course": course or "", "grade": grade, "credits": credits})
+                if i == 0 and cells and cells[0].lower() in ("course", "course name", "subject", "code"):
+                    continue
+                # Course: first column is often code (CS501) or combined code+name
+                course = (cells[0] or "").strip() or None
+                if not _is_course_row(course):
+                    continue
+                # If we have a second column that looks like a long title and first is short code, use both for course
+                if len(cells) >= 2 and cells[1] and _looks_like_credits(cells[1]) is False and _looks_like_grade(cells[1]) is False:
+                    maybe_name = (cells[1] or "").strip()
+                    if len(maybe_name) > len(course or "") and " - " in maybe_name:
+                        course = maybe_name  # e.g. "DS512 - Data Engineering"
+                start_idx = 1 if course == (cells[0] or "").strip() else 2
+                grade, credits = _assign_grade_credits_from_cells(cells, start_idx, credits_col, grade_col)
+                out.append({"course": course or "", "grade": grade, "credits": credits})
         return _filter_course_rows(out)[:120]
     except Exception:
         return []
 
 
 # Initialize services
-career_analytics = CareerAnalytics()
+# Analytics are read from the current jobs snapshot, which hot-reloads when the jobs CSV changes
+jobs_reloader = JobsReloader(rag_engines=rag_engines)
 company_suggestion_service = CompanySuggestionService()
 llm_service = LLMService()
 
@@ -209,6 +221,7 @@ class CareerInsightsRequest(BaseModel):
     """Request model for career insights"""
     resume_text: str
     user_query: Optional[str] = None
+    fast: bool = False  # Single LLM call: local skill matching + direct resume retrieval
 
 
 class SkillDemandRequest(BaseModel):
@@ -222,6 +235,26 @@ class SalaryInsightsRequest(BaseModel):
     experience_level: Optional[int] = None
 
 
+class AdjacentSkillsRequest(BaseModel):
+    """Request model for adjacent skills to learn"""
+    user_skills: List[str]
+    limit: int = Field(10, ge=1, le=50)
+
+
+class BatchJobSearchRequest(BaseModel):
+    """Request model for searching jobs for several queries at once"""
+    queries: List[str]
+    limit: int = 10
+    mode: Optional[str] = None
+    industry: Optional[str] = None
+    role_category: Optional[str] = None
+    experience_min: Optional[float] = None
+    experience_max: Optional[float] = None
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    deduplicate: bool = True
+
+
 class CompanySuggestionsRequest(BaseModel):
     """Request model for company suggestions from coursework, projects, interests"""
     coursework: Optional[List[str]] = None
@@ -260,15 +293,12 @@ async def get_career_insights(request: CareerInsightsRequest):
     Returns:
         Career insights data
     """
-    if _rag_engine is None:
-        raise HTTPException(
-            status_code=503,
-            detail="Career insights (RAG) unavailable on this build. Use full requirements for full features."
-        )
+    rag_engine = _require_rag_engine("Career insights (RAG)")
     try:
-        insights = await _rag_engine.get_career_insights(
+        insights = await rag_engine.get_career_insights(
             request.resume_text,
-            request.user_query
+            request.user_query,
+            fast=request.fast
         )
         return insights
     except Exception as e:
@@ -287,7 +317,7 @@ async def get_skill_demand(request: SkillDemandRequest):
         Skill demand analysis
     """
     try:
-        analysis = career_analytics.get_skill_demand_analysis(request.user_skills)
+        analysis = jobs_reloader.analytics.get_skill_demand_analysis(request.user_skills)
         return analysis
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -305,7 +335,7 @@ async def get_salary_insights(request: SalaryInsightsRequest):
         Salary statistics
     """
     try:
-        insights = career_analytics.get_salary_insights(
+        insights = jobs_reloader.analytics.get_salary_insights(
             request.user_skills,
             request.experience_level
         )
@@ -326,12 +356,59 @@ async def get_industry_insights(request: SkillDemandRequest):
         Industry distribution
     """
     try:
-        insights = career_analytics.get_industry_insights(request.user_skills)
+        insights = jobs_reloader.analytics.get_industry_insights(request.user_skills)
         return insights
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/career/market-insights")
+async def get_market_insights(request: SalaryInsightsRequest):
+    """
+    Skill demand, salary insights and industry/role distributions in one call
+    
+    Same sections as /career/skill-demand, /career/salary-insights and
+    /career/industry-insights, computed from one pass over the matching jobs.
+    
+    Args:
+        request: Skills and optional experience level
+        
+    Returns:
+        Market snapshot
+    """
+    try:
+        return jobs_reloader.analytics.get_market_snapshot(
+            request.user_skills,
+            request.experience_level
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/career/market-insights/cache-stats")
+async def market_insights_cache_stats():
+    """Hit-rate and size metrics of the market snapshot cache"""
+    return jobs_reloader.analytics.snapshot_cache.stats()
+
+
+@router.post("/career/adjacent-skills")
+async def get_adjacent_skills(request: AdjacentSkillsRequest):
+    """
+    High-demand skills that usually appear alongside the user's skills but
+    are missing from them, ranked from skill co-occurrence in the job data
+    
+    Args:
+        request: Skills and how many suggestions to return
+        
+    Returns:
+        Adjacent skills with their association scores and demand
+    """
+    try:
+        return jobs_reloader.analytics.get_adjacent_skills(request.user_skills, request.limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/career/extract-courses")
 async def extract_courses(request: ExtractCoursesRequest):
     """
@@ -371,22 +448,19 @@ async def import_course_grades_pdf(file: UploadFile = File(...)):
     """
     if not file.filename or not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Please upload a PDF file (e.g. exported from SFBU course grades).")
-    file_id = str(uuid.uuid4())
-    save_path = settings.UPLOAD_DIR / f"transcript_{file_id}.pdf"
     try:
         content = await file.read()
         if len(content) > settings.MAX_UPLOAD_SIZE:
             raise HTTPException(status_code=400, detail="File too large.")
-        with open(save_path, "wb") as f:
-            f.write(content)
-        # Extract text: try pdfplumber for tables first (better for grades), else pypdf
-        raw_text = await resume_parser.parse_resume(str(save_path), preserve_case=True)
+        # Text via pypdf (OCR for scans) plus pdfplumber tables (better for grades); cached by content hash
+        document = await resume_parser.parse_upload(content, ".pdf", preserve_case=True, with_tables=True)
+        raw_text = document.text
         if not raw_text or len(raw_text.strip()) < 20:
             raise HTTPException(
                 status_code=400,
                 detail="Could not extract enough text from the PDF. Try exporting again or use a PDF with selectable text.",
             )
-        course_grades = _extract_course_grades_from_pdf_tables(str(save_path))
+        course_grades = _course_grades_from_tables(document.tables or [])
         if not course_grades:
             course_grades = await llm_service.extract_course_grades_from_text(raw_text)
             course_grades = llm_service.fill_grades_credits_from_text(course_grades, raw_text)
@@ -399,149 +473,8 @@ async def import_course_grades_pdf(file: UploadFile = File(...)):
             "extracted_text_preview": raw_text[:500],
             "extracted_text": raw_text[:8000],
         }
-    except HTTPException:
-        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if save_path.exists():
-            try:
-                os.remove(save_path)
-            except Exception:
-                pass
-
-
-def _extract_text_from_pdf_plumber(file_path: str) -> str:
-    """Fallback PDF text extraction using pdfplumber (often better for complex layouts)."""
-    try:
-        import pdfplumber
-        parts = []
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                t = page.extract_text()
-                if t and t.strip():
-                    parts.append(t.strip())
-        return "\n".join(parts).strip()
-    except Exception:
-        return ""
-
-
-def _extract_shape_text(shape) -> str:
-    """Recursively extract text from a shape (handles groups, tables)."""
-    parts = []
-    try:
-        from pptx.enum.shapes import MSO_SHAPE_TYPE
-        if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
-            for child in shape.shapes:
-                t = _extract_shape_text(child)
-                if t:
-                    parts.append(t)
-        else:
-            if shape.has_text_frame:
-                for para in shape.text_frame.paragraphs:
-                    if para.text and para.text.strip():
-                        parts.append(para.text.strip())
-            if shape.has_table:
-                for row in shape.table.rows:
-                    for cell in row.cells:
-                        if cell.text and cell.text.strip():
-                            parts.append(cell.text.strip())
-    except Exception:
-        pass
-    return "\n".join(p for p in parts if p)
-
-
-def _extract_text_from_pptx_xml(file_path: str) -> str:
-    """Fallback: extract text from PPTX as ZIP + XML when python-pptx returns empty."""
-    import zipfile
-    import xml.etree.ElementTree as ET
-    parts = []
-    try:
-        with zipfile.ZipFile(file_path, "r") as zf:
-            for name in sorted(zf.namelist()):
-                if name.startswith("ppt/slides/slide") and name.endswith(".xml"):
-                    try:
-                        with zf.open(name) as f:
-                            root = ET.parse(f).getroot()
-                            for elem in root.iter():
-                                if elem.tag.endswith("}t"):
-                                    if elem.text:
-                                        t = elem.text.strip()
-                                        if t:
-                                            parts.append(t)
-                                    for child in elem:
-                                        if child.tail and child.tail.strip():
-                                            parts.append(child.tail.strip())
-                    except Exception:
-                        pass
-                if name.startswith("ppt/notesSlides/notesSlide") and name.endswith(".xml"):
-                    try:
-                        with zf.open(name) as f:
-                            root = ET.parse(f).getroot()
-                            for elem in root.iter():
-                                if elem.tag.endswith("}t"):
-                                    if elem.text:
-                                        t = elem.text.strip()
-                                        if t:
-                                            parts.append(t)
-                    except Exception:
-                        pass
-        return "\n".join(parts).strip() if parts else ""
-    except Exception:
-        return ""
-
-
-def _extract_text_from_pptx(file_path: str) -> str:
-    """Extract text from all slides, notes, and shapes in a .pptx file."""
-    try:
-        from pptx import Presentation
-        prs = Presentation(file_path)
-        parts = []
-        for slide in prs.slides:
-            for shape in slide.shapes:
-                t = _extract_shape_text(shape)
-                if t:
-                    parts.append(t)
-            # Extract slide notes
-            try:
-                if slide.has_notes_slide and slide.notes_slide.notes_text_frame:
-                    notes = slide.notes_slide.notes_text_frame.text
-                    if notes and notes.strip():
-                        parts.append(notes.strip())
-            except Exception:
-                pass
-        text = "\n".join(p for p in parts if p).strip()
-        if text:
-            return text
-        # Fallback: extract from PPTX as ZIP + XML (handles shapes python-pptx misses)
-        return _extract_text_from_pptx_xml(file_path)
-    except Exception:
-        return _extract_text_from_pptx_xml(file_path)
-
-
-def _extract_text_from_docx(file_path: str) -> str:
-    """Extract text from a .docx file. Tries docx2txt first (pure Python), then python-docx."""
-    # Try docx2txt first - lightweight, no external deps
-    try:
-        import docx2txt
-        text = docx2txt.process(file_path)
-        if text and text.strip():
-            return text.strip()
-    except Exception:
-        pass
-    # Fallback to python-docx
-    try:
-        from docx import Document
-        doc = Document(file_path)
-        parts = [p.text for p in doc.paragraphs if p.text.strip()]
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip():
-                        parts.append(cell.text)
-        return "\n".join(parts).strip()
-    except Exception:
-        return ""
+        raise parse_http_error(e)
 
 
 @router.post("/career/import-project-files")
@@ -561,41 +494,24 @@ async def import_project_files(files: List[UploadFile] = File(...)):
         if not any(low.endswith(ext) for ext in allowed):
             results.append({"filename": u.filename, "text": "", "error": f"Unsupported format. Use {', '.join(allowed)}"})
             continue
-        file_id = str(uuid.uuid4())
         if low.endswith(".pdf"):
             ext = ".pdf"
         elif low.endswith(".docx"):
             ext = ".docx"
         else:
             ext = ".pptx"
-        save_path = settings.UPLOAD_DIR / f"project_{file_id}{ext}"
         try:
             content = await u.read()
             if len(content) > settings.MAX_UPLOAD_SIZE:
                 results.append({"filename": u.filename, "text": "", "error": "File too large."})
                 continue
-            with open(save_path, "wb") as f:
-                f.write(content)
-            if ext == ".pdf":
-                text = await resume_parser.parse_resume(str(save_path), preserve_case=True)
-                if not (text or "").strip():
-                    text = _extract_text_from_pdf_plumber(str(save_path))
-            elif ext == ".docx":
-                text = _extract_text_from_docx(str(save_path))
-            else:
-                text = _extract_text_from_pptx(str(save_path))
+            text = (await resume_parser.parse_upload(content, ext, preserve_case=True)).text
             text = (text or "").strip()
             results.append({"filename": u.filename, "text": text[:15000], "error": None})
         except HTTPException:
             raise
         except Exception as e:
             results.append({"filename": u.filename, "text": "", "error": str(e)})
-        finally:
-            if save_path.exists():
-                try:
-                    os.remove(save_path)
-                except Exception:
-                    pass
     return {"projects": results}
 
 
@@ -620,23 +536,12 @@ async def save_project_files(
         low = u.filename.lower()
         if not any(low.endswith(ext) for ext in allowed):
             continue
-        file_id = str(uuid.uuid4())
         ext = ".pptx" if low.endswith(".pptx") else ".pdf" if low.endswith(".pdf") else ".docx"
-        save_path = settings.UPLOAD_DIR / f"project_{file_id}{ext}"
         try:
             content_bytes = await u.read()
             if len(content_bytes) > settings.MAX_UPLOAD_SIZE:
                 continue
-            with open(save_path, "wb") as f:
-                f.write(content_bytes)
-            if ext == ".pdf":
-                text = await resume_parser.parse_resume(str(save_path), preserve_case=True)
-                if not (text or "").strip():
-                    text = _extract_text_from_pdf_plumber(str(save_path))
-            elif ext == ".docx":
-                text = _extract_text_from_docx(str(save_path))
-            else:
-                text = _extract_text_from_pptx(str(save_path))
+            text = (await resume_parser.parse_upload(content_bytes, ext, preserve_case=True)).text
             text = (text or "").strip()
             if text:
                 project_texts.append(f"{u.filename}:\n{text[:8000]}")
@@ -644,12 +549,6 @@ async def save_project_files(
                 project_texts.append(f"{u.filename}:\n[Content could not be extracted, infer from filename]")
         except Exception as e:
             project_texts.append(f"{u.filename}:\n[Error: {str(e)}, infer from filename]")
-        finally:
-            if save_path.exists():
-                try:
-                    os.remove(save_path)
-                except Exception:
-                    pass
 
     if not project_texts:
         return {"saved": 0, "message": "No files could be processed"}
@@ -689,28 +588,16 @@ async def extract_resume_pdf(file: UploadFile = File(...)):
     """
     if not file.filename or not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Please upload a PDF file (resume).")
-    file_id = str(uuid.uuid4())
-    save_path = settings.UPLOAD_DIR / f"resume_{file_id}.pdf"
     try:
         content = await file.read()
         if len(content) > settings.MAX_UPLOAD_SIZE:
             raise HTTPException(status_code=400, detail="File too large.")
-        with open(save_path, "wb") as f:
-            f.write(content)
-        raw_text = await resume_parser.parse_resume(str(save_path), preserve_case=True)
+        raw_text = (await resume_parser.parse_upload(content, ".pdf", preserve_case=True)).text
         if not raw_text or len(raw_text.strip()) < 10:
             raise HTTPException(status_code=400, detail="Could not extract enough text from the PDF.")
         return {"resume_text": raw_text}
-    except HTTPException:
-        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if save_path.exists():
-            try:
-                os.remove(save_path)
-            except Exception:
-                pass
+        raise parse_http_error(e)
 
 
 @router.post("/career/analyze-coursework")
@@ -797,29 +684,121 @@ async def generate_roadmap(request: CareerInsightsRequest):
 
 
 @router.get("/career/jobs/search")
-async def search_jobs(query: str, limit: int = 10):
+async def search_jobs(
+    query: str,
+    limit: int = 10,
+    mode: Optional[str] = Query(None, pattern="^(vector|keyword|hybrid)$"),
+    industry: Optional[str] = None,
+    role_category: Optional[str] = None,
+    experience_min: Optional[float] = Query(None, ge=0),
+    experience_max: Optional[float] = Query(None, ge=0),
+    salary_min: Optional[float] = Query(None, ge=0),
+    salary_max: Optional[float] = Query(None, ge=0),
+):
     """
     Search for relevant jobs
     
     Args:
         query: Search query
         limit: Number of results
+        mode: 'vector', 'keyword' or 'hybrid' (BM25 + vector, reciprocal-rank fusion);
+            defaults to RAG_SEARCH_MODE. relevance_score is the 0-1 vector
+            similarity in vector mode, the BM25 score in keyword mode and the
+            fused reciprocal-rank score (at most ~0.033) in hybrid mode
+        industry, role_category: Exact-match pre-filters
+        experience_min, experience_max: Years; jobs whose required range overlaps match
+        salary_min, salary_max: Salary; jobs whose advertised range overlaps match
         
     Returns:
         List of relevant jobs
     """
-    if _rag_engine is None:
-        raise HTTPException(
-            status_code=503,
-            detail="Job search (RAG) unavailable on this build. Use full requirements for full features."
-        )
+    rag_engine = _require_rag_engine("Job search (RAG)")
     try:
-        jobs = _rag_engine.search_relevant_jobs(query, n_results=limit)
+        filters = {
+            "industry": industry,
+            "role_category": role_category,
+            "experience_min": experience_min,
+            "experience_max": experience_max,
+            "salary_min": salary_min,
+            "salary_max": salary_max,
+        }
+        jobs = rag_engine.search_relevant_jobs(query, n_results=limit, mode=mode, filters=filters)
         return {"jobs": jobs}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/career/jobs/search/batch")
+async def search_jobs_batch(request: BatchJobSearchRequest):
+    """
+    Search jobs for several queries in one call (e.g. one per career interest)
+    
+    Args:
+        request: Queries, shared filters and per-query limit
+        
+    Returns:
+        Per-query job lists, deduplicated across queries by default
+    """
+    rag_engine = _require_rag_engine("Job search (RAG)")
+    if not request.queries or len(request.queries) > 20:
+        raise HTTPException(status_code=400, detail="Provide between 1 and 20 queries.")
+    if request.mode not in (None, "vector", "keyword", "hybrid"):
+        raise HTTPException(status_code=400, detail="mode must be vector, keyword or hybrid.")
+    try:
+        filters = request.model_dump(include={
+            "industry", "role_category", "experience_min", "experience_max", "salary_min", "salary_max"
+        })
+        results = rag_engine.search_many(
+            request.queries,
+            n_results=request.limit,
+            mode=request.mode,
+            filters=filters,
+            deduplicate=request.deduplicate,
+        )
+        return {
+            "results": [
+                {"query": query, "jobs": jobs}
+                for query, jobs in zip(request.queries, results)
+            ]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/career/jobs/search/cache-stats")
+async def search_cache_stats():
+    """Hit-rate and size metrics of the job search result cache (the sidecar's, when one serves search)"""
+    rag_engine = _require_rag_engine("Job search (RAG)")
+    if rag_engine.sidecar is not None:
+        return rag_engine.sidecar.call('status')['search_cache']
+    return rag_engine.search_cache.stats()
+
+
+def _require_admin(x_admin_key: Optional[str] = Header(None)):
+    """Allow the request only with the configured X-Admin-Key"""
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (set ADMIN_API_KEY).")
+    if not x_admin_key or not hmac.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(status_code=401, detail="Invalid admin key.")
+
+
+@router.post("/career/admin/reload-jobs", dependencies=[Depends(_require_admin)])
+async def reload_jobs():
+    """
+    Rebuild the job analytics (and the RAG job index) from JOBS_CSV_PATH in the background
+
+    Requests keep being served from the current snapshot until the new one
+    is swapped in; poll GET /career/admin/reload-jobs for the version.
+    """
+    return {**jobs_reloader.trigger('admin'), 'status': jobs_reloader.status()}
+
+
+@router.get("/career/admin/reload-jobs", dependencies=[Depends(_require_admin)])
+async def reload_jobs_status():
+    """Version and state of the loaded jobs snapshot"""
+    return jobs_reloader.status()
+
+
 # --- Profile persistence & related jobs ---
 
 class SaveProfileRequest(BaseModel):
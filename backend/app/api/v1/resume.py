@@ -5,6 +5,7 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
 from typing import Optional
 from pydantic import BaseModel
 from app.services.resume.parser import ResumeParser
+from app.services.resume.parse_pool import DocumentParseBusy, DocumentParseTimeout
 from app.services.llm.llm_service import LLMService
 import os
 import uuid
@@ -26,6 +27,19 @@ router = APIRouter()
 parser = ResumeParser()
 llm_service = LLMService()
 
+_PARSE_RETRY_AFTER_SECONDS = 2
+
+
+def parse_http_error(e: Exception) -> HTTPException:
+    """HTTP error for a failed upload: 503 when the parse pool is full, 504 when parsing timed out, else 500"""
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, DocumentParseBusy):
+        return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(_PARSE_RETRY_AFTER_SECONDS)})
+    if isinstance(e, DocumentParseTimeout):
+        return HTTPException(status_code=504, detail=str(e))
+    return HTTPException(status_code=500, detail=str(e))
+
 
 class ResumeAnalysisResponse(BaseModel):
     """Response model for resume analysis"""
@@ -79,8 +93,8 @@ async def upload_resume(file: UploadFile = File(...)):
         f.write(content)
     
     try:
-        # Parse resume
-        extracted_text = await parser.parse_resume(str(file_path))
+        # Parse resume (an identical earlier upload is served from the parse cache)
+        extracted_text = (await parser.parse_upload(content, file_ext, file_path=str(file_path))).text
         
         # Extract skills using LLM
         skills_summary = await llm_service.extract_skills(extracted_text)
@@ -100,7 +114,7 @@ async def upload_resume(file: UploadFile = File(...)):
         # Clean up file on error
         if file_path.exists():
             os.remove(file_path)
-        raise HTTPException(status_code=500, detail=str(e))
+        raise parse_http_error(e)
 
 
 @router.post("/resume/gap-analysis", response_model=GapAnalysisResponse)
@@ -150,6 +164,12 @@ async def analyze_gap(request: GapAnalysisRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/resume/parse-metrics")
+async def parse_metrics():
+    """Document parse pool queue depth, outcomes and parse times, and parse cache hit rate"""
+    return {**parser.pool.metrics(), 'cache': parser.cache.stats()}
+
+
 @router.get("/resume/{resume_id}")
 async def get_resume(resume_id: str):
     """
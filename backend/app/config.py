@@ -56,15 +56,43 @@ class Settings(BaseSettings):
     # ChromaDB
     CHROMA_DB_PATH: str = str(ROOT_DIR / "chroma_db")
     VECTOR_DB_COLLECTION: str = "job_database"
+    BM25_INDEX_PATH: str = str(ROOT_DIR / "chroma_db" / "job_bm25.pkl")
+    VECTOR_SIDECAR_SOCKET: Optional[str] = None  # Unix socket of the shared vector search sidecar
+    VECTOR_SIDECAR_CONNECT_TIMEOUT: float = 300.0
+    JOB_INDEX_SNAPSHOT_PATH: Optional[str] = None  # Serve a read-only, memory-mapped index snapshot instead of Chroma
     
     # File Upload
     UPLOAD_DIR: Path = ROOT_DIR / "uploads"
     MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024  # 50MB
     ALLOWED_EXTENSIONS: list = [".pdf", ".docx", ".txt"]
+    DOCUMENT_PARSE_WORKERS: int = 2  # Processes parsing uploads; 0 parses in threads (overruns cannot be stopped)
+    DOCUMENT_PARSE_MAX_PENDING: int = 16  # Documents waiting or parsing before uploads get 503
+    DOCUMENT_PARSE_TIMEOUT_SECONDS: float = 60.0  # Per parse task (a document, or one OCR page), queue wait included; the worker is killed on overrun
+    DOCUMENT_CACHE_MAX_ENTRIES: int = 256  # Parsed uploads kept by content hash so repeat uploads skip parsing; 0 disables
+    DOCUMENT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Approximate text bytes those entries may hold
+    DOCUMENT_CACHE_TTL_SECONDS: float = 86400.0
+    OCR_DPI: int = 200  # Render resolution for scanned PDFs (tesseract reads best at 200-300)
+    OCR_DESKEW_MAX_SIDE: int = 1000  # Longest side (pixels) of the copy the skew angle is estimated on; 0 = full page
     
     # RAG Settings
     RAG_SEARCH_RESULTS_LIMIT: int = 15
     RAG_BATCH_SIZE: int = 100
+    RAG_SEARCH_MODE: str = "vector"  # Default 'vector', 'keyword' or 'hybrid' (reciprocal-rank fusion); requests can pick one
+    RAG_FUSION_DEPTH: int = 3  # Candidates fetched per ranker = n_results * depth
+    RAG_INSIGHTS_CANDIDATES: int = 12  # Jobs retrieved before MMR packing
+    RAG_CONTEXT_TOKEN_BUDGET: int = 400  # Estimated prompt tokens for the jobs context
+    RAG_MMR_LAMBDA: float = 0.7  # 1.0 = pure relevance, lower favours diversity
+    RAG_NEAR_DUPLICATE_THRESHOLD: float = 0.95  # Cosine similarity treated as a duplicate posting
+    RAG_CACHE_MAX_ENTRIES: int = 1024  # 0 disables the search result cache
+    RAG_CACHE_TTL_SECONDS: float = 600.0
+    RAG_CORPUS_CHECK_SECONDS: float = 5.0  # How often searches re-read the corpus version from Chroma; 0 = every search
+    RAG_WARMUP_RETRY_AFTER_SECONDS: int = 5
+    INGEST_CHUNK_SIZE: int = 5000  # CSV rows read per chunk during ingestion
+    JOB_DEDUP_ENABLED: bool = True  # Drop near-duplicate (reposted) jobs at ingest
+    JOB_DEDUP_THRESHOLD: float = 0.8  # Estimated Jaccard similarity of title/skills/experience/industry fields
+    JOB_DEDUP_NUM_PERM: int = 64
+    JOB_DEDUP_BANDS: int = 16
+    JOB_DEDUP_WINDOW_ROWS: int = 1_000_000  # Out-of-core loads compare against the last 1-2x this many kept jobs (~400 B each); 0 = all
     
     # LLM Settings
     MAX_TOKENS_DEFAULT: int = 500
@@ -72,6 +100,17 @@ class Settings(BaseSettings):
     
     # Job Search
     JOBS_CSV_PATH: Optional[str] = None
+    SALARY_SKETCH_K: int = 200  # KLL accuracy parameter (~1.3% rank error at 200)
+    MARKET_SNAPSHOT_CACHE_MAX_ENTRIES: int = 512  # Cached market snapshots per skill set; 0 disables
+    MARKET_SNAPSHOT_CACHE_TTL_SECONDS: float = 3600.0
+    SKILL_COOCCURRENCE_MIN_COUNT: int = 5  # Jobs two skills must share before one is suggested for the other
+    JOBS_CACHE_DIR: Optional[str] = str(ROOT_DIR / "cache" / "jobs")  # Preprocessed analytics cache; empty disables
+    ANALYTICS_OUT_OF_CORE: bool = False  # Serve analytics from the memory-mapped cache in row groups (needs JOBS_CACHE_DIR)
+    ANALYTICS_ROW_GROUP_ROWS: int = 250_000  # Rows per out-of-core row group
+    ANALYTICS_WORKERS: int = 0  # Processes/threads for out-of-core loads and scans; 0 = CPU count
+    JOBS_RELOAD_POLL_SECONDS: float = 30.0  # How often to check JOBS_CSV_PATH for changes; 0 disables watching
+    JOBS_RELOAD_RAG: bool = True  # Also rebuild the RAG job index on reload (local Chroma store only; one worker rebuilds, the rest reopen it)
+    ADMIN_API_KEY: Optional[str] = None  # X-Admin-Key for admin endpoints; unset disables them
     
     class Config:
         env_file = ".env"
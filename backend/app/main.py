@@ -5,10 +5,14 @@ FastAPI application entry point
 import warnings
 warnings.filterwarnings("ignore", message=".*ARC4.*", category=DeprecationWarning, module=".*cryptography.*")
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.config import settings
 from app.api.v1 import resume, career, auth
+from app.services.career.engine_manager import FAILED, READY, UNAVAILABLE
+from app.services.resume.parse_pool import document_parse_pool
 
 # Optional: alumni and students need DB (greenlet + asyncpg). Include only if DB is available.
 _alumni = _students = None
@@ -18,11 +22,22 @@ try:
 except Exception:
     pass
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Bind immediately; warm the RAG encoder and job index in the background"""
+    career.rag_engines.start()
+    career.jobs_reloader.start()
+    yield
+    career.jobs_reloader.stop()
+    document_parse_pool.close()
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
-    description="AI-powered career navigation platform"
+    description="AI-powered career navigation platform",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -58,3 +73,31 @@ async def root():
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
+
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness endpoint, by RAG engine state
+
+    - idle/warming: 503 with Retry-After; the engine is still loading
+    - ready: 200
+    - failed: 503 without Retry-After (warm-up is not retried) and the
+      error; the instance needs attention rather than more time
+    - unavailable: 200; the build has no RAG dependencies, so the instance
+      is as ready as it will get and RAG routes answer 503 themselves
+    """
+    rag_status = career.rag_engines.status()
+    state = career.rag_engines.state
+    content = {"ready": state in (READY, UNAVAILABLE), "rag": rag_status,
+               "jobs_data_version": career.jobs_reloader.version}
+    if state == FAILED:
+        content["error"] = career.rag_engines.error
+        return JSONResponse(status_code=503, content=content)
+    if career.rag_engines.is_warming:
+        return JSONResponse(
+            status_code=503,
+            content=content,
+            headers={"Retry-After": str(settings.RAG_WARMUP_RETRY_AFTER_SECONDS)},
+        )
+    return JSONResponse(status_code=200, content=content)
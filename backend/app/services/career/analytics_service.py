@@ -2,16 +2,85 @@
 Career analytics service
 Adapted from AI-Resume-Summarizer---Career-Navigator-main/src/career_analytics.py
 """
+import numpy as np
 import pandas as pd
-import re
-from typing import Dict, List, Any, Optional
-from collections import Counter
+from pandas.api.types import union_categoricals
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 from app.config import settings
+from app.services.career.dedup import make_dedup_filter
+from app.services.career.ingestion import JOB_COLUMNS, iter_job_chunks
+from app.services.career.job_parsing import (
+    parse_experience_column, parse_salary_column, parse_skills_matrix
+)
+from app.services.career.jobs_cache import load_jobs_cache, save_jobs_cache
+from app.services.career.quantile_sketch import KLLSketch, SkillSalarySketches
+from app.services.career.search_cache import QueryResultCache
+from app.services.career.skill_cooccurrence import SkillCooccurrence
+from app.services.career.skill_index import SkillIndex, SkillMatrix
+from app.services.career.title_index import TitleIndex
+
+
+_DERIVED_COLUMNS = ('salary_clean', 'experience_years')
+
+
+class ReadOnlyAnalyticsError(RuntimeError):
+    """The analytics service cannot add or remove jobs (out-of-core mode)"""
+
+
+def _categorize(df: pd.DataFrame) -> pd.DataFrame:
+    """Store the text columns as categoricals (codes into one copy of each distinct string)"""
+    for name in df.columns:
+        dtype = df[name].dtype
+        if (name not in _DERIVED_COLUMNS and not pd.api.types.is_numeric_dtype(dtype)
+                and not isinstance(dtype, pd.CategoricalDtype)):
+            df[name] = df[name].astype('category')
+    return df
+
+
+def sketch_entries(
+    sketches: SkillSalarySketches,
+    jobs_df: pd.DataFrame,
+    entry_rows: np.ndarray,
+    entry_skills: np.ndarray,
+    n_skills: int
+):
+    """Fold (row position, skill id) entries into salary sketches, once per distinct pair"""
+    _, first = np.unique(entry_rows * n_skills + entry_skills, return_index=True)
+    entry_rows = entry_rows[first]
+    sketches.add_entries(
+        entry_skills[first],
+        jobs_df['experience_years'].to_numpy(dtype=np.float64)[entry_rows],
+        jobs_df['salary_clean'].to_numpy(dtype=np.float64)[entry_rows]
+    )
+
+
+def _concat_compact(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate job frames, keeping each text column categorical over the union of its categories"""
+    frames = [frame.copy(deep=False) for frame in frames]
+    for name in dict.fromkeys(name for frame in frames for name in frame.columns):
+        parts = [frame[name] for frame in frames if name in frame]
+        if len(parts) < len(frames) or not all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            continue  # Re-categorized after the concat
+        try:
+            categories = union_categoricals(parts).categories
+        except TypeError:  # Categories of different types
+            continue
+        for frame in frames:
+            frame[name] = frame[name].cat.set_categories(categories)
+    return _categorize(pd.concat(frames, sort=False))
 
 
 class CareerAnalytics:
-    """Career analytics and insights service"""
+    """
+    Career analytics and insights service
+    
+    This in-memory service supports add_jobs/remove_jobs. The out-of-core
+    subclass (OutOfCoreAnalytics, ANALYTICS_OUT_OF_CORE) is read-only: its
+    read_only is True and both raise ReadOnlyAnalyticsError.
+    """
+    
+    read_only = False  # True when add_jobs/remove_jobs raise ReadOnlyAnalyticsError
     
     def __init__(self, jobs_csv_path: Optional[str] = None):
         """
@@ -22,70 +91,182 @@ class CareerAnalytics:
         """
         self.jobs_csv_path = jobs_csv_path or settings.JOBS_CSV_PATH
         self.jobs_df = None
+        self.dedup_report: Optional[Dict[str, Any]] = None
+        self.skill_index: Optional[SkillIndex] = None
+        self.salary_sketches: Optional[SkillSalarySketches] = None
+        self.title_index: Optional[TitleIndex] = None
+        self.cooccurrence: Optional[SkillCooccurrence] = None
+        self.snapshot_cache = QueryResultCache(
+            max_entries=settings.MARKET_SNAPSHOT_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.MARKET_SNAPSHOT_CACHE_TTL_SECONDS
+        )
+        self.loaded_from_cache = False
         
         if self.jobs_csv_path and Path(self.jobs_csv_path).exists():
-            self.jobs_df = pd.read_csv(self.jobs_csv_path)
-            self._preprocess_data()
+            self.jobs_df = self._load_jobs(self.jobs_csv_path)
+    
+    def _load_jobs(self, csv_path: str) -> Optional[pd.DataFrame]:
+        """Load the preprocessed frame from the columnar cache, or build it from the CSV and cache it"""
+        if settings.JOBS_CACHE_DIR:
+            cached = load_jobs_cache(csv_path)
+            if cached is not None:
+                jobs_df, skills, manifest = cached
+                self._build_indexes(jobs_df, skills)
+                self.dedup_report = manifest.get('dedup')
+                self.loaded_from_cache = True
+                return jobs_df
+        
+        parsed = self._parse_jobs(csv_path)
+        if parsed is None:
+            return None
+        jobs_df, skills = parsed
+        self._build_indexes(jobs_df, skills)
+        if settings.JOBS_CACHE_DIR:
+            try:
+                save_jobs_cache(csv_path, jobs_df, skills, self.dedup_report)
+            except OSError as e:
+                print(f"Could not write jobs cache: {e}")
+        return jobs_df
+    
+    def _parse_jobs(self, csv_path: str) -> Optional[Tuple[pd.DataFrame, SkillMatrix]]:
+        """Stream the CSV in chunks, keeping only analytics columns, deduplicated and preprocessed per chunk"""
+        dedup = make_dedup_filter()
+        parsed = [
+            self._preprocess_frame(chunk.drop(columns=['source_file']))
+            for chunk in iter_job_chunks([csv_path], columns=JOB_COLUMNS, dedup=dedup)
+        ]
+        if dedup is not None:
+            self.dedup_report = dedup.report()
+        if not parsed:
+            return None
+        frames, matrices = zip(*parsed)
+        return _concat_compact(list(frames)), SkillMatrix.concat(list(matrices))
     
     def _preprocess_data(self):
         """Preprocess job data for analytics"""
         if self.jobs_df is None:
             return
+        self.jobs_df, skills = self._preprocess_frame(self.jobs_df)
+        self._build_indexes(self.jobs_df, skills)
+    
+    def _build_indexes(self, jobs_df: pd.DataFrame, skills: SkillMatrix):
+        """
+        Index skills once (filters become posting-list unions), sketch
+        salaries per skill, index titles and count skill co-occurrences
+        """
+        self.skill_index = SkillIndex(skills)
+        self.title_index = TitleIndex.from_frame(jobs_df, skills)
+        self.cooccurrence = SkillCooccurrence.from_matrix(skills)
+        self.salary_sketches = SkillSalarySketches(k=settings.SALARY_SKETCH_K)
+        self._sketch_entries(jobs_df, skills.row_ids(), skills.indices)
+    
+    def _sketch_entries(self, jobs_df: pd.DataFrame, entry_rows: np.ndarray, entry_skills: np.ndarray):
+        """Fold (row position, skill id) entries into the salary sketches, once per distinct pair"""
+        sketch_entries(self.salary_sketches, jobs_df, entry_rows, entry_skills, len(self.skill_index.matrix.vocab))
+    
+    def add_jobs(self, jobs: pd.DataFrame) -> int:
+        """
+        Add raw job rows (CSV columns) to the loaded dataset
         
-        # Clean salary data
-        self.jobs_df['salary_clean'] = self.jobs_df.get('Job Salary', pd.Series()).apply(
-            self._extract_salary
-        )
+        The skill index, salary sketches, title index and co-occurrence
+        counts are updated incrementally rather than rebuilt.
         
-        # Extract experience years
-        self.jobs_df['experience_years'] = self.jobs_df.get(
-            'Job Experience Required', pd.Series()
-        ).apply(self._extract_experience)
+        Returns:
+            Number of rows added
         
-        # Clean skills data
-        self.jobs_df['skills_list'] = self.jobs_df.get('Key Skills', pd.Series()).apply(
-            self._extract_skills
-        )
+        Raises:
+            ReadOnlyAnalyticsError: The service is read-only (see read_only)
+        """
+        new_rows, new_skills = self._preprocess_frame(jobs[[c for c in JOB_COLUMNS if c in jobs]].copy())
+        if self.jobs_df is None or self.skill_index is None:
+            self.jobs_df = new_rows.reset_index(drop=True)
+            self._build_indexes(self.jobs_df, new_skills)
+            return len(new_rows)
+        start = int(self.jobs_df.index.max()) + 1 if len(self.jobs_df) else 0
+        new_rows.index = pd.RangeIndex(start, start + len(new_rows))
+        self.jobs_df = _concat_compact([self.jobs_df, new_rows])
+        added = self.skill_index.add_rows(new_skills)
+        matrix = self.skill_index.matrix
+        entry_rows = np.repeat(np.arange(added.start, added.stop), np.diff(matrix.indptr[added.start:]))
+        self._sketch_entries(self.jobs_df, entry_rows, matrix.indices[matrix.indptr[added.start]:])
+        self.title_index.add_rows(new_rows)
+        self.cooccurrence.update(matrix, np.arange(added.start, added.stop))
+        return len(new_rows)
     
-    @staticmethod
-    def _extract_salary(salary_str) -> Optional[float]:
-        """Extract numeric salary (handle ranges too)"""
-        if pd.isna(salary_str) or 'Not Disclosed' in str(salary_str):
-            return None
+    def remove_jobs(self, labels: List[int]) -> int:
+        """
+        Remove jobs by index label
         
-        numbers = re.findall(r'[\d,]+', str(salary_str))
-        if numbers:
-            try:
-                values = [int(num.replace(',', '')) for num in numbers]
-                if len(values) >= 2:
-                    return sum(values) / len(values)  # Average of range
-                return float(values[0])
-            except Exception:
-                return None
-        return None
-    
-    @staticmethod
-    def _extract_experience(exp_str) -> Optional[int]:
-        """Extract years of experience (handle ranges too)"""
-        if pd.isna(exp_str):
-            return None
+        Rows are tombstoned in the skill index (so counts and filters drop them
+        immediately) and only the salary sketches of the skills they listed
+        are rebuilt, as are the title aggregates of the removed rows' titles;
+        their skill pairs are subtracted from the co-occurrence counts.
         
-        numbers = re.findall(r'\d+', str(exp_str))
-        if numbers:
-            values = list(map(int, numbers))
-            if len(values) >= 2:
-                return sum(values) // len(values)  # Average of range
-            return values[0]
-        return None
+        Returns:
+            Number of rows removed
+        
+        Raises:
+            ReadOnlyAnalyticsError: The service is read-only (see read_only)
+        """
+        if self.jobs_df is None:
+            return 0
+        positions = self.jobs_df.index.get_indexer(labels)
+        positions = np.unique(positions[positions >= 0])
+        before = self.active_rows()
+        removed = self.skill_index.removed
+        self.cooccurrence.update(
+            self.skill_index.matrix, positions if removed is None else positions[~removed[positions]], sign=-1
+        )
+        affected = self.skill_index.remove_rows(positions)
+        
+        # KLL sketches cannot delete values, so re-sketch the touched skills from their remaining rows
+        self.salary_sketches.drop_skills(affected.tolist())
+        matrix = self.skill_index.matrix
+        entry_rows = matrix.row_ids()
+        keep = np.isin(matrix.indices, affected) & ~self.skill_index.removed[entry_rows]
+        self._sketch_entries(self.jobs_df, entry_rows[keep], matrix.indices[keep])
+        self.title_index.remove_rows(positions)
+        return before - self.active_rows()
     
-    @staticmethod
-    def _extract_skills(skills_str) -> List[str]:
-        """Extract skills list from skills string"""
-        if pd.isna(skills_str):
-            return []
+    @property
+    def loaded(self) -> bool:
+        """Whether job data is available to the get_* methods"""
+        return self.skill_index is not None
+    
+    def active_rows(self) -> int:
+        """Rows not removed with remove_jobs"""
+        if self.jobs_df is None:
+            return 0
+        removed = self.skill_index.removed
+        return len(self.jobs_df) - (0 if removed is None else int(removed.sum()))
+    
+    def _active_jobs(self) -> pd.DataFrame:
+        """The jobs frame without removed rows"""
+        removed = self.skill_index.removed if self.skill_index is not None else None
+        return self.jobs_df if removed is None else self.jobs_df[~removed]
+    
+    @property
+    def skills(self) -> Optional[SkillMatrix]:
+        """Skills of every row (CSR over the interned vocabulary), aligned with jobs_df"""
+        return self.skill_index.matrix if self.skill_index is not None else None
+    
+    @classmethod
+    def _preprocess_frame(cls, df: pd.DataFrame) -> Tuple[pd.DataFrame, SkillMatrix]:
+        """
+        Add the derived salary and experience columns to a job frame and parse its skills
+        
+        Key Skills is replaced by the returned CSR skill matrix (one row per
+        frame row) and the other text columns become categoricals.
+        """
+        # Clean salary data
+        df['salary_clean'] = parse_salary_column(df.get('Job Salary', pd.Series()))
         
-        skills = re.split(r'[|,;]+', str(skills_str))
-        return [skill.strip().lower() for skill in skills if skill.strip()]
+        # Extract experience years
+        df['experience_years'] = parse_experience_column(df.get('Job Experience Required', pd.Series()))
+        
+        # Clean skills data
+        skills = parse_skills_matrix(df['Key Skills'] if 'Key Skills' in df else pd.Series(np.nan, index=df.index))
+        return _categorize(df.drop(columns=['Key Skills'], errors='ignore')), skills
     
     def get_salary_insights(
         self,
@@ -102,42 +283,94 @@ class CareerAnalytics:
         Returns:
             Dictionary with salary statistics
         """
-        if self.jobs_df is None:
+        if not self.loaded:
             return {"message": "Job data not available"}
         
-        # Filter relevant jobs
-        relevant_jobs = self.jobs_df[
-            self.jobs_df['skills_list'].apply(
-                lambda skills: any(skill.lower() in str(skills).lower() for skill in user_skills)
-            )
-        ].copy()
-        
+        skill_ids = self.skill_index.matched_skill_ids(user_skills)
+        return self._salary_insights(skill_ids, self._matching_rows(skill_ids), experience_level)
+    
+    def _matching_rows(self, skill_ids: Optional[set]) -> np.ndarray:
+        """Active rows listing any of skill_ids (None means every row)"""
+        return self.skill_index.rows_with_skills(skill_ids)
+    
+    def _salary_insights(
+        self,
+        skill_ids: Optional[set],
+        matched_rows: np.ndarray,
+        experience_level: Optional[int]
+    ) -> Dict[str, Any]:
+        """Salary statistics for the rows matched by skill_ids"""
+        low = high = None
         if experience_level:
-            relevant_jobs = relevant_jobs[
-                (relevant_jobs['experience_years'] >= experience_level - 2) &
-                (relevant_jobs['experience_years'] <= experience_level + 2)
-            ]
+            low, high = experience_level - 2, experience_level + 2
         
-        salary_data = relevant_jobs['salary_clean'].dropna()
+        # Merged per-skill sketches count a posting once per matching skill, so
+        # they only answer when the matched skills never share a posting
+        disjoint = skill_ids is not None and (
+            sum(self.skill_index.document_frequency(i) for i in skill_ids) == len(matched_rows)
+        )
+        if disjoint:
+            sketch = self.salary_sketches.merged(skill_ids, low, high)
+            if sketch.count == 0:
+                return {"message": "No salary data available for your profile"}
+            return {
+                'stats': self._sketch_stats(sketch),
+                'relevant_jobs_count': len(self._rows_within(matched_rows, low, high))
+            }
         
-        if len(salary_data) == 0:
+        rows = self._rows_within(matched_rows, low, high)
+        salary_stats = self._exact_salary_stats(rows)
+        if salary_stats is None:
             return {"message": "No salary data available for your profile"}
         
-        salary_stats = {
+        return {
+            'stats': salary_stats,
+            'relevant_jobs_count': len(rows)
+        }
+    
+    def _rows_within(self, rows: np.ndarray, low: Optional[int], high: Optional[int]) -> np.ndarray:
+        """The rows whose experience is within [low, high] (all rows when there is no range)"""
+        if low is None:
+            return rows
+        years = self.jobs_df['experience_years'].to_numpy(dtype=np.float64)[rows]
+        return rows[(years >= low) & (years <= high)]
+    
+    def _exact_salary_stats(self, rows: np.ndarray) -> Optional[Dict[str, Any]]:
+        """Salary statistics over the rows' parsed salaries, None when none has one"""
+        salary_data = pd.Series(
+            self.jobs_df['salary_clean'].to_numpy(dtype=np.float64)[rows]
+        ).dropna()
+        
+        if len(salary_data) == 0:
+            return None
+        
+        return {
             'median': float(salary_data.median()),
             'mean': float(salary_data.mean()),
             'min': float(salary_data.min()),
             'max': float(salary_data.max()),
             'percentile_25': float(salary_data.quantile(0.25)),
             'percentile_75': float(salary_data.quantile(0.75)),
-            'sample_size': len(salary_data)
-        }
-        
-        return {
-            'stats': salary_stats,
-            'relevant_jobs_count': len(relevant_jobs)
+            'sample_size': len(salary_data),
+            'method': 'exact'
         }
     
+    @staticmethod
+    def _sketch_stats(sketch: KLLSketch) -> Dict[str, Any]:
+        """Salary statistics from a quantile sketch, with rank-error bounds on the quantiles"""
+        quantiles = {'median': 0.5, 'percentile_25': 0.25, 'percentile_75': 0.75}
+        stats = {name: sketch.quantile(q) for name, q in quantiles.items()}
+        stats.update({
+            'mean': sketch.total / sketch.count,
+            'min': sketch.min,
+            'max': sketch.max,
+            'sample_size': sketch.count,
+            'method': 'sketch',
+            'rank_error': sketch.rank_error,
+            'bounds': {name: list(sketch.quantile_bounds(q)) for name, q in quantiles.items()}
+        })
+        return stats
+    
     def get_skill_demand_analysis(self, user_skills: List[str]) -> Dict[str, Any]:
         """
         Analyze demand for user skills in job market
@@ -148,26 +381,16 @@ class CareerAnalytics:
         Returns:
             Dictionary with skill demand analysis
         """
-        if self.jobs_df is None:
+        if not self.loaded:
             return {"message": "Job data not available"}
         
-        # Collect all skills from job postings
-        all_skills = []
-        for skills_list in self.jobs_df['skills_list']:
-            if isinstance(skills_list, list):
-                all_skills.extend(skills_list)
-        
-        skill_counts = Counter(all_skills)
-        
-        # Calculate demand for user skills
+        # Demand for user skills, from the global mention counts kept by the skill index
         user_skill_demand = {}
         for skill in user_skills:
-            skill_lower = skill.lower()
-            demand = skill_counts.get(skill_lower, 0)
-            user_skill_demand[skill] = demand
+            user_skill_demand[skill] = self.skill_index.skill_count(skill.lower())
         
-        # Get top market skills
-        top_skills = dict(skill_counts.most_common(20))
+        # Get top market skills (computed once per index version)
+        top_skills = dict(self.skill_index.top_skills(20))
         
         return {
             'user_skill_demand': user_skill_demand,
@@ -184,21 +407,108 @@ class CareerAnalytics:
         Returns:
             Dictionary with industry distribution
         """
-        if self.jobs_df is None:
+        if not self.loaded:
             return {"message": "Job data not available"}
         
-        relevant_jobs = self.jobs_df[
-            self.jobs_df['skills_list'].apply(
-                lambda skills: any(skill.lower() in str(skills).lower() for skill in user_skills)
-            )
-        ]
+        return self._distributions(self._matching_rows(self.skill_index.matched_skill_ids(user_skills)))
+    
+    def _distributions(self, rows: np.ndarray) -> Dict[str, Any]:
+        """Industry and role distributions of the given rows"""
+        return {
+            'industry_distribution': self._top_values('Industry', rows, 10),
+            'role_distribution': self._top_values('Role Category', rows, 10)
+        }
+    
+    def _top_values(self, column: str, rows: np.ndarray, n: int) -> Dict[Any, int]:
+        """The n most frequent values of a column over rows, counted on the categorical codes"""
+        if column not in self.jobs_df:
+            return {}
+        series = self.jobs_df[column]
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            return series.iloc[rows].value_counts().head(n).to_dict()
+        codes = series.cat.codes.to_numpy()[rows]
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        top = np.argsort(-counts, kind='stable')[:n]
+        categories = series.cat.categories
+        return {categories[i]: int(counts[i]) for i in top.tolist() if counts[i] > 0}
+    
+    def get_market_snapshot(
+        self,
+        user_skills: List[str],
+        experience_level: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Skill demand, salary insights and industry/role distributions in one pass
+        
+        The rows matching user_skills are found once and every section is
+        derived from them. Results are cached per (sorted skill set,
+        experience level) until the dataset changes.
+        
+        Args:
+            user_skills: List of user skills
+            experience_level: Years of experience (narrows the salary statistics)
+            
+        Returns:
+            Dictionary with 'skill_demand', 'salary_insights' and
+            'industry_insights' sections, as the individual methods return them
+        """
+        if not self.loaded:
+            return {"message": "Job data not available"}
+        
+        key = (tuple(sorted(set(user_skills))), experience_level)
+        snapshot = self.snapshot_cache.get(key, self.skill_index.version)
+        if snapshot is not None:
+            return snapshot
         
-        industry_counts = relevant_jobs.get('Industry', pd.Series()).value_counts().head(10)
-        role_counts = relevant_jobs.get('Role Category', pd.Series()).value_counts().head(10)
+        skill_ids = self.skill_index.matched_skill_ids(user_skills)
+        rows = self._matching_rows(skill_ids)
+        snapshot = {
+            'skill_demand': self.get_skill_demand_analysis(list(key[0])),
+            'salary_insights': self._salary_insights(skill_ids, rows, experience_level),
+            'industry_insights': self._distributions(rows),
+            'relevant_jobs_count': len(rows)
+        }
+        self.snapshot_cache.set(key, snapshot, self.skill_index.version)
+        return snapshot
+    
+    def get_adjacent_skills(self, user_skills: List[str], limit: int = 10) -> Dict[str, Any]:
+        """
+        High-demand skills that co-occur with the user's skills but are missing from them
         
+        Args:
+            user_skills: List of user skills
+            limit: Maximum number of skills to return
+            
+        Returns:
+            Dictionary with the recommended skills (score, lift, PMI, demand
+            and the user skills each one is associated with), plus which user
+            skills were found in the job data
+        """
+        if not self.loaded:
+            return {"message": "Job data not available"}
+        
+        # A skill matches its exact vocabulary entry, else (3+ characters) every skill containing it
+        ids = self.skill_index.matrix.skill_ids
+        matched, unknown = {}, []
+        for skill in user_skills:
+            query = str(skill).strip().lower()
+            if query in ids:
+                found = [ids[query]]
+            else:
+                found = self.skill_index.matching_skills(query) if len(query) >= 3 else []
+            if found:
+                matched[skill] = found
+            else:
+                unknown.append(skill)
+        
+        skill_ids = {i for found in matched.values() for i in found}
         return {
-            'industry_distribution': industry_counts.to_dict(),
-            'role_distribution': role_counts.to_dict()
+            'adjacent_skills': self.cooccurrence.recommend(
+                skill_ids, self.skill_index.matrix.vocab,
+                limit=limit, min_count=settings.SKILL_COOCCURRENCE_MIN_COUNT
+            ),
+            'matched_skills': sorted(matched),
+            'unknown_skills': unknown
         }
     
     def get_career_progression_path(
@@ -216,46 +526,9 @@ class CareerAnalytics:
         Returns:
             Dictionary with progression data
         """
-        if self.jobs_df is None:
+        if not self.loaded:
             return {"message": "Job data not available"}
         
-        similar_roles = self.jobs_df[
-            self.jobs_df.get('Job Title', pd.Series()).str.contains(
-                current_role, case=False, na=False
-            )
-        ]
-        
-        progression_data = {}
-        for exp_range in ['0-2', '3-5', '6-10', '10+']:
-            if exp_range == '0-2':
-                jobs = similar_roles[similar_roles['experience_years'] <= 2]
-            elif exp_range == '3-5':
-                jobs = similar_roles[
-                    (similar_roles['experience_years'] >= 3) &
-                    (similar_roles['experience_years'] <= 5)
-                ]
-            elif exp_range == '6-10':
-                jobs = similar_roles[
-                    (similar_roles['experience_years'] >= 6) &
-                    (similar_roles['experience_years'] <= 10)
-                ]
-            else:
-                jobs = similar_roles[similar_roles['experience_years'] > 10]
-            
-            if len(jobs) > 0:
-                common_titles = jobs.get('Job Title', pd.Series()).value_counts().head(5).to_dict()
-                avg_salary = jobs['salary_clean'].mean() if jobs['salary_clean'].notna().any() else None
-                
-                all_skills = []
-                for skills_list in jobs['skills_list']:
-                    if isinstance(skills_list, list):
-                        all_skills.extend(skills_list)
-                top_skills = Counter(all_skills).most_common(10)
-                
-                progression_data[exp_range] = {
-                    'common_titles': common_titles,
-                    'avg_salary': float(avg_salary) if avg_salary else None,
-                    'top_skills': top_skills
-                }
-        
-        return progression_data
+        # Titles containing the role come from the title index; each experience
+        # bucket merges the precomputed aggregates of those titles
+        return self.title_index.progression(current_role)
@@ -0,0 +1,202 @@
+"""
+In-process BM25 keyword index over job documents
+Complements vector search so exact skill tokens ("Verilog", "SAP ABAP") rank
+where users expect them.
+"""
+import math
+import pickle
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Keep tech tokens like "c++", "c#", ".net" and "node.js" intact
+_TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*|\.[a-z0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into keyword tokens"""
+    return [t.rstrip('.') for t in _TOKEN_RE.findall(str(text).lower()) if t.rstrip('.')]
+
+
+def reciprocal_rank_fusion(rankings: Iterable[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Fuse several ranked id lists with reciprocal-rank fusion
+
+    Args:
+        rankings: Ranked lists of document ids (best first)
+        k: RRF damping constant
+
+    Returns:
+        (doc_id, fused_score) pairs sorted by score
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class BM25Index:
+    """Okapi BM25 inverted index with per-document metadata"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_ids: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self.doc_lengths: List[int] = []
+        self._positions: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._doc_tokens: List[Tuple[str, ...]] = []  # Distinct tokens per position, so remove() touches only those postings
+        self._arrays: Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]] = None
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        if '_doc_tokens' not in state:  # Pickled before per-document tokens were kept
+            doc_tokens: List[List[str]] = [[] for _ in self.doc_ids]
+            for token, postings in self._postings.items():
+                for pos in postings:
+                    doc_tokens[pos].append(token)
+            self._doc_tokens = [tuple(tokens) for tokens in doc_tokens]
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def add(self, doc_id: str, text: str, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Add or replace a document
+
+        Args:
+            doc_id: Document id (same id as in the vector store)
+            text: Document text
+            metadata: Metadata returned with search hits
+        """
+        if doc_id in self._positions:
+            self.remove(doc_id)
+
+        pos = len(self.doc_ids)
+        tokens = tokenize(text)
+        self._positions[doc_id] = pos
+        self.doc_ids.append(doc_id)
+        self.metadatas.append(metadata or {})
+        self.doc_lengths.append(len(tokens))
+
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for token, tf in counts.items():
+            self._postings.setdefault(token, {})[pos] = tf
+        self._doc_tokens.append(tuple(map(sys.intern, counts)))
+        self._arrays = None
+
+    def add_many(self, ids: List[str], documents: List[str], metadatas: Optional[List[Dict]] = None):
+        """Add a batch of documents"""
+        metadatas = metadatas or [None] * len(ids)
+        for doc_id, text, metadata in zip(ids, documents, metadatas):
+            self.add(doc_id, text, metadata)
+
+    def remove(self, doc_id: str):
+        """Remove a document; its slot is kept as an empty tombstone"""
+        pos = self._positions.pop(doc_id, None)
+        if pos is None:
+            return
+        for token in self._doc_tokens[pos]:
+            self._postings[token].pop(pos, None)
+        self._doc_tokens[pos] = ()
+        self.doc_lengths[pos] = 0
+        self.metadatas[pos] = {}
+        self.doc_ids[pos] = ''
+        self._arrays = None
+
+    def get_metadata(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Return stored metadata for a document"""
+        pos = self._positions.get(doc_id)
+        return self.metadatas[pos] if pos is not None else None
+
+    def _finalize(self) -> Tuple[Dict[str, Tuple[np.ndarray, np.ndarray]], np.ndarray, float]:
+        """
+        Freeze postings into numpy arrays for vectorized scoring
+
+        Returns (arrays, lengths, avg_length). _arrays is assigned last, so a
+        concurrent search that sees it also sees the matching lengths.
+        """
+        arrays = self._arrays
+        if arrays is not None:
+            return arrays, self._lengths, self._avg_length
+        arrays = {
+            token: (
+                np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+            )
+            for token, postings in self._postings.items() if postings
+        }
+        lengths = np.asarray(self.doc_lengths, dtype=np.float64)
+        live = len(self._positions)
+        avg_length = float(lengths.sum() / live) if live else 0.0
+        self._lengths = lengths
+        self._avg_length = avg_length
+        self._arrays = arrays
+        return arrays, lengths, avg_length
+
+    def search(
+        self,
+        query: str,
+        n_results: int = 10,
+        candidates: Optional[np.ndarray] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Score documents against a keyword query
+
+        Args:
+            query: Query text
+            n_results: Number of hits to return
+            candidates: Optional boolean mask over index positions; only these
+                documents are scored (pre-filtering)
+
+        Returns:
+            (doc_id, bm25_score) pairs, best first
+        """
+        if not self._positions:
+            return []
+        arrays, lengths, avg_length = self._finalize()
+
+        n_docs = len(self._positions)
+        scores = np.zeros(len(lengths), dtype=np.float64)
+        norm = self.k1 * (1 - self.b + self.b * lengths / (avg_length or 1.0))
+
+        for token in set(tokenize(query)):
+            entry = arrays.get(token)
+            if entry is None:
+                continue
+            positions, tfs = entry
+            idf = math.log(1 + (n_docs - len(positions) + 0.5) / (len(positions) + 0.5))
+            scores[positions] += idf * tfs * (self.k1 + 1) / (tfs + norm[positions])
+
+        if candidates is not None:
+            scores[~candidates] = 0.0
+
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) == 0:
+            return []
+        if len(hits) > n_results:
+            hits = hits[np.argpartition(-scores[hits], n_results - 1)[:n_results]]
+        hits = hits[np.argsort(-scores[hits], kind='stable')]
+        return [(self.doc_ids[i], float(scores[i])) for i in hits]
+
+    def save(self, file_path: str):
+        """Persist the index to disk"""
+        Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+        self._arrays = None
+        with open(file_path, 'wb') as handle:
+            pickle.dump(self, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(file_path: str) -> Optional['BM25Index']:
+        """Load a persisted index, or None if there is none"""
+        if not Path(file_path).exists():
+            return None
+        with open(file_path, 'rb') as handle:
+            return pickle.load(handle)
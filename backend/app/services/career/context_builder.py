@@ -0,0 +1,104 @@
+"""
+Prompt context builder for RAG
+Picks retrieved jobs with maximal marginal relevance, drops near-duplicate
+postings and packs the rest into a token budget.
+"""
+import math
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English/LLaMA-style tokenizers)"""
+    return max(1, math.ceil(len(text) / 4))
+
+
+def format_job_line(job: Dict[str, Any]) -> str:
+    """One prompt line per job"""
+    return (
+        f"Job: {job['job_title']} | Skills: {job['skills']} | "
+        f"Experience: {job['experience']} | Industry: {job['industry']}"
+    )
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def build_jobs_context(
+    jobs: List[Dict[str, Any]],
+    job_vectors: np.ndarray,
+    query_vector: np.ndarray,
+    token_budget: int,
+    mmr_lambda: float = 0.7,
+    duplicate_threshold: float = 0.95
+) -> Tuple[str, List[int], Dict[str, Any]]:
+    """
+    Select and pack jobs into a prompt context
+
+    Args:
+        jobs: Retrieved jobs, best first
+        job_vectors: (n, dim) embeddings of the jobs
+        query_vector: (dim,) embedding of the search query
+        token_budget: Maximum estimated tokens for the packed context
+        mmr_lambda: Relevance vs. diversity trade-off (1.0 = pure relevance)
+        duplicate_threshold: Cosine similarity above which a job counts as a
+            near-duplicate of one already selected
+
+    Returns:
+        (context text, indices of packed jobs, packing report)
+    """
+    lines = [format_job_line(job) for job in jobs]
+    naive_tokens = sum(estimate_tokens(line) for line in lines)
+    report: Dict[str, Any] = {
+        'candidates': len(jobs),
+        'packed': 0,
+        'near_duplicates_dropped': 0,
+        'over_budget_dropped': 0,
+        'tokens_used': 0,
+        'tokens_saved': naive_tokens,
+        'token_budget': token_budget,
+    }
+    if not jobs:
+        return "", [], report
+
+    vectors = _normalize(np.asarray(job_vectors, dtype=np.float32))
+    relevance = vectors @ _normalize(np.asarray(query_vector, dtype=np.float32))
+    pairwise = vectors @ vectors.T
+
+    remaining = list(range(len(jobs)))
+    seen_keys = set()
+    selected: List[int] = []
+    tokens_used = 0
+
+    while remaining:
+        if selected:
+            redundancy = pairwise[np.ix_(remaining, selected)].max(axis=1)
+        else:
+            redundancy = np.zeros(len(remaining))
+        scores = mmr_lambda * relevance[remaining] - (1 - mmr_lambda) * redundancy
+        pick = int(np.argmax(scores))
+        i = remaining.pop(pick)
+
+        # Same title and skills (e.g. only the salary differs) or near-identical embedding
+        key = (str(jobs[i]['job_title']).strip().lower(), str(jobs[i]['skills']).strip().lower())
+        if key in seen_keys or (selected and redundancy[pick] >= duplicate_threshold):
+            report['near_duplicates_dropped'] += 1
+            continue
+
+        cost = estimate_tokens(lines[i])
+        if tokens_used + cost > token_budget:
+            report['over_budget_dropped'] += 1
+            continue
+
+        seen_keys.add(key)
+        selected.append(i)
+        tokens_used += cost
+
+    report['packed'] = len(selected)
+    report['tokens_used'] = tokens_used
+    report['tokens_saved'] = naive_tokens - tokens_used
+    return "\n".join(lines[i] for i in selected), selected, report
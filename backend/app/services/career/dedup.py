@@ -0,0 +1,278 @@
+"""
+Near-duplicate job posting detection
+MinHash signatures over each posting's title words, skills and experience /
+industry / role fields, bucketed with LSH banding so reposts are found without
+comparing every pair. Candidates are confirmed by their estimated Jaccard
+similarity before a row is dropped.
+
+The filter is stateful, so it works across the chunks of a streaming ingest:
+the first posting seen in a cluster is kept and later near-copies are removed.
+Memory is roughly rows_kept * (num_perm * 2 + bands * 16) bytes, i.e. O(rows),
+unless a window is set: the filter then remembers between window and
+2 * window kept postings, so a repost is only caught if its original was kept
+recently enough.
+"""
+import re
+import zlib
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+
+_MERSENNE_61 = np.uint64((1 << 61) - 1)
+_SKILL_SPLIT_RE = re.compile(r'[|,;]+')
+_WORD_RE = re.compile(r'[a-z0-9+#]+')
+_SIGNATURE_BATCH = 2048  # Rows hashed at once (bounds the rows x features x perms temp array)
+_FORGOTTEN_CLUSTERS = 100  # Largest clusters of a dropped generation kept for the report
+_FIELD_COLUMNS = (('e', 'Job Experience Required'), ('i', 'Industry'),
+                  ('r', 'Role Category'), ('f', 'Functional Area'))
+
+
+def job_features(chunk: pd.DataFrame) -> List[List[str]]:
+    """Feature set compared between postings, per row (ids, salary and location are ignored)"""
+    def column(name):
+        values = chunk[name] if name in chunk else pd.Series(index=chunk.index, dtype=object)
+        return values.where(values.notna(), None).to_numpy()
+
+    titles, skills = column('Job Title'), column('Key Skills')
+    fields = [(prefix, column(name)) for prefix, name in _FIELD_COLUMNS]
+    feature_lists = []
+    for i in range(len(chunk)):
+        features = [f"t:{word}" for word in _WORD_RE.findall(str(titles[i] or '').lower())]
+        if skills[i] is not None:
+            features.extend(
+                f"s:{skill.strip().lower()}" for skill in _SKILL_SPLIT_RE.split(str(skills[i])) if skill.strip()
+            )
+        features.extend(
+            f"{prefix}:{str(values[i]).strip().lower()}" for prefix, values in fields if values[i] is not None
+        )
+        feature_lists.append(features)
+    return feature_lists
+
+
+class _SortedRuns:
+    """Append-only uint64 key -> int map stored as sorted runs merged like a binary counter"""
+
+    def __init__(self):
+        self._runs: List[tuple] = []
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys, _ in self._runs)
+
+    def add(self, keys: np.ndarray, values: np.ndarray):
+        order = np.argsort(keys, kind='stable')
+        self._runs.append((keys[order], values[order]))
+        while len(self._runs) > 1 and len(self._runs[-2][0]) <= 2 * len(self._runs[-1][0]):
+            newer_keys, newer_values = self._runs.pop()
+            older_keys, older_values = self._runs.pop()
+            keys = np.concatenate([older_keys, newer_keys])
+            values = np.concatenate([older_values, newer_values])
+            order = np.argsort(keys, kind='stable')  # Older entries stay first among equal keys
+            self._runs.append((keys[order], values[order]))
+
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        """Value stored for each key (the earliest one on ties), or -1"""
+        found = np.full(len(keys), -1, dtype=np.int64)
+        for run_keys, run_values in reversed(self._runs):  # Newest first so older runs overwrite
+            pos = np.searchsorted(run_keys, keys)
+            pos[pos == len(run_keys)] = 0
+            hit = run_keys[pos] == keys if len(run_keys) else np.zeros(len(keys), dtype=bool)
+            found[hit] = run_values[pos[hit]]
+        return found
+
+
+class _Generation:
+    """LSH tables and signatures of the kept rows with ids base .. base + kept - 1"""
+
+    def __init__(self, base: int, num_perm: int, bands: int):
+        self.base = base
+        self.tables = [_SortedRuns() for _ in range(bands)]
+        # Truncated to 16 bits (ample for similarity estimates)
+        self.signatures = np.empty((1024, num_perm), dtype=np.uint16)
+        self.kept = 0
+
+
+class NearDuplicateFilter:
+    """Streaming MinHash/LSH filter that drops near-duplicate job rows"""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16, seed: int = 1,
+                 window: int = 0):
+        """
+        Args:
+            threshold: Estimated Jaccard similarity at which two postings are duplicates
+            num_perm: MinHash permutations per signature
+            bands: LSH bands (num_perm must be divisible by it); more bands
+                catch lower similarities at the cost of more candidate checks
+            seed: Seed for the hash permutations
+            window: Kept postings remembered at least (older ones are forgotten
+                a generation at a time); 0 remembers every kept posting
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.window = window
+        rng = np.random.default_rng(seed)
+        # a < 2^31 and x < 2^32 keep a * x + b inside uint64
+        self._a = rng.integers(1, 1 << 31, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, num_perm, dtype=np.uint64)
+        self._band_mix = rng.integers(1, 1 << 62, num_perm // bands, dtype=np.uint64) | np.uint64(1)
+        self._generations = [_Generation(0, num_perm, bands)]  # Oldest first, at most two
+        self.rows_seen = 0
+        self.duplicates_removed = 0
+        self._cluster_sizes: Counter = Counter()
+        self._cluster_titles: Dict[int, str] = {}
+
+    @classmethod
+    def from_settings(cls, window: int = 0) -> 'NearDuplicateFilter':
+        return cls(
+            threshold=settings.JOB_DEDUP_THRESHOLD,
+            num_perm=settings.JOB_DEDUP_NUM_PERM,
+            bands=settings.JOB_DEDUP_BANDS,
+            window=window
+        )
+
+    def signatures(self, feature_lists: List[List[str]]) -> np.ndarray:
+        """MinHash signatures, shape (rows, num_perm); rows without features stay all-max"""
+        signatures = np.full((len(feature_lists), self.num_perm), 0xFFFFFFFF, dtype=np.uint32)
+        for start in range(0, len(feature_lists), _SIGNATURE_BATCH):
+            batch = feature_lists[start:start + _SIGNATURE_BATCH]
+            lengths = np.fromiter((len(f) for f in batch), dtype=np.int64, count=len(batch))
+            total = int(lengths.sum())
+            if not total:
+                continue
+            hashes = np.fromiter(
+                (zlib.crc32(feature.encode()) for features in batch for feature in features),
+                dtype=np.uint64, count=total
+            )
+            permuted = ((hashes[:, None] * self._a + self._b) % _MERSENNE_61).astype(np.uint32)
+            nonempty = lengths > 0
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))[nonempty]
+            rows = np.flatnonzero(nonempty) + start
+            signatures[rows] = np.minimum.reduceat(permuted, offsets, axis=0)
+        return signatures
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """One uint64 bucket key per (row, band)"""
+        banded = signatures.reshape(len(signatures), self.bands, -1).astype(np.uint64)
+        return (banded * self._band_mix).sum(axis=2)
+
+    def _similar(self, signatures: np.ndarray, generation: _Generation, kept_ids: np.ndarray) -> np.ndarray:
+        """Whether each row's signature matches the given kept row's above the threshold"""
+        kept = generation.signatures[kept_ids - generation.base]
+        return (signatures.astype(np.uint16) == kept).mean(axis=1) >= self.threshold
+
+    def _store(self, signatures: np.ndarray, keys: np.ndarray) -> np.ndarray:
+        """Remember signatures and bucket keys of newly kept rows, returning their ids"""
+        generation = self._generations[-1]
+        if self.window and generation.kept >= self.window:
+            generation = _Generation(generation.base + generation.kept, self.num_perm, self.bands)
+            self._generations = [self._generations[-1], generation]
+            self._forget_clusters(self._generations[0].base)
+        needed = generation.kept + len(signatures)
+        if needed > len(generation.signatures):
+            grown = np.empty((max(needed, 2 * len(generation.signatures)), self.num_perm), dtype=np.uint16)
+            grown[:generation.kept] = generation.signatures[:generation.kept]
+            generation.signatures = grown
+        generation.signatures[generation.kept:needed] = signatures.astype(np.uint16)
+        ids = np.arange(generation.kept, needed, dtype=np.int64) + generation.base
+        generation.kept = needed
+        for band, table in enumerate(generation.tables):
+            table.add(keys[:, band], ids)
+        return ids
+
+    def _forget_clusters(self, base: int):
+        """Drop report bookkeeping for clusters kept before base, except the largest ones"""
+        forgotten = Counter({cid: size for cid, size in self._cluster_sizes.items() if cid < base})
+        largest = {cid for cid, _ in forgotten.most_common(_FORGOTTEN_CLUSTERS)}
+        for cluster_id in forgotten:
+            if cluster_id not in largest:
+                del self._cluster_sizes[cluster_id]
+                del self._cluster_titles[cluster_id]
+
+    def filter(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Return the chunk without rows that duplicate a previously kept posting"""
+        n = len(chunk)
+        self.rows_seen += n
+        if not n:
+            return chunk
+
+        feature_lists = job_features(chunk)
+        has_features = np.fromiter((bool(f) for f in feature_lists), dtype=bool, count=n)
+        signatures = self.signatures(feature_lists)
+        keys = self._band_keys(signatures)
+
+        # Duplicates of rows kept from earlier chunks
+        earlier = np.full(n, -1, dtype=np.int64)
+        for generation in self._generations:
+            for band, table in enumerate(generation.tables):
+                open_rows = np.flatnonzero((earlier < 0) & has_features)
+                if not len(open_rows) or not len(table):
+                    continue
+                candidates = table.lookup(keys[open_rows, band])
+                found = candidates >= 0
+                rows, candidates = open_rows[found], candidates[found]
+                confirmed = self._similar(signatures[rows], generation, candidates)
+                earlier[rows[confirmed]] = candidates[confirmed]
+
+        # Duplicates within this chunk: compare to the first open row in the same bucket
+        local = np.arange(n)
+        for band in range(self.bands):
+            open_rows = np.flatnonzero((earlier < 0) & has_features & (local == np.arange(n)))
+            if len(open_rows) < 2:
+                continue
+            _, first, inverse = np.unique(keys[open_rows, band], return_index=True, return_inverse=True)
+            firsts = open_rows[first[inverse]]
+            rows = open_rows[firsts != open_rows]
+            firsts = firsts[firsts != open_rows]
+            if not len(rows):
+                continue
+            agreement = (signatures[rows] == signatures[firsts]).mean(axis=1)
+            confirmed = agreement >= self.threshold
+            local[rows[confirmed]] = firsts[confirmed]
+        while True:  # Collapse chains so every row points at its cluster's first row
+            parent = local[local]
+            if np.array_equal(parent, local):
+                break
+            local = parent
+        parent_earlier = earlier[local]
+        earlier = np.where(earlier >= 0, earlier, parent_earlier)
+
+        keep = (earlier < 0) & (local == np.arange(n))
+        kept_rows = np.flatnonzero(keep & has_features)
+        kept_ids = self._store(signatures[kept_rows], keys[kept_rows])
+
+        # Cluster bookkeeping, keyed by the kept row's id
+        row_to_id = np.full(n, -1, dtype=np.int64)
+        row_to_id[kept_rows] = kept_ids
+        cluster_ids = np.where(earlier >= 0, earlier, row_to_id[local])[~keep]
+        titles = chunk.get('Job Title', pd.Series([''] * n, index=chunk.index)).astype(str).to_numpy()[~keep]
+        for cluster_id, title in zip(cluster_ids.tolist(), titles.tolist()):
+            self._cluster_sizes[cluster_id] += 1
+            self._cluster_titles.setdefault(cluster_id, title)
+        self.duplicates_removed += int((~keep).sum())
+        return chunk[keep]
+
+    def report(self, top: int = 10) -> Dict[str, Any]:
+        """Summary of what was removed"""
+        return {
+            'rows_seen': self.rows_seen,
+            'rows_kept': self.rows_seen - self.duplicates_removed,
+            'duplicates_removed': self.duplicates_removed,
+            'clusters': len(self._cluster_sizes),
+            'threshold': self.threshold,
+            'largest_clusters': [
+                {'title': self._cluster_titles[cluster_id], 'size': size + 1}
+                for cluster_id, size in self._cluster_sizes.most_common(top)
+            ],
+        }
+
+
+def make_dedup_filter(deduplicate: Optional[bool] = None, window: int = 0) -> Optional[NearDuplicateFilter]:
+    """A fresh filter when deduplication is enabled (defaults to settings.JOB_DEDUP_ENABLED)"""
+    enabled = settings.JOB_DEDUP_ENABLED if deduplicate is None else deduplicate
+    return NearDuplicateFilter.from_settings(window) if enabled else None
@@ -0,0 +1,107 @@
+"""
+Background warm-up of the RAG engine
+Lets the API bind immediately while the encoder and job index load in a
+background thread; routes ask the manager for the engine and get None until
+it is warm. A rebuilt engine (see JobsReloader) replaces the live one with
+swap().
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Lifecycle states
+IDLE = 'idle'
+WARMING = 'warming'
+READY = 'ready'
+FAILED = 'failed'
+UNAVAILABLE = 'unavailable'  # RAG dependencies not installed on this build
+
+
+class RAGEngineManager:
+    """Owns the process-wide RAGEngine and its warm-up lifecycle"""
+
+    def __init__(self, factory: Optional[Callable[..., Any]] = None):
+        """
+        Args:
+            factory: Callable building the engine; receives a `progress`
+                callback. Defaults to RAGEngine (imported lazily).
+        """
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.engine = None
+        self.state = IDLE
+        self.stage: Optional[str] = None
+        self.done: Optional[int] = None
+        self.total: Optional[int] = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        self.data_version = 0  # Jobs snapshot version the engine serves (bumped by swap)
+
+    def start(self):
+        """Start warming in a daemon thread (no-op if already started)"""
+        with self._lock:
+            if self.state != IDLE:
+                return
+            self.state = WARMING
+            self.started_at = time.monotonic()
+            self._thread = threading.Thread(target=self._warm, name="rag-warmup", daemon=True)
+            self._thread.start()
+
+    def _on_progress(self, stage: str, done: Optional[int] = None, total: Optional[int] = None):
+        self.stage, self.done, self.total = stage, done, total
+
+    def _warm(self):
+        self._on_progress('importing')
+        factory = self._factory
+        if factory is None:
+            try:
+                from app.services.career.rag_service import RAGEngine
+            except ImportError as e:
+                self.error = str(e)
+                self.state = UNAVAILABLE
+                return
+            factory = RAGEngine
+        try:
+            engine = factory(progress=self._on_progress)
+            self._on_progress('warming_encoder')
+            engine.embed(["warm-up"])
+            self.engine = engine
+            self.ready_at = time.monotonic()
+            self.stage = None
+            self.state = READY
+            print(f"RAG engine ready in {self.ready_at - self.started_at:.1f}s")
+        except Exception as e:
+            self.error = str(e)
+            self.state = FAILED
+            print(f"RAG engine failed to start: {e}")
+
+    def swap(self, engine, data_version: int):
+        """Replace the live engine; requests already holding the old one finish with it"""
+        self.engine = engine
+        self.data_version = data_version
+
+    def get(self):
+        """Return the engine when warm, else None"""
+        return self.engine if self.state == READY else None
+
+    @property
+    def is_warming(self) -> bool:
+        return self.state in (IDLE, WARMING)
+
+    def status(self) -> Dict[str, Any]:
+        """Warm-up state and progress for the readiness endpoint"""
+        now = time.monotonic()
+        status = {
+            'state': self.state,
+            'stage': self.stage,
+            'elapsed_seconds': round((self.ready_at or now) - self.started_at, 1) if self.started_at else None,
+        }
+        if self.data_version:
+            status['data_version'] = self.data_version
+        if self.total:
+            status['progress'] = {'done': self.done, 'total': self.total}
+        if self.error:
+            status['error'] = self.error
+        return status
@@ -0,0 +1,359 @@
+"""
+Compact job index snapshots
+Exports the job vector index as memory-mappable arrays so a fresh replica can
+serve queries within seconds, without re-ingesting or mounting chroma_db.
+
+Layout of a snapshot directory:
+    manifest.json   model name, dimension, dtype, row count, corpus version
+    vectors.npy     (n, dim) float16 or int8 embeddings
+    scales.npy      (n,) float32 per-row scales (int8 only)
+    metadata.npz    columnar, dictionary-encoded job metadata
+    documents.bin   job documents, UTF-8, back to back
+    documents.offsets.npy   (n + 1,) int64 document boundaries in documents.bin
+    bm25.pkl        keyword index (optional)
+
+Usage:
+    python -m app.services.career.index_snapshot export --out snapshots/jobs [--dtype int8]
+    python -m app.services.career.index_snapshot import --snapshot snapshots/jobs
+
+Import replaces the local job collection and keyword index with the
+snapshot's (building the keyword index from the documents when the snapshot
+has none).
+"""
+import argparse
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.services.career.bm25_index import BM25Index
+
+FORMAT_VERSION = 1
+STRING_COLUMNS = ('job_title', 'skills', 'experience', 'role_category', 'industry', 'salary')
+NUMERIC_COLUMNS = ('experience_min', 'experience_max', 'salary_min', 'salary_max')
+
+
+def _quantize(vectors: np.ndarray, dtype: str):
+    """Return (stored_vectors, scales) for the requested storage dtype"""
+    if dtype == 'float16':
+        return vectors.astype(np.float16), None
+    if dtype == 'int8':
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.round(vectors / scales[:, None]).astype(np.int8)
+        return codes, scales.astype(np.float32)
+    raise ValueError(f"Unsupported snapshot dtype: {dtype}")
+
+
+def _encode_strings(values: List[str]) -> Dict[str, np.ndarray]:
+    """Dictionary-encode a string column"""
+    uniques, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    return {'values': uniques, 'codes': codes.astype(np.int32)}
+
+
+def export_snapshot(collection, out_dir: str, dtype: str = 'float16',
+                    keyword_index: Optional[BM25Index] = None,
+                    corpus_version: Optional[str] = None,
+                    page_size: int = 5000) -> Dict[str, Any]:
+    """
+    Write a snapshot of a vector-store collection
+
+    Args:
+        collection: Source collection (must support `count` and paged `get`)
+        out_dir: Target directory (replaced if it exists)
+        dtype: 'float16' or 'int8'
+        keyword_index: Optional BM25 index to bundle
+        corpus_version: Corpus version stamp recorded in the manifest
+        page_size: Rows fetched from the collection at a time
+
+    Returns:
+        The manifest
+    """
+    out = Path(out_dir)
+    tmp = out.with_name(out.name + '.tmp')
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    count = collection.count()
+    vectors = scales = None
+    ids: List[str] = []
+    strings = {key: [] for key in STRING_COLUMNS}
+    numbers = {key: np.full(count, np.nan) for key in NUMERIC_COLUMNS}
+    document_offsets = [0]
+    documents = open(tmp / 'documents.bin', 'wb')
+
+    offset = 0
+    while offset < count:
+        page = collection.get(include=['embeddings', 'metadatas', 'documents'], limit=page_size, offset=offset)
+        if not page['ids']:
+            break
+        block = np.asarray(page['embeddings'], dtype=np.float32)
+        if vectors is None:
+            store_dtype = np.float16 if dtype == 'float16' else np.int8
+            vectors = np.lib.format.open_memmap(
+                tmp / 'vectors.npy', mode='w+', dtype=store_dtype, shape=(count, block.shape[1])
+            )
+            if dtype == 'int8':
+                scales = np.lib.format.open_memmap(
+                    tmp / 'scales.npy', mode='w+', dtype=np.float32, shape=(count,)
+                )
+        stored, block_scales = _quantize(block, dtype)
+        end = offset + len(block)
+        vectors[offset:end] = stored
+        if scales is not None:
+            scales[offset:end] = block_scales
+
+        ids.extend(page['ids'])
+        for document in page['documents']:
+            encoded = (document or '').encode('utf-8')
+            documents.write(encoded)
+            document_offsets.append(document_offsets[-1] + len(encoded))
+        for i, metadata in enumerate(page['metadatas']):
+            for key in STRING_COLUMNS:
+                strings[key].append(str(metadata.get(key, 'N/A')))
+            for key in NUMERIC_COLUMNS:
+                if key in metadata:
+                    numbers[key][offset + i] = metadata[key]
+        offset = end
+
+    documents.close()
+    if vectors is None:
+        raise ValueError("Collection is empty; nothing to snapshot")
+    vectors.flush()
+    if scales is not None:
+        scales.flush()
+
+    columns = {'ids': np.asarray(ids, dtype=str)}
+    for key in STRING_COLUMNS:
+        encoded = _encode_strings(strings[key])
+        columns[f'{key}.values'] = encoded['values']
+        columns[f'{key}.codes'] = encoded['codes']
+    for key in NUMERIC_COLUMNS:
+        columns[key] = numbers[key][:offset]
+    np.savez(tmp / 'metadata.npz', **columns)
+    np.save(tmp / 'documents.offsets.npy', np.asarray(document_offsets, dtype=np.int64))
+
+    if keyword_index is not None:
+        keyword_index.save(str(tmp / 'bm25.pkl'))
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'embedding_model': settings.EMBEDDING_MODEL,
+        'dimension': int(vectors.shape[1]),
+        'count': offset,
+        'dtype': dtype,
+        'corpus_version': corpus_version,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+    (tmp / 'manifest.json').write_text(json.dumps(manifest, indent=2))
+
+    del vectors, scales
+    shutil.rmtree(out, ignore_errors=True)
+    tmp.rename(out)
+    return manifest
+
+
+class SnapshotIndex:
+    """
+    Read-only, memory-mapped job index
+
+    Mirrors the subset of the Chroma collection API that RAGEngine uses
+    (`query`, `get`, `count`, `metadata`), so it can stand in for the
+    collection on replicas.
+    """
+
+    def __init__(self, snapshot_dir: str):
+        path = Path(snapshot_dir)
+        self.manifest = json.loads((path / 'manifest.json').read_text())
+        if self.manifest.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format: {self.manifest.get('format_version')}")
+        if self.manifest['embedding_model'] != settings.EMBEDDING_MODEL:
+            raise ValueError(
+                f"Snapshot was built with {self.manifest['embedding_model']}, "
+                f"but EMBEDDING_MODEL is {settings.EMBEDDING_MODEL}"
+            )
+        self.path = path
+        self.vectors = np.load(path / 'vectors.npy', mmap_mode='r')
+        self.scales = np.load(path / 'scales.npy', mmap_mode='r') if self.manifest['dtype'] == 'int8' else None
+
+        with np.load(path / 'metadata.npz') as data:
+            self.ids = data['ids']
+            self._strings = {
+                key: (data[f'{key}.values'], data[f'{key}.codes']) for key in STRING_COLUMNS
+            }
+            self._numbers = {key: data[key] for key in NUMERIC_COLUMNS}
+        # Snapshots exported before documents were stored have none
+        self.has_documents = (path / 'documents.offsets.npy').exists()
+        if self.has_documents:
+            self._document_offsets = np.load(path / 'documents.offsets.npy')
+            size = int(self._document_offsets[-1])
+            self._documents = np.memmap(path / 'documents.bin', dtype=np.uint8, mode='r') if size else b''
+        self._norms: Optional[np.ndarray] = None
+        self._positions: Optional[Dict[str, int]] = None
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return {'corpus_version': self.manifest.get('corpus_version') or 'snapshot'}
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def modify(self, metadata=None, name=None):
+        """Snapshots are read-only; version stamps live in the manifest"""
+
+    def load_keyword_index(self) -> Optional[BM25Index]:
+        return BM25Index.load(str(self.path / 'bm25.pkl'))
+
+    def _document_at(self, i: int) -> Optional[str]:
+        if not self.has_documents:
+            return None
+        start, end = self._document_offsets[i], self._document_offsets[i + 1]
+        return bytes(self._documents[start:end]).decode('utf-8')
+
+    def _metadata_at(self, i: int) -> Dict[str, Any]:
+        metadata = {key: str(values[codes[i]]) for key, (values, codes) in self._strings.items()}
+        for key, column in self._numbers.items():
+            if not np.isnan(column[i]):
+                metadata[key] = float(column[i])
+        return metadata
+
+    def _dequantize(self, start: int, end: int) -> np.ndarray:
+        block = np.asarray(self.vectors[start:end], dtype=np.float32)
+        if self.scales is not None:
+            block *= np.asarray(self.scales[start:end])[:, None]
+        return block
+
+    def _row_norms(self) -> np.ndarray:
+        if self._norms is None:
+            step = 65536
+            self._norms = np.concatenate([
+                (self._dequantize(i, i + step) ** 2).sum(axis=1)
+                for i in range(0, len(self.ids), step)
+            ]) if len(self.ids) else np.zeros(0)
+        return self._norms
+
+    def _where_mask(self, where: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Evaluate the $and/$eq/$gte/$lte subset of Chroma where clauses"""
+        if not where:
+            return None
+        if '$and' in where:
+            mask = np.ones(len(self.ids), dtype=bool)
+            for condition in where['$and']:
+                mask &= self._where_mask(condition)
+            return mask
+        (key, condition), = where.items()
+        (op, value), = condition.items()
+        if key in self._strings:
+            values, codes = self._strings[key]
+            if op != '$eq':
+                raise ValueError(f"Unsupported operator {op} for {key}")
+            hit = np.flatnonzero(values == value)
+            return np.isin(codes, hit)
+        column = self._numbers[key]
+        with np.errstate(invalid='ignore'):
+            if op == '$gte':
+                return column >= value
+            if op == '$lte':
+                return column <= value
+            if op == '$eq':
+                return column == value
+        raise ValueError(f"Unsupported operator {op}")
+
+    def query(self, query_embeddings, n_results: int = 10, where=None, include=None) -> Dict[str, list]:
+        """Brute-force nearest neighbours (squared L2, like Chroma's default space)"""
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        mask = self._where_mask(where)
+        step = 65536
+        dots = np.concatenate([
+            self._dequantize(i, i + step) @ queries.T
+            for i in range(0, len(self.ids), step)
+        ]).T if len(self.ids) else np.zeros((len(queries), 0))
+        distances = self._row_norms()[None, :] + (queries ** 2).sum(axis=1)[:, None] - 2 * dots
+        if mask is not None:
+            distances[:, ~mask] = np.inf
+
+        result = {'ids': [], 'metadatas': [], 'distances': []}
+        for row in distances:
+            k = min(n_results, int(np.isfinite(row).sum()))
+            top = np.argpartition(row, k - 1)[:k] if k else np.array([], dtype=int)
+            top = top[np.argsort(row[top], kind='stable')]
+            result['ids'].append([str(self.ids[i]) for i in top])
+            result['metadatas'].append([self._metadata_at(i) for i in top])
+            result['distances'].append([float(row[i]) for i in top])
+        return result
+
+    def get(self, ids=None, include=None, limit=None, offset=0, where=None) -> Dict[str, list]:
+        """Fetch rows by id or by page"""
+        if ids is not None:
+            if self._positions is None:
+                self._positions = {str(doc_id): i for i, doc_id in enumerate(self.ids)}
+            positions = [self._positions[doc_id] for doc_id in ids if doc_id in self._positions]
+        else:
+            stop = len(self.ids) if limit is None else min(len(self.ids), offset + limit)
+            positions = list(range(offset, stop))
+        result = {'ids': [str(self.ids[i]) for i in positions], 'documents': [self._document_at(i) for i in positions]}
+        result['metadatas'] = [self._metadata_at(i) for i in positions]
+        if include and 'embeddings' in include:
+            result['embeddings'] = [self._dequantize(i, i + 1)[0].tolist() for i in positions]
+        return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Export or import job index snapshots")
+    sub = parser.add_subparsers(dest='command', required=True)
+    export_cmd = sub.add_parser('export', help="Write a snapshot of the local job index")
+    export_cmd.add_argument('--out', required=True)
+    export_cmd.add_argument('--dtype', choices=['float16', 'int8'], default='float16')
+    import_cmd = sub.add_parser('import', help="Load a snapshot into the local Chroma store")
+    import_cmd.add_argument('--snapshot', required=True)
+    args = parser.parse_args(argv)
+
+    from app.services.career.rag_service import RAGEngine
+
+    started = time.perf_counter()
+    if args.command == 'export':
+        engine = RAGEngine(auto_ingest=False, use_sidecar=False)
+        engine.load_existing_collection()
+        if engine.collection is None:
+            parser.error("No job index to export")
+        manifest = export_snapshot(
+            engine.collection, args.out, dtype=args.dtype,
+            keyword_index=engine.keyword_index, corpus_version=engine.corpus_version
+        )
+        print(f"Exported {manifest['count']} jobs ({manifest['dtype']}) to {args.out} "
+              f"in {time.perf_counter() - started:.1f}s")
+    else:
+        snapshot = SnapshotIndex(args.snapshot)
+        keyword_index = snapshot.load_keyword_index()
+        if keyword_index is None and not snapshot.has_documents:
+            parser.error("Snapshot has neither documents nor bm25.pkl; the keyword index cannot be built")
+        # Build a fresh collection beside the live one and swap it in, so no stale ids survive
+        engine = RAGEngine(auto_ingest=False, use_sidecar=False, staging=True)
+        with engine.rebuild_lock():  # Not while a server worker is rebuilding the store
+            engine.drop_stale_staging()
+            collection = engine.get_or_create_collection()
+            rebuild_keywords = keyword_index is None
+            if rebuild_keywords:
+                keyword_index = BM25Index()
+            total = snapshot.count()
+            for offset in range(0, total, settings.INGEST_CHUNK_SIZE):
+                page = snapshot.get(include=['embeddings'], limit=settings.INGEST_CHUNK_SIZE, offset=offset)
+                collection.upsert(ids=page['ids'], embeddings=page['embeddings'], metadatas=page['metadatas'],
+                                  documents=page['documents'] if snapshot.has_documents else None)
+                if rebuild_keywords:
+                    keyword_index.add_many(page['ids'], page['documents'], page['metadatas'])
+            keyword_index.save(engine.keyword_index_path)
+            engine.mark_corpus_changed()
+            engine.promote()
+        print(f"Imported {total} jobs from {args.snapshot} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""
+Streaming job corpus ingestion
+Reads job CSVs in bounded chunks and pushes them through parsing, embedding
+and vector-store upsert without ever holding a whole file in memory.
+
+Usage:
+    python -m app.services.career.ingestion --csv data/jobs.csv [--chunk-size 2000] [--dry-run]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+from app.config import settings
+from app.services.career.dedup import NearDuplicateFilter, make_dedup_filter
+from app.services.career.job_filters import numeric_job_metadata
+
+# Columns used by the RAG documents and the analytics frame
+JOB_COLUMNS = [
+    'Job Title',
+    'Key Skills',
+    'Job Experience Required',
+    'Role Category',
+    'Functional Area',
+    'Industry',
+    'Job Salary',
+]
+
+
+def iter_job_chunks(
+    paths: Iterable[str],
+    chunk_size: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+    dedup: Optional[NearDuplicateFilter] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream job rows from one or more CSV files in chunks
+
+    Rows get a global, contiguous index across all files (the same numbering
+    the old `pd.concat(..., ignore_index=True)` produced), so ids built from it
+    stay stable.
+
+    Args:
+        paths: CSV file paths
+        chunk_size: Rows per chunk (defaults to settings.INGEST_CHUNK_SIZE)
+        columns: Optional subset of columns to read; missing ones are skipped
+        dedup: Optional near-duplicate filter applied to each chunk; dropped
+            rows leave gaps in the index
+
+    Yields:
+        DataFrame chunks with a `source_file` column
+    """
+    chunk_size = chunk_size or settings.INGEST_CHUNK_SIZE
+    offset = 0
+    for file_path in paths:
+        if not str(file_path).endswith('.csv') or not Path(file_path).exists():
+            continue
+        usecols = (lambda c: c in columns) if columns else None
+        try:
+            reader = pd.read_csv(file_path, chunksize=chunk_size, usecols=usecols)
+            for chunk in reader:
+                chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+                chunk['source_file'] = file_path
+                offset += len(chunk)
+                if dedup is not None:
+                    chunk = dedup.filter(chunk)
+                yield chunk
+        except Exception as e:
+            print(f"Error loading {file_path}: {e}")
+
+
+def estimate_row_count(paths: Iterable[str]) -> int:
+    """Cheap row estimate (newline count minus headers) used for progress reporting"""
+    total = 0
+    for file_path in paths:
+        if not str(file_path).endswith('.csv') or not Path(file_path).exists():
+            continue
+        with open(file_path, 'rb') as f:
+            lines = sum(block.count(b'\n') for block in iter(lambda: f.read(1 << 20), b''))
+        total += max(lines - 1, 0)
+    return total
+
+
+def build_job_document(row: pd.Series) -> str:
+    """Build the text that gets embedded for a job row"""
+    doc_text = f"""
+    Job Title: {row.get('Job Title', 'N/A')}
+    Key Skills: {row.get('Key Skills', 'N/A')}
+    Experience Required: {row.get('Job Experience Required', 'N/A')}
+    Role Category: {row.get('Role Category', 'N/A')}
+    Functional Area: {row.get('Functional Area', 'N/A')}
+    Industry: {row.get('Industry', 'N/A')}
+    Salary: {row.get('Job Salary', 'N/A')}
+    """
+    return doc_text.strip()
+
+
+def build_job_metadata(row: pd.Series) -> Dict[str, Any]:
+    """Build the vector-store metadata for a job row, including numeric ranges used as filters"""
+    metadata = {
+        'job_title': str(row.get('Job Title', 'N/A')),
+        'skills': str(row.get('Key Skills', 'N/A')),
+        'experience': str(row.get('Job Experience Required', 'N/A')),
+        'role_category': str(row.get('Role Category', 'N/A')),
+        'industry': str(row.get('Industry', 'N/A')),
+        'salary': str(row.get('Job Salary', 'N/A'))
+    }
+    metadata.update(numeric_job_metadata(row))
+    return metadata
+
+
+class ProgressBar:
+    """Minimal text progress bar with rows-per-second reporting"""
+
+    def __init__(self, total: int, stream=None, width: int = 30):
+        self.total = total
+        self.stream = stream or sys.stderr
+        self.width = width
+        self.started = time.perf_counter()
+        self.done = 0
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def update(self, n: int):
+        self.done += n
+        total = max(self.total, self.done)
+        filled = int(self.width * self.done / total) if total else self.width
+        bar = '#' * filled + '.' * (self.width - filled)
+        self.stream.write(
+            f"\r[{bar}] {self.done}/{total} rows ({self.rate:,.0f} rows/s)"
+        )
+        self.stream.flush()
+
+    def close(self):
+        self.stream.write("\n")
+        self.stream.flush()
+
+
+def ingest_jobs(
+    paths: List[str],
+    collection=None,
+    embed: Optional[Callable[[List[str]], List[List[float]]]] = None,
+    keyword_index=None,
+    chunk_size: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    dry_run: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None,
+    deduplicate: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Stream job CSVs into a vector-store collection
+
+    Memory is bounded by `chunk_size` rows of CSV plus one embedding batch.
+
+    Args:
+        paths: CSV file paths
+        collection: Target collection (must support `upsert`); unused on dry run
+        embed: Function turning documents into embeddings; None lets the
+            collection embed on its own
+        keyword_index: Optional BM25Index that receives the same documents
+        chunk_size: Rows read from disk at a time
+        batch_size: Rows embedded and upserted at a time
+        dry_run: Parse and count only, no embedding or writes
+        progress: Optional callback(rows_done, rows_total)
+        deduplicate: Drop near-duplicate postings (defaults to settings.JOB_DEDUP_ENABLED)
+
+    Returns:
+        Ingestion statistics, with a `dedup` report when deduplicating
+    """
+    batch_size = batch_size or settings.RAG_BATCH_SIZE
+    total = estimate_row_count(paths) if progress else 0
+    dedup = make_dedup_filter(deduplicate)
+    started = time.perf_counter()
+    rows = 0
+
+    for chunk in iter_job_chunks(paths, chunk_size=chunk_size, dedup=dedup):
+        for i in range(0, len(chunk), batch_size):
+            batch = chunk.iloc[i:i+batch_size]
+
+            documents = []
+            metadatas = []
+            ids = []
+            for idx, row in batch.iterrows():
+                documents.append(build_job_document(row))
+                metadatas.append(build_job_metadata(row))
+                ids.append(f"job_{idx}")
+
+            if not dry_run:
+                kwargs = {'documents': documents, 'metadatas': metadatas, 'ids': ids}
+                if embed is not None:
+                    kwargs['embeddings'] = embed(documents)
+                collection.upsert(**kwargs)
+                if keyword_index is not None:
+                    keyword_index.add_many(ids, documents, metadatas)
+
+            rows += len(batch)
+            if progress:
+                done = rows + (dedup.duplicates_removed if dedup is not None else 0)
+                progress(done, max(total, done))
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        'rows': rows,
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(rows / elapsed, 1) if elapsed > 0 else 0.0,
+        'dry_run': dry_run
+    }
+    if dedup is not None:
+        stats['dedup'] = dedup.report()
+    return stats
+
+
+def print_dedup_report(report: Dict[str, Any]):
+    """Print a near-duplicate removal report"""
+    print(f"Removed {report['duplicates_removed']} near-duplicate jobs in {report['clusters']} clusters "
+          f"({report['rows_kept']}/{report['rows_seen']} kept, threshold {report['threshold']})")
+    for cluster in report['largest_clusters']:
+        print(f"  {cluster['size']:>6} x {cluster['title']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Stream job CSVs into the job vector store")
+    parser.add_argument('--csv', action='append', dest='paths', help="Job CSV file (repeatable)")
+    parser.add_argument('--chunk-size', type=int, default=settings.INGEST_CHUNK_SIZE)
+    parser.add_argument('--batch-size', type=int, default=settings.RAG_BATCH_SIZE)
+    parser.add_argument('--dry-run', action='store_true', help="Parse only, skip embedding and upsert")
+    parser.add_argument('--no-progress', action='store_true', help="Disable the progress bar")
+    parser.add_argument('--no-dedup', action='store_true', help="Keep near-duplicate postings")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or ([settings.JOBS_CSV_PATH] if settings.JOBS_CSV_PATH else [])
+    if not paths:
+        parser.error("No CSV given (use --csv or set JOBS_CSV_PATH)")
+
+    engine = collection = embed = keyword_index = None
+    if not args.dry_run:
+        from app.services.career.rag_service import RAGEngine
+        engine = RAGEngine(auto_ingest=False, use_sidecar=False)
+        collection = engine.get_or_create_collection()
+        embed = engine.embed
+        # Rows are upserted into the existing collection, so extend its keyword index (rebuilt from it if missing)
+        engine._load_keyword_index()
+        keyword_index = engine.keyword_index
+
+    bar = None if args.no_progress else ProgressBar(estimate_row_count(paths))
+
+    def on_progress(done: int, total: int):
+        bar.update(done - bar.done)
+
+    stats = ingest_jobs(
+        paths,
+        collection=collection,
+        embed=embed,
+        keyword_index=keyword_index,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+        progress=on_progress if bar else None,
+        deduplicate=False if args.no_dedup else None
+    )
+    if bar:
+        bar.close()
+    if keyword_index is not None:
+        keyword_index.save(settings.BM25_INDEX_PATH)
+        engine.mark_corpus_changed()
+
+    mode = " (dry run)" if args.dry_run else ""
+    print(f"Ingested {stats['rows']} jobs in {stats['seconds']}s "
+          f"({stats['rows_per_second']:,.0f} rows/s){mode}")
+    if 'dedup' in stats:
+        print_dedup_report(stats['dedup'])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
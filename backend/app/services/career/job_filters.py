@@ -0,0 +1,116 @@
+"""
+Structured job search filters
+Parses experience/salary strings into numeric ranges at ingest time and turns
+request filters into vector-store `where` clauses or numpy pre-filter masks.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+FILTER_KEYS = (
+    'industry', 'role_category',
+    'experience_min', 'experience_max',
+    'salary_min', 'salary_max',
+)
+
+
+def _numbers(value, pattern: str) -> List[float]:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return []
+    return [float(n.replace(',', '')) for n in re.findall(pattern, str(value)) if n.strip(',')]
+
+
+def parse_experience_range(exp_str) -> Tuple[Optional[float], Optional[float]]:
+    """Parse '2 - 5 yrs' into (2.0, 5.0); a single number gives (n, n)"""
+    values = _numbers(exp_str, r'\d+')
+    if not values:
+        return None, None
+    return min(values), max(values)
+
+
+def parse_salary_range(salary_str) -> Tuple[Optional[float], Optional[float]]:
+    """Parse '3,00,000 - 5,00,000 PA.' into (300000.0, 500000.0); undisclosed gives (None, None)"""
+    if 'Not Disclosed' in str(salary_str):
+        return None, None
+    values = _numbers(salary_str, r'[\d,]+')
+    if not values:
+        return None, None
+    return min(values), max(values)
+
+
+def numeric_job_metadata(row: pd.Series) -> Dict[str, float]:
+    """Numeric range metadata for a job row (keys are omitted when unknown)"""
+    exp_min, exp_max = parse_experience_range(row.get('Job Experience Required'))
+    sal_min, sal_max = parse_salary_range(row.get('Job Salary'))
+    values = {
+        'experience_min': exp_min,
+        'experience_max': exp_max,
+        'salary_min': sal_min,
+        'salary_max': sal_max,
+    }
+    return {key: value for key, value in values.items() if value is not None}
+
+
+def clean_filters(filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Drop unset filter values"""
+    return {k: v for k, v in (filters or {}).items() if k in FILTER_KEYS and v not in (None, '')}
+
+
+def build_where(filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Build a vector-store `where` clause
+
+    Experience and salary filters are range-overlap tests: a job matches when
+    its [min, max] range intersects the requested one.
+    """
+    filters = clean_filters(filters)
+    conditions = []
+    for key in ('industry', 'role_category'):
+        if key in filters:
+            conditions.append({key: {'$eq': filters[key]}})
+    for field in ('experience', 'salary'):
+        low, high = filters.get(f'{field}_min'), filters.get(f'{field}_max')
+        if low is not None:
+            conditions.append({f'{field}_max': {'$gte': float(low)}})
+        if high is not None:
+            conditions.append({f'{field}_min': {'$lte': float(high)}})
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return {'$and': conditions}
+
+
+class MetadataColumns:
+    """Columnar view of job metadata for vectorized pre-filtering"""
+
+    def __init__(self, metadatas: List[Dict[str, Any]]):
+        self.size = len(metadatas)
+        self.text = {
+            key: np.array([str(m.get(key, '')) for m in metadatas], dtype=object)
+            for key in ('industry', 'role_category')
+        }
+        self.numeric = {
+            key: np.array([m.get(key, np.nan) for m in metadatas], dtype=np.float64)
+            for key in ('experience_min', 'experience_max', 'salary_min', 'salary_max')
+        }
+
+    def mask(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Boolean mask of rows matching the filters, or None when unfiltered"""
+        filters = clean_filters(filters)
+        if not filters:
+            return None
+        mask = np.ones(self.size, dtype=bool)
+        for key in ('industry', 'role_category'):
+            if key in filters:
+                mask &= self.text[key] == filters[key]
+        # NaN comparisons are False, so jobs with unknown ranges drop out like in the vector store
+        for field in ('experience', 'salary'):
+            low, high = filters.get(f'{field}_min'), filters.get(f'{field}_max')
+            if low is not None:
+                mask &= self.numeric[f'{field}_max'] >= float(low)
+            if high is not None:
+                mask &= self.numeric[f'{field}_min'] <= float(high)
+        return mask
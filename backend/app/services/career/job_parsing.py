@@ -0,0 +1,252 @@
+"""
+Vectorized parsing of the raw job columns
+Row parsers for the salary, experience and skills columns (extract_salary,
+extract_experience, extract_skills) and column-at-a-time equivalents of
+them. Scraped job columns repeat the same few thousand salary, experience
+and skill strings across many rows, so each column is factorized and the row parser runs once per distinct value; results
+are then gathered back by code. Output (values and dtypes) is identical to
+`Series.apply` with the row parser; the CLI below checks parity and times both.
+parse_skills_matrix goes one step further and gathers skill ids into a CSR
+matrix, so no per-row list is ever built.
+
+Usage:
+    python -m app.services.career.job_parsing [--rows 500000] [--csv /tmp/jobs.csv]
+"""
+import argparse
+import re
+import sys
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.services.career.skill_index import SkillMatrix
+
+_SKILL_SPLIT_RE = re.compile(r'[|,;]+')
+
+
+def extract_salary(salary_str) -> Optional[float]:
+    """Extract numeric salary (handle ranges too)"""
+    if pd.isna(salary_str) or 'Not Disclosed' in str(salary_str):
+        return None
+
+    numbers = re.findall(r'[\d,]+', str(salary_str))
+    if numbers:
+        try:
+            values = [int(num.replace(',', '')) for num in numbers]
+            if len(values) >= 2:
+                return sum(values) / len(values)  # Average of range
+            return float(values[0])
+        except Exception:
+            return None
+    return None
+
+
+def extract_experience(exp_str) -> Optional[int]:
+    """Extract years of experience (handle ranges too)"""
+    if pd.isna(exp_str):
+        return None
+
+    numbers = re.findall(r'\d+', str(exp_str))
+    if numbers:
+        values = list(map(int, numbers))
+        if len(values) >= 2:
+            return sum(values) // len(values)  # Average of range
+        return values[0]
+    return None
+
+
+def extract_skills(skills_str) -> List[str]:
+    """Extract skills list from skills string"""
+    if pd.isna(skills_str):
+        return []
+
+    skills = re.split(r'[|,;]+', str(skills_str))
+    return [skill.strip().lower() for skill in skills if skill.strip()]
+
+
+def _split_skills(values) -> List[List[str]]:
+    """extract_skills of each (non-missing) distinct value, lower-casing before splitting"""
+    split = _SKILL_SPLIT_RE.split
+    return [[skill for skill in map(str.strip, split(str(value).lower())) if skill] for value in values]
+
+
+def parse_column(series: pd.Series, parse_row: Callable) -> pd.Series:
+    """
+    Equivalent of series.apply(parse_row), parsing each distinct value once
+
+    Rows holding the same string share one parsed object (e.g. one skills list).
+    """
+    if series.empty:
+        return series.apply(parse_row)
+    codes, uniques = pd.factorize(series)
+    values = list(uniques)
+    missing = codes < 0
+    if missing.any():
+        codes = np.where(missing, len(values), codes)
+        values.append(np.nan)
+    # apply over the distinct values infers the same dtype apply over all rows would
+    parsed = pd.Series(values, dtype=object).apply(parse_row)
+    return pd.Series(parsed.to_numpy()[codes], index=series.index)
+
+
+def parse_salary_column(series: pd.Series) -> pd.Series:
+    """Vectorized extract_salary"""
+    return parse_column(series, extract_salary)
+
+
+def parse_experience_column(series: pd.Series) -> pd.Series:
+    """Vectorized extract_experience"""
+    return parse_column(series, extract_experience)
+
+
+def parse_skills_column(series: pd.Series) -> pd.Series:
+    """Vectorized extract_skills (lower-casing each distinct string before splitting)"""
+    if series.empty:
+        return series.apply(extract_skills)
+    codes, uniques = pd.factorize(series)
+    lists = _split_skills(uniques)
+    lists.append([])  # Missing values
+    parsed = np.empty(len(lists), dtype=object)
+    for i, skills in enumerate(lists):  # Element-wise so numpy never broadcasts the lists into 2-D
+        parsed[i] = skills
+    return pd.Series(parsed[np.where(codes < 0, len(lists) - 1, codes)], index=series.index)
+
+
+def parse_skills_matrix(series: pd.Series) -> SkillMatrix:
+    """
+    CSR skill matrix of a Key Skills column, without building a list per row
+
+    Equal to SkillMatrix.from_skill_lists(parse_skills_column(series)),
+    including the first-seen order of the vocabulary.
+    """
+    codes, uniques = pd.factorize(series)
+    unique_lists = _split_skills(uniques)
+    unique_lists.append([])  # Missing values
+    per_value = SkillMatrix.from_skill_lists(unique_lists)  # Factorize order is first-appearance order
+    codes = np.where(codes < 0, len(unique_lists) - 1, codes)
+
+    lengths = np.diff(per_value.indptr)[codes]
+    indptr = np.zeros(len(codes) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    # Entry j of row r copies entry j of the row's distinct value
+    starts = np.repeat(per_value.indptr[codes] - indptr[:-1], lengths)
+    indices = per_value.indices[starts + np.arange(indptr[-1])]
+    return SkillMatrix(per_value.vocab, indptr, indices)
+
+
+def synthetic_jobs(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Random job rows covering the salary/experience/skills formats seen in scraped data"""
+    rng = np.random.default_rng(seed)
+    salaries = np.array([
+        '3,00,000 - 14,00,000 PA.', 'Not Disclosed by Recruiter', '479267', '12,00,000 PA.',
+        '50,000 - 1,00,000 PM', 'Competitive', '1,000 , 2,000', '10 - 15 Lacs PA',
+    ], dtype=object)
+    experience = np.array(['2 - 6 yrs', '0 - 1 yrs', '10 - 15 yrs', '5 yrs', 'Fresher', '3-5', '7 - 12 yrs'], dtype=object)
+    skills = np.array([
+        'Python', 'SQL', 'Machine Learning', ' AWS ', 'Docker', 'Excel', 'java', 'React', 'C++', 'C#',
+        'Data Analysis', 'Sales', 'Recruitment', 'Spring Boot', 'Tableau', 'Node.js',
+    ], dtype=object)
+    separators = np.array([' | ', ',', ';', '|', ', ', '||'], dtype=object)
+    levels = np.array(['', 'Senior ', 'Junior ', 'Lead ', 'Associate ', 'Sr. '], dtype=object)
+    roles = np.array([
+        'Software Engineer', 'Data Analyst', 'Java Developer', 'Sales Executive', 'HR Recruiter',
+        'Business Analyst', 'QA Engineer', 'Data Scientist', 'Project Manager', 'SAP Consultant',
+        'Web Developer', 'Accountant', 'Customer Support', 'DevOps Engineer', 'VLSI Design Engineer',
+    ], dtype=object)
+    industries = np.array([
+        'IT-Software, Software Services', 'BPO, Call Centre, ITeS', 'Banking, Financial Services, Broking',
+        'Recruitment, Staffing', 'Education, Teaching, Training', 'Medical, Healthcare, Hospitals',
+        'Semiconductors, Electronics', 'Retail, Wholesale', 'Internet, Ecommerce',
+    ], dtype=object)
+    role_categories = np.array([
+        'Programming & Design', 'Voice', 'Retail Sales', 'HR', 'Analytics & BI',
+        'System Design/Implementation/ERP/CRM', 'Accounts', 'Other',
+    ], dtype=object)
+    functional_areas = np.array([
+        'IT Software - Application Programming, Maintenance', 'ITES, BPO, KPO, LPO, Customer Service, Operations',
+        'Sales, Retail, Business Development', 'HR, Recruitment, Administration, IR', 'Analytics & Business Intelligence',
+        'Accounts, Finance, Tax, Company Secretary, Audit',
+    ], dtype=object)
+
+    skill_counts = rng.integers(0, 9, rows)
+    picks = rng.integers(0, len(skills), skill_counts.sum())
+    seps = rng.integers(0, len(separators), skill_counts.sum())
+    key_skills, offset = [], 0
+    for count in skill_counts.tolist():
+        key_skills.append(''.join(
+            skills[picks[offset + j]] + (separators[seps[offset + j]] if j < count - 1 else '')
+            for j in range(count)
+        ))
+        offset += count
+    frame = pd.DataFrame({
+        'Job Title': levels[rng.integers(0, len(levels), rows)] + roles[rng.integers(0, len(roles), rows)],
+        'Key Skills': key_skills,
+        'Job Experience Required': experience[rng.integers(0, len(experience), rows)],
+        'Role Category': role_categories[rng.integers(0, len(role_categories), rows)],
+        'Functional Area': functional_areas[rng.integers(0, len(functional_areas), rows)],
+        'Industry': industries[rng.integers(0, len(industries), rows)],
+        'Job Salary': salaries[rng.integers(0, len(salaries), rows)],
+    })
+    missing = rng.random((rows, 3)) < 0.03
+    for j, column in enumerate(['Key Skills', 'Job Experience Required', 'Job Salary']):
+        frame.loc[missing[:, j], column] = np.nan
+    return frame
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parity check and benchmark of the row-wise vs vectorized parsers"""
+    parser = argparse.ArgumentParser(description="Compare row-wise and vectorized job column parsing")
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--csv', default=None, help="Use (or create) this CSV instead of an in-memory frame")
+    args = parser.parse_args(argv)
+
+    if args.csv:
+        try:
+            frame = pd.read_csv(args.csv)
+        except FileNotFoundError:
+            synthetic_jobs(args.rows).to_csv(args.csv, index=False)
+            frame = pd.read_csv(args.csv)
+    else:
+        frame = synthetic_jobs(args.rows)
+
+    checks = [
+        ('Job Salary', extract_salary, parse_salary_column),
+        ('Job Experience Required', extract_experience, parse_experience_column),
+        ('Key Skills', extract_skills, parse_skills_column),
+    ]
+    ok = True
+    for column, row_parser, column_parser in checks:
+        started = time.perf_counter()
+        expected = frame[column].apply(row_parser)
+        row_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        actual = column_parser(frame[column])
+        column_seconds = time.perf_counter() - started
+        try:
+            pd.testing.assert_series_equal(actual, expected, check_names=False)
+            status = "identical"
+        except AssertionError as e:
+            ok = False
+            status = f"MISMATCH: {e}"
+        print(f"{column:<24} {len(frame):>9,} rows  row-wise {row_seconds:7.2f}s  "
+              f"vectorized {column_seconds:7.2f}s  ({row_seconds / max(column_seconds, 1e-9):.1f}x)  {status}")
+
+    started = time.perf_counter()
+    expected = SkillMatrix.from_skill_lists(frame['Key Skills'].apply(extract_skills))
+    row_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    actual = parse_skills_matrix(frame['Key Skills'])
+    column_seconds = time.perf_counter() - started
+    same = (actual.vocab == expected.vocab and np.array_equal(actual.indptr, expected.indptr)
+            and np.array_equal(actual.indices, expected.indices))
+    ok = ok and same
+    print(f"{'Key Skills (CSR)':<24} {len(frame):>9,} rows  row-wise {row_seconds:7.2f}s  "
+          f"vectorized {column_seconds:7.2f}s  ({row_seconds / max(column_seconds, 1e-9):.1f}x)  "
+          f"{'identical' if same else 'MISMATCH'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,380 @@
+"""
+Columnar cache of the preprocessed analytics jobs frame
+Stores the parsed salary/experience columns, the categorical text columns
+(as codes plus categories) and the CSR skill matrix as plain .npy files, keyed by the SHA-256 of
+the source CSV, so later start-ups skip CSV parsing and the regex passes.
+Entries are written chunk by chunk (JobsCacheWriter) and can be read back
+memory-mapped in row ranges (JobsCacheReader), which the out-of-core
+analytics relies on.
+
+Layout of <JOBS_CACHE_DIR>/<key>/:
+    manifest.json           source path/hash, row count, column list, dedup report
+    index.npy               original row labels (gaps where duplicates were dropped)
+    <column>.codes.npy      int32 codes, -1 for missing (categorical columns)
+    <column>.values.npy     categories as one UTF-8 byte buffer (categorical columns)
+    <column>.offsets.npy    category boundaries in that buffer
+    <column>.npy            numeric columns (salary_clean, experience_years)
+    skills.indptr.npy       CSR skill matrix: row offsets,
+    skills.indices.npy      skill ids,
+    skills.vocab.*.npy      and the interned vocabulary (stored like a string column)
+
+Usage:
+    python -m app.services.career.jobs_cache --csv data/jobs.csv
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.services.career.skill_index import SkillMatrix
+
+FORMAT_VERSION = 2
+_BLOCK = 1 << 22  # Values copied per step when finishing an array
+_SOURCES_FILE = 'sources.json'  # path -> (size, mtime, sha256) so unchanged files are not re-hashed
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_hash(csv_path: str, cache_dir: Optional[str] = None) -> str:
+    """SHA-256 of the source file, reusing the last hash while size and mtime are unchanged"""
+    path = Path(csv_path).resolve()
+    stat = path.stat()
+    sources_file = Path(cache_dir or settings.JOBS_CACHE_DIR) / _SOURCES_FILE
+    try:
+        sources = json.loads(sources_file.read_text())
+    except (OSError, ValueError):
+        sources = {}
+    known = sources.get(str(path))
+    if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+        return known['sha256']
+
+    sha256 = _file_sha256(path)
+    sources[str(path)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256}
+    try:
+        sources_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = sources_file.with_name(f'{_SOURCES_FILE}.{os.getpid()}.{uuid.uuid4().hex}')
+        tmp.write_text(json.dumps(sources, indent=2))
+        os.replace(tmp, sources_file)
+    except OSError:
+        pass
+    return sha256
+
+
+def _save_strings(path_prefix: Path, values) -> None:
+    """Store strings Arrow-style (one UTF-8 buffer plus offsets) instead of a fixed-width array"""
+    encoded = [str(value).encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    np.save(f"{path_prefix}.values.npy", np.frombuffer(b''.join(encoded), dtype=np.uint8))
+    np.save(f"{path_prefix}.offsets.npy", offsets)
+
+
+def _load_strings(path_prefix: Path) -> List[str]:
+    buffer = np.load(f"{path_prefix}.values.npy").tobytes()
+    bounds = np.load(f"{path_prefix}.offsets.npy").tolist()
+    return [buffer[bounds[i]:bounds[i + 1]].decode('utf-8') for i in range(len(bounds) - 1)]
+
+
+def cache_key(csv_path: str, cache_dir: Optional[str] = None) -> str:
+    """Cache key: source hash plus everything else that changes the preprocessed rows"""
+    parts = [
+        source_hash(csv_path, cache_dir),
+        f"v{FORMAT_VERSION}",
+        f"dedup={settings.JOB_DEDUP_ENABLED}:{settings.JOB_DEDUP_THRESHOLD}:"
+        f"{settings.JOB_DEDUP_NUM_PERM}:{settings.JOB_DEDUP_BANDS}",
+    ]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:24]
+
+
+def _discard(path: Path):
+    """Move a directory out of the way under a unique name, then delete it"""
+    trash = path.with_name(f'{path.name}.{uuid.uuid4().hex}.old')
+    try:
+        path.rename(trash)
+    except OSError:
+        return
+    shutil.rmtree(trash, ignore_errors=True)
+
+
+class JobsCacheWriter:
+    """
+    Writes a cache entry one preprocessed chunk at a time
+
+    Categorical codes, numeric values and skill entries are appended to raw
+    files as chunks arrive; categories and the skill vocabulary grow in order
+    of first appearance (the order union_categoricals and SkillMatrix.concat
+    give the in-memory frame). commit() turns the raw files into .npy arrays
+    and publishes the entry, so a corpus larger than RAM can be cached.
+    """
+
+    def __init__(self, csv_path: str, cache_dir: Optional[str] = None):
+        self.csv_path = csv_path
+        self.cache_dir = cache_dir
+        self.root = Path(cache_dir or settings.JOBS_CACHE_DIR)
+        self.key = cache_key(csv_path, cache_dir)
+        # Private to this writer, so concurrent writers (other workers, the CLI) never share files
+        self.tmp = self.root / f'{self.key}.{os.getpid()}.{uuid.uuid4().hex}.tmp'
+        self.tmp.mkdir(parents=True)
+        self.rows = 0
+        self.entries = 0
+        self._columns: List[Dict[str, Any]] = []
+        self._categories: Dict[str, Dict[str, int]] = {}
+        self._dtypes: Dict[str, np.dtype] = {}
+        self._vocab: Dict[str, int] = {}
+        self._files: Dict[str, Any] = {}
+        self._raw_dtypes: Dict[str, np.dtype] = {}
+
+    def _write(self, name: str, values: np.ndarray):
+        if name not in self._files:
+            self._files[name] = open(self.tmp / f'{name}.raw', 'wb')
+            self._raw_dtypes[name] = values.dtype
+        self._files[name].write(np.ascontiguousarray(values, dtype=self._raw_dtypes[name]).tobytes())
+
+    def append(self, jobs_df: pd.DataFrame, skills: SkillMatrix):
+        """Append preprocessed rows and their skill matrix (rows in the same order)"""
+        if not self._columns:
+            for name in jobs_df.columns:
+                kind = 'numeric' if pd.api.types.is_numeric_dtype(jobs_df[name]) else 'categorical'
+                self._columns.append({'name': name, 'kind': kind})
+                if kind == 'categorical':
+                    self._categories[name] = {}
+        self._write('index', jobs_df.index.to_numpy(dtype=np.int64))
+        for column in self._columns:
+            name = column['name']
+            series = jobs_df[name]
+            if column['kind'] == 'categorical':
+                series = series.astype('category')
+                known = self._categories[name]
+                ids = np.array([known.setdefault(c, len(known)) for c in series.cat.categories] + [-1], dtype=np.int32)
+                self._write(name, ids[series.cat.codes.to_numpy()])  # Code -1 (missing) picks the trailing -1
+            else:
+                values = series.to_numpy()
+                self._dtypes[name] = np.result_type(self._dtypes.get(name, values.dtype), values.dtype)
+                self._write(name, values.astype(np.float64))
+
+        ids = np.array([self._vocab.setdefault(skill, len(self._vocab)) for skill in skills.vocab], dtype=np.int32)
+        self._write('skills.indptr', skills.indptr[1:] + self.entries)
+        self._write('skills.indices', ids[skills.indices] if len(ids) else np.empty(0, dtype=np.int32))
+        self.rows += len(jobs_df)
+        self.entries += len(skills.indices)
+
+    def _finish(self, name: str, dtype, head: Optional[np.ndarray] = None):
+        """Copy a raw file into <name>.npy block by block (optionally after head) and delete it"""
+        raw = self.tmp / f'{name}.raw'
+        size = raw.stat().st_size if raw.exists() else 0
+        values = np.memmap(raw, dtype=self._raw_dtypes[name], mode='r') if size else np.empty(0, dtype=dtype)
+        offset = 0 if head is None else len(head)
+        out = np.lib.format.open_memmap(self.tmp / f'{name}.npy', mode='w+', dtype=dtype,
+                                        shape=(offset + len(values),))
+        if head is not None:
+            out[:offset] = head
+        for start in range(0, len(values), _BLOCK):
+            out[offset + start:offset + start + _BLOCK] = values[start:start + _BLOCK]
+        out.flush()
+        del out, values
+        raw.unlink(missing_ok=True)
+
+    def commit(self, dedup_report: Optional[Dict[str, Any]] = None) -> Path:
+        """
+        Finish the arrays and publish the entry
+
+        Older cache entries for the same source file are removed.
+
+        Returns:
+            The cache entry directory
+        """
+        for f in self._files.values():
+            f.close()
+        self._finish('index', np.int64)
+        for column in self._columns:
+            name = column['name']
+            if column['kind'] == 'categorical':
+                self._finish(name, np.int32)
+                (self.tmp / f'{name}.npy').rename(self.tmp / f'{name}.codes.npy')
+                _save_strings(self.tmp / name, list(self._categories[name]))
+            else:
+                self._finish(name, self._dtypes.get(name, np.float64))
+        self._finish('skills.indptr', np.int64, head=np.zeros(1, dtype=np.int64))
+        self._finish('skills.indices', np.int32)
+        _save_strings(self.tmp / 'skills.vocab', list(self._vocab))
+
+        manifest = {
+            'format_version': FORMAT_VERSION,
+            'source': str(Path(self.csv_path).resolve()),
+            'source_sha256': source_hash(self.csv_path, self.cache_dir),
+            'rows': self.rows,
+            'columns': self._columns,
+            'dedup': dedup_report,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        }
+        (self.tmp / 'manifest.json').write_text(json.dumps(manifest, indent=2))
+
+        out = self.root / self.key
+        if out.exists() and not (out / 'manifest.json').exists():
+            _discard(out)  # Incomplete leftover
+        try:
+            self.tmp.rename(out)  # Atomic; fails when another writer has published this key
+        except OSError:
+            if not (out / 'manifest.json').exists():
+                raise
+            # Same key means same source and settings, so the published entry is equivalent
+            shutil.rmtree(self.tmp, ignore_errors=True)
+        for entry in self.root.iterdir():
+            if entry == out or entry.suffix in ('.tmp', '.old') or not (entry / 'manifest.json').exists():
+                continue  # Other writers' work in progress is theirs to publish or abort
+            try:
+                if json.loads((entry / 'manifest.json').read_text()).get('source') == manifest['source']:
+                    _discard(entry)
+            except ValueError:
+                continue
+        return out
+
+    def abort(self):
+        for f in self._files.values():
+            f.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+
+def save_jobs_cache(
+    csv_path: str,
+    jobs_df: pd.DataFrame,
+    skills: SkillMatrix,
+    dedup_report: Optional[Dict[str, Any]] = None,
+    cache_dir: Optional[str] = None
+) -> Path:
+    """
+    Write the preprocessed frame and its skill matrix to the cache
+
+    Older cache entries for the same source file are removed.
+
+    Returns:
+        The cache entry directory
+    """
+    writer = JobsCacheWriter(csv_path, cache_dir)
+    try:
+        writer.append(jobs_df, skills)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.commit(dedup_report)
+
+
+class JobsCacheReader:
+    """Row-range access to a cache entry, memory-mapped unless mmap=False"""
+
+    def __init__(self, entry: Path, manifest: Dict[str, Any], mmap: bool = True):
+        self.entry = entry
+        self.manifest = manifest
+        mode = 'r' if mmap else None
+        self.index = np.load(entry / 'index.npy', mmap_mode=mode)
+        self.columns: Dict[str, np.ndarray] = {}
+        self.categories: Dict[str, pd.CategoricalDtype] = {}
+        for column in manifest['columns']:
+            name = column['name']
+            if column['kind'] == 'categorical':
+                self.columns[name] = np.load(entry / f'{name}.codes.npy', mmap_mode=mode)
+                self.categories[name] = pd.CategoricalDtype(pd.Index(_load_strings(entry / name)))
+            else:
+                self.columns[name] = np.load(entry / f'{name}.npy', mmap_mode=mode)
+        self.vocab = _load_strings(entry / 'skills.vocab')
+        self.indptr = np.load(entry / 'skills.indptr.npy', mmap_mode=mode)
+        self.indices = np.load(entry / 'skills.indices.npy', mmap_mode=mode)
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.index)
+
+    def row_groups(self, size: int) -> List[Tuple[int, int]]:
+        """(start, stop) row ranges of at most size rows"""
+        return [(start, min(start + size, self.n_rows)) for start in range(0, self.n_rows, max(size, 1))]
+
+    def frame(self, start: int = 0, stop: Optional[int] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Rows [start, stop) (optionally only some columns) as a frame with categorical text columns"""
+        stop = self.n_rows if stop is None else stop
+        data = {}
+        for name, values in self.columns.items():
+            if columns is not None and name not in columns:
+                continue
+            values = np.asarray(values[start:stop])
+            if name in self.categories:
+                data[name] = pd.Categorical.from_codes(values, dtype=self.categories[name])
+            else:
+                data[name] = values
+        return pd.DataFrame(data, index=pd.Index(np.asarray(self.index[start:stop])))
+
+    def skills(self, start: int = 0, stop: Optional[int] = None) -> SkillMatrix:
+        """Skill matrix of rows [start, stop) over the full vocabulary"""
+        stop = self.n_rows if stop is None else stop
+        indptr = np.asarray(self.indptr[start:stop + 1])
+        return SkillMatrix(self.vocab, indptr - indptr[0], np.asarray(self.indices[indptr[0]:indptr[-1]]))
+
+
+def open_jobs_cache(
+    csv_path: str,
+    cache_dir: Optional[str] = None,
+    mmap: bool = True
+) -> Optional[JobsCacheReader]:
+    """Reader over the cache entry for csv_path's current contents, or None on a miss"""
+    entry = Path(cache_dir or settings.JOBS_CACHE_DIR) / cache_key(csv_path, cache_dir)
+    try:
+        manifest = json.loads((entry / 'manifest.json').read_text())
+    except (OSError, ValueError):
+        return None
+    if manifest.get('format_version') != FORMAT_VERSION:
+        return None
+    return JobsCacheReader(entry, manifest, mmap=mmap)
+
+
+def load_jobs_cache(
+    csv_path: str,
+    cache_dir: Optional[str] = None
+) -> Optional[Tuple[pd.DataFrame, SkillMatrix, Dict[str, Any]]]:
+    """
+    Load the cached frame for csv_path if an entry for its current contents exists
+
+    Returns:
+        (frame with categorical text columns, skill matrix, manifest), or None on a miss
+    """
+    reader = open_jobs_cache(csv_path, cache_dir, mmap=False)
+    if reader is None:
+        return None
+    return reader.frame(), reader.skills(), reader.manifest
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Build the preprocessed analytics cache for a jobs CSV")
+    parser.add_argument('--csv', default=settings.JOBS_CSV_PATH)
+    args = parser.parse_args(argv)
+    if not args.csv or not Path(args.csv).exists():
+        parser.error("No CSV given (use --csv or set JOBS_CSV_PATH)")
+
+    from app.services.career.out_of_core import create_analytics
+
+    started = time.perf_counter()
+    analytics = create_analytics(args.csv)
+    rows = analytics.active_rows()
+    source = "cache" if analytics.loaded_from_cache else "CSV"
+    print(f"Jobs cache ready for {args.csv}: {rows} rows from {source} "
+          f"in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
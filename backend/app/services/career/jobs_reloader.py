@@ -0,0 +1,211 @@
+"""
+Hot reload of the jobs dataset
+JobsReloader owns the current jobs snapshot: the CareerAnalytics service
+plus a version number. When JOBS_CSV_PATH changes (polled by a watcher
+thread) or an admin triggers a reload, the replacement analytics (and, when
+the RAG engine owns a local Chroma store, a replacement engine built in a
+staging collection) are built in a background thread and swapped in
+together. Requests read the snapshot once and keep using it, so they never
+wait on a reload and never mix data from two versions.
+
+Every server worker runs its own reloader (each holds its own analytics),
+but the Chroma store is shared: the first worker to take the engine's
+rebuild_lock rebuilds and promotes the RAG index. The others wait for the
+lock, find the live collection already built from the same CSV and reopen
+it, so every worker swaps in analytics and RAG index together.
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from app.config import settings
+from app.services.career.analytics_service import CareerAnalytics
+from app.services.career.engine_manager import RAGEngineManager
+from app.services.career.out_of_core import create_analytics
+
+# Build states
+IDLE = 'idle'
+BUILDING = 'building'
+
+
+class JobsSnapshot(NamedTuple):
+    """One consistent version of the jobs data"""
+    version: int
+    analytics: CareerAnalytics
+    source: Optional[Tuple[int, int]]  # (size, mtime_ns) of the CSV it was built from
+    loaded_at: float
+
+
+def _source_stat(csv_path: Optional[str]) -> Optional[Tuple[int, int]]:
+    try:
+        stat = Path(csv_path).stat()
+    except (OSError, TypeError):
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _source_stamp(source: Optional[Tuple[int, int]]) -> Optional[str]:
+    """The jobs_source stamp RAG builds record for a CSV stat"""
+    return None if source is None else f"{source[0]}:{source[1]}"
+
+
+class JobsReloader:
+    """Watches the jobs CSV and swaps in freshly built analytics and RAG engines"""
+
+    def __init__(
+        self,
+        csv_path: Optional[str] = None,
+        rag_engines: Optional[RAGEngineManager] = None,
+        analytics_factory: Callable[[Optional[str]], CareerAnalytics] = create_analytics,
+        poll_seconds: Optional[float] = None
+    ):
+        """
+        Load the initial snapshot (synchronously, like the service it replaces)
+
+        Args:
+            csv_path: Jobs CSV to load and watch (defaults to JOBS_CSV_PATH)
+            rag_engines: Manager of the live RAG engine, rebuilt on reload
+            analytics_factory: Builds the analytics service for a CSV path
+            poll_seconds: Watch interval (defaults to JOBS_RELOAD_POLL_SECONDS; 0 disables)
+        """
+        self.csv_path = csv_path or settings.JOBS_CSV_PATH
+        self.rag_engines = rag_engines
+        self._factory = analytics_factory
+        self.poll_seconds = settings.JOBS_RELOAD_POLL_SECONDS if poll_seconds is None else poll_seconds
+        self._lock = threading.Lock()  # Guards the build state; snapshot reads never take it
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self.state = IDLE
+        self._pending: Optional[str] = None  # Reason of a reload requested while building
+        self.last_reason: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.last_build_seconds: Optional[float] = None
+        self.rag_rebuilt: Optional[bool] = None
+        self.rag_reopened = 0  # Reloads that reopened an index another worker had rebuilt
+        self.snapshot = JobsSnapshot(0, analytics_factory(self.csv_path), _source_stat(self.csv_path), time.time())
+        self._attempted = self.snapshot.source  # Source of the last build, so a failing file is not retried every poll
+
+    @property
+    def analytics(self) -> CareerAnalytics:
+        """Analytics service of the current snapshot"""
+        return self.snapshot.analytics
+
+    @property
+    def version(self) -> int:
+        return self.snapshot.version
+
+    def start(self):
+        """Start the file watcher (no-op when watching is disabled or already running)"""
+        if self.poll_seconds <= 0 or not self.csv_path or self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="jobs-reload-watch", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+        self._watcher = None
+
+    def _watch(self):
+        last_seen = self._attempted
+        while not self._stop.wait(self.poll_seconds):
+            seen = _source_stat(self.csv_path)
+            # Reload once the file differs from the last build and has stopped changing;
+            # a change made during a build is picked up after it
+            if self.state == IDLE and seen is not None and seen != self._attempted and seen == last_seen:
+                self.trigger('file_changed')
+            last_seen = seen
+
+    def trigger(self, reason: str = 'manual') -> Dict[str, Any]:
+        """
+        Request a reload in the background
+
+        A request made while a build is running is queued and runs once that
+        build finishes (several requests coalesce into one).
+        """
+        with self._lock:
+            if self.state == BUILDING:
+                self._pending = reason
+                return {'accepted': True, 'queued': True, 'version': self.version}
+            self.state = BUILDING
+        threading.Thread(target=self._run, args=(reason,), name="jobs-reload", daemon=True).start()
+        return {'accepted': True, 'queued': False, 'version': self.version}
+
+    def _run(self, reason: str):
+        while True:
+            try:
+                self.reload(reason)
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"Jobs reload failed ({reason}): {e}")
+            with self._lock:
+                if self._pending is None:
+                    self.state = IDLE
+                    return
+                reason, self._pending = self._pending, None
+
+    def reload(self, reason: str = 'manual') -> JobsSnapshot:
+        """Build the new snapshot in the calling thread and swap it in"""
+        started = time.monotonic()
+        source = self._attempted = _source_stat(self.csv_path)
+        analytics = self._factory(self.csv_path)
+        if not analytics.loaded:
+            raise RuntimeError(f"No job data could be loaded from {self.csv_path}")
+
+        live = self.rag_engines.get() if self.rag_engines is not None and settings.JOBS_RELOAD_RAG else None
+        engine = current = None  # Rebuilt engine; engine serving the new data
+        if live is not None and live.can_rebuild:
+            stamp = _source_stamp(source)
+            # The first worker to get the lock rebuilds the shared store; the rest wait for it and
+            # reopen what it promoted, so no worker serves new analytics beside the old index
+            with live.rebuild_lock():
+                if stamp is None or live.indexed_source() != stamp:
+                    sources = list(live.data_sources)
+                    if self.csv_path not in sources:
+                        sources.append(self.csv_path)
+                    engine = live.build_replacement(sources, source=stamp)
+                    engine.promote(live)
+                    current = engine
+                else:
+                    live.refresh_corpus_version()
+                    self.rag_reopened += 1
+                    current = live
+
+        # Everything is built; the swap itself is a couple of reference assignments
+        with self._lock:
+            version = self.snapshot.version + 1
+            if current is not None:
+                self.rag_engines.swap(current, version)
+            self.snapshot = JobsSnapshot(version, analytics, source, time.time())
+        self.last_reason = reason
+        self.last_error = None
+        self.rag_rebuilt = engine is not None
+        self.last_build_seconds = round(time.monotonic() - started, 2)
+        print(f"Jobs data reloaded ({reason}): version {version}, {analytics.active_rows()} rows "
+              f"in {self.last_build_seconds:.1f}s" + ("" if engine is None else ", RAG index rebuilt"))
+        return self.snapshot
+
+    def rag_in_sync(self) -> Optional[bool]:
+        """Whether the live RAG index was built from the CSV of the current snapshot (None when not tracked)"""
+        engine = self.rag_engines.get() if self.rag_engines is not None and settings.JOBS_RELOAD_RAG else None
+        if engine is None or not engine.can_rebuild or self.snapshot.version == 0:
+            return None
+        return engine.indexed_source() == _source_stamp(self.snapshot.source)
+
+    def status(self) -> Dict[str, Any]:
+        """Current version and reload state for the admin and readiness endpoints"""
+        snapshot = self.snapshot
+        return {
+            'version': snapshot.version,
+            'state': self.state,
+            'rows': snapshot.analytics.active_rows(),
+            'loaded_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(snapshot.loaded_at)),
+            'watching': self._watcher is not None,
+            'last_reason': self.last_reason,
+            'last_build_seconds': self.last_build_seconds,
+            'rag_rebuilt': self.rag_rebuilt,
+            'rag_reopened': self.rag_reopened,
+            'rag_in_sync': self.rag_in_sync(),
+            'last_error': self.last_error,
+        }
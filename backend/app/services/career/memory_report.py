@@ -0,0 +1,108 @@
+"""
+Memory footprint of the analytics jobs frame
+Compares the legacy layout (object text columns plus a Python list of fresh
+skill strings per row, as `Series.apply` built them) with the compact one
+CareerAnalytics keeps: categorical text columns plus the CSR skill matrix
+over an interned vocabulary. Object memory is counted once per distinct
+object, so shared strings are not double-counted.
+
+Usage:
+    python -m app.services.career.memory_report [--csv data/jobs.csv] [--rows 500000]
+"""
+import argparse
+import io
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.services.career.analytics_service import CareerAnalytics
+from app.services.career.ingestion import JOB_COLUMNS
+from app.services.career.job_parsing import extract_experience, extract_salary, extract_skills, synthetic_jobs
+
+
+def _object_nbytes(values, seen: set) -> int:
+    """Pointer array plus every not-yet-seen object (list items included)"""
+    total = 8 * len(values)
+    for value in values:
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        total += sys.getsizeof(value)
+        if isinstance(value, list):
+            total += _object_nbytes(value, seen) - 8 * len(value)  # The list's own pointers are in getsizeof
+    return total
+
+
+def frame_nbytes(df: pd.DataFrame) -> Dict[str, int]:
+    """Bytes per column, counting each distinct Python object once per column"""
+    sizes = {'index': int(df.index.memory_usage(deep=True))}
+    for name in df.columns:
+        series = df[name]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            sizes[name] = series.cat.codes.nbytes + _object_nbytes(series.cat.categories.tolist(), set())
+        elif series.dtype == object:
+            sizes[name] = _object_nbytes(series.tolist(), set())
+        else:
+            sizes[name] = int(series.memory_usage(deep=True, index=False))
+    return sizes
+
+
+def legacy_frame(raw: pd.DataFrame) -> pd.DataFrame:
+    """The frame as the original row-wise preprocessing built it"""
+    df = raw[[c for c in JOB_COLUMNS if c in raw]].copy()
+    for name in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[name]):
+            df[name] = df[name].astype(object)
+    df['salary_clean'] = df['Job Salary'].apply(extract_salary)
+    df['experience_years'] = df['Job Experience Required'].apply(extract_experience)
+    df['skills_list'] = df['Key Skills'].apply(extract_skills)
+    return df
+
+
+def _mb(n: int) -> str:
+    return f"{n / 1e6:10.1f} MB"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Print the per-column memory of the legacy and compact layouts"""
+    parser = argparse.ArgumentParser(description="Report memory of the legacy vs compact analytics frame")
+    parser.add_argument('--csv', default=None, help="Jobs CSV (default: synthetic rows)")
+    parser.add_argument('--rows', type=int, default=500_000, help="Synthetic rows when no CSV is given")
+    args = parser.parse_args(argv)
+
+    if args.csv:
+        raw = pd.read_csv(args.csv, usecols=lambda c: c in JOB_COLUMNS)
+        print(f"{args.csv}: {len(raw):,} rows")
+    else:
+        # Round-trip through CSV text so every cell is a fresh string, as read_csv produces
+        raw = pd.read_csv(io.StringIO(synthetic_jobs(args.rows).to_csv(index=False)))
+        print(f"Synthetic jobs: {len(raw):,} rows")
+
+    started = time.perf_counter()
+    before = frame_nbytes(legacy_frame(raw))
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compact_df, skills = CareerAnalytics._preprocess_frame(raw.copy())
+    compact_seconds = time.perf_counter() - started
+    after = frame_nbytes(compact_df)
+    after['Key Skills / skills_list'] = skills.nbytes()
+    before['Key Skills / skills_list'] = before.pop('Key Skills') + before.pop('skills_list')
+
+    print(f"{'column':<28} {'legacy':>13} {'compact':>13}")
+    for name in before:
+        print(f"{name:<28} {_mb(before[name])} {_mb(after.get(name, 0))}")
+    total_before, total_after = sum(before.values()), sum(after.values())
+    print(f"{'total':<28} {_mb(total_before)} {_mb(total_after)}  "
+          f"({total_before / max(total_after, 1):.1f}x smaller)")
+    print(f"preprocessing: legacy {legacy_seconds:.2f}s, compact {compact_seconds:.2f}s; "
+          f"{len(skills.vocab):,} distinct skills, {len(skills.indices):,} skill entries "
+          f"({np.diff(skills.indptr).mean():.1f} per row)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
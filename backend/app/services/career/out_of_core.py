@@ -0,0 +1,344 @@
+"""
+Out-of-core career analytics
+OutOfCoreAnalytics answers the CareerAnalytics get_* methods without holding
+the jobs frame in memory. The columnar cache (written chunk by chunk when it
+is missing) is memory-mapped and processed in row groups:
+
+- At load, worker processes summarize row groups into mergeable partials:
+  skill mention and row counts, salary sketches, title aggregates,
+  co-occurrence counts and the set of skills present in the group. The
+  partials are merged in row order.
+- Queries that need rows (salary and industry insights for a skill filter)
+  scan the row groups in a thread pool, skipping groups that list none of the
+  matched skills, and merge per-group counts.
+
+Answers equal the in-memory service's, with two exceptions. The mean is
+summed per value rather than over one array, so it can differ in the last
+bits. Sketch quantiles, once a sketch has compacted, stay within the sketch's
+rank error.
+"""
+import json
+import math
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.services.career.analytics_service import CareerAnalytics, ReadOnlyAnalyticsError, sketch_entries
+from app.services.career.dedup import make_dedup_filter
+from app.services.career.ingestion import JOB_COLUMNS, iter_job_chunks
+from app.services.career.jobs_cache import JobsCacheReader, JobsCacheWriter, open_jobs_cache
+from app.services.career.quantile_sketch import SkillSalarySketches
+from app.services.career.skill_cooccurrence import SkillCooccurrence
+from app.services.career.skill_index import SkillIndex, SkillMatrix
+from app.services.career.title_index import TitleIndex
+
+_DISTRIBUTION_COLUMNS = ('Industry', 'Role Category')
+_SUMMARY_COLUMNS = ['Job Title', 'salary_clean', 'experience_years']
+
+_readers: Dict[str, JobsCacheReader] = {}  # Per worker process, by cache entry
+_scan_pool: Optional[ThreadPoolExecutor] = None
+_scan_pool_lock = threading.Lock()
+
+
+def _workers() -> int:
+    return settings.ANALYTICS_WORKERS or os.cpu_count() or 1
+
+
+def _scan_executor() -> ThreadPoolExecutor:
+    """Process-wide thread pool for row-group scans (numpy releases the GIL in the heavy kernels)"""
+    global _scan_pool
+    with _scan_pool_lock:
+        if _scan_pool is None:
+            _scan_pool = ThreadPoolExecutor(max_workers=_workers(), thread_name_prefix="analytics-scan")
+        return _scan_pool
+
+
+class RowGroupSummary(NamedTuple):
+    """Mergeable aggregates of one row group"""
+    start: int
+    stop: int
+    occurrences: np.ndarray  # Mentions per skill
+    doc_freq: np.ndarray  # Rows per skill
+    sketches: SkillSalarySketches
+    titles: List[str]
+    title_aggregates: Dict[Tuple[int, int], Any]
+    cooccurrence: SkillCooccurrence
+
+
+def summarize_row_group(reader: JobsCacheReader, start: int, stop: int, k: int) -> RowGroupSummary:
+    """Aggregates of rows [start, stop), built with the same code the in-memory indexes use"""
+    frame = reader.frame(start, stop, columns=_SUMMARY_COLUMNS)
+    skills = reader.skills(start, stop)
+    n_skills = len(reader.vocab)
+    entry_rows = skills.row_ids()
+    distinct = np.unique(entry_rows * n_skills + skills.indices) % n_skills
+    sketches = SkillSalarySketches(k=k)
+    sketch_entries(sketches, frame, entry_rows, skills.indices, n_skills)
+    titles = TitleIndex.from_frame(frame, skills)
+    return RowGroupSummary(
+        start, stop,
+        np.bincount(skills.indices, minlength=n_skills),
+        np.bincount(distinct, minlength=n_skills),
+        sketches, titles.titles, titles.aggregates,
+        SkillCooccurrence.from_matrix(skills)
+    )
+
+
+def _summarize_in_worker(entry: str, start: int, stop: int, k: int) -> RowGroupSummary:
+    reader = _readers.get(entry)
+    if reader is None:
+        manifest = json.loads((Path(entry) / 'manifest.json').read_text())
+        reader = _readers[entry] = JobsCacheReader(Path(entry), manifest)
+    return summarize_row_group(reader, start, stop, k)
+
+
+def _count_pairs(pairs: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct rows of an (n, 2) array, sorted, with their summed counts"""
+    if not len(pairs):
+        return pairs, counts
+    order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+    pairs, counts = pairs[order], counts[order]
+    starts = np.flatnonzero(np.r_[True, (pairs[1:] != pairs[:-1]).any(axis=1)])
+    return pairs[starts], np.add.reduceat(counts, starts)
+
+
+class RowGroupScan:
+    """
+    Counts over the rows a skill filter matched, merged across row groups
+
+    Rows are kept as counts per distinct (experience years, salary) pair
+    (missing years stored as -inf, missing salaries as +inf), which is enough
+    for the experience window, the row count and exact salary statistics.
+    """
+
+    def __init__(self, pairs: np.ndarray, pair_counts: np.ndarray, code_counts: Dict[str, np.ndarray]):
+        self.pairs = pairs
+        self.pair_counts = pair_counts
+        self.code_counts = code_counts
+
+    def __len__(self) -> int:
+        return int(self.pair_counts.sum())
+
+    @classmethod
+    def merge(cls, scans: List['RowGroupScan']) -> 'RowGroupScan':
+        if not scans:
+            return cls(np.empty((0, 2)), np.empty(0, dtype=np.int64), {})
+        pairs, counts = _count_pairs(np.concatenate([s.pairs for s in scans]),
+                                     np.concatenate([s.pair_counts for s in scans]))
+        return cls(pairs, counts, {name: sum(s.code_counts[name] for s in scans) for name in scans[0].code_counts})
+
+    def within(self, low: Optional[int], high: Optional[int]) -> 'RowGroupScan':
+        """The rows whose experience is within [low, high] (all rows when there is no range)"""
+        if low is None:
+            return self
+        keep = (self.pairs[:, 0] >= low) & (self.pairs[:, 0] <= high)
+        return RowGroupScan(self.pairs[keep], self.pair_counts[keep], {})
+
+
+def _scan_row_group(reader: JobsCacheReader, start: int, stop: int, skill_ids: Optional[np.ndarray]) -> RowGroupScan:
+    """Counts over the rows of [start, stop) listing any of skill_ids (None means every row)"""
+    if skill_ids is None:
+        rows = np.arange(stop - start)
+    else:
+        indptr = np.asarray(reader.indptr[start:stop + 1])
+        indices = np.asarray(reader.indices[indptr[0]:indptr[-1]])
+        entry_rows = np.repeat(np.arange(stop - start), np.diff(indptr))
+        matched = np.zeros(stop - start, dtype=bool)
+        matched[entry_rows[np.isin(indices, skill_ids)]] = True
+        rows = np.flatnonzero(matched)
+
+    code_counts = {}
+    for name in _DISTRIBUTION_COLUMNS:
+        if name in reader.categories:
+            codes = np.asarray(reader.columns[name][start:stop])[rows]
+            code_counts[name] = np.bincount(codes[codes >= 0], minlength=len(reader.categories[name].categories))
+    years = np.asarray(reader.columns['experience_years'][start:stop], dtype=np.float64)[rows]
+    salaries = np.asarray(reader.columns['salary_clean'][start:stop], dtype=np.float64)[rows]
+    pairs = np.column_stack([np.where(np.isnan(years), -np.inf, years), np.where(np.isnan(salaries), np.inf, salaries)])
+    pairs, counts = _count_pairs(pairs, np.ones(len(pairs), dtype=np.int64))
+    return RowGroupScan(pairs, counts, code_counts)
+
+
+def _order_statistic(values: np.ndarray, cumulative: np.ndarray, i: int) -> float:
+    """The i-th smallest value of the sample (0-based) given its distinct values and cumulative counts"""
+    return values[np.searchsorted(cumulative, i, side='right')]
+
+
+class OutOfCoreAnalytics(CareerAnalytics):
+    """CareerAnalytics over the memory-mapped jobs cache, processed in row groups (read-only)"""
+
+    read_only = True
+
+    def __init__(self, jobs_csv_path: Optional[str] = None):
+        """
+        Open (or build) the columnar cache for the jobs CSV and summarize it
+
+        Args:
+            jobs_csv_path: Path to jobs CSV file
+        """
+        self.reader: Optional[JobsCacheReader] = None
+        self.row_groups: List[Tuple[int, int]] = []
+        self.group_skills: List[np.ndarray] = []  # Sorted skill ids present in each row group
+        super().__init__(jobs_csv_path)
+
+    def _load_jobs(self, csv_path: str) -> None:
+        """Summarize the cache entry for csv_path (writing it first on a miss); the frame stays on disk"""
+        reader = open_jobs_cache(csv_path)
+        if reader is None:
+            if not self._write_cache(csv_path):
+                return None
+            reader = open_jobs_cache(csv_path)
+        else:
+            self.dedup_report = reader.manifest.get('dedup')
+            self.loaded_from_cache = True
+        self.reader = reader
+        self._summarize()
+        return None
+
+    def _write_cache(self, csv_path: str) -> bool:
+        """Stream the CSV into a cache entry chunk by chunk, preprocessed as CareerAnalytics does"""
+        dedup = make_dedup_filter(window=settings.JOB_DEDUP_WINDOW_ROWS)
+        writer = JobsCacheWriter(csv_path)
+        try:
+            for chunk in iter_job_chunks([csv_path], columns=JOB_COLUMNS, dedup=dedup):
+                writer.append(*self._preprocess_frame(chunk.drop(columns=['source_file'])))
+        except BaseException:
+            writer.abort()
+            raise
+        if dedup is not None:
+            self.dedup_report = dedup.report()
+        if not writer.rows:
+            writer.abort()
+            return False
+        writer.commit(self.dedup_report)
+        return True
+
+    def _summaries(self, groups: List[Tuple[int, int]], k: int) -> Iterator[RowGroupSummary]:
+        """Row-group summaries in row order, built by a process pool when there is more than one worker"""
+        workers = min(_workers(), len(groups))
+        if workers <= 1:
+            for start, stop in groups:
+                yield summarize_row_group(self.reader, start, stop, k)
+            return
+        # Spawned workers map the cache themselves; at most two groups per worker are in flight
+        context = multiprocessing.get_context('spawn')
+        entry = str(self.reader.entry)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            pending = deque()
+            for start, stop in groups:
+                pending.append(pool.submit(_summarize_in_worker, entry, start, stop, k))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _summarize(self):
+        """Merge the row-group summaries into the skill, salary, title and co-occurrence indexes"""
+        vocab = self.reader.vocab
+        occurrences = np.zeros(len(vocab), dtype=np.int64)
+        doc_freq = np.zeros(len(vocab), dtype=np.int64)
+        self.salary_sketches = SkillSalarySketches(k=settings.SALARY_SKETCH_K)
+        self.title_index = TitleIndex(SkillMatrix(vocab, np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32)))
+        self.cooccurrence = SkillCooccurrence(len(vocab))
+        self.row_groups = self.reader.row_groups(settings.ANALYTICS_ROW_GROUP_ROWS)
+        self.group_skills = []
+        for summary in self._summaries(self.row_groups, settings.SALARY_SKETCH_K):
+            occurrences += summary.occurrences
+            doc_freq += summary.doc_freq
+            self.salary_sketches.merge(summary.sketches)
+            self.title_index.add_aggregates(
+                summary.titles, summary.title_aggregates, int(self.reader.indptr[summary.start])
+            )
+            self.cooccurrence.merge(summary.cooccurrence)
+            self.group_skills.append(np.flatnonzero(summary.doc_freq).astype(np.int32))
+        self.skill_index = SkillIndex.from_frequencies(vocab, occurrences, doc_freq)
+
+    def add_jobs(self, jobs: pd.DataFrame) -> int:
+        raise ReadOnlyAnalyticsError("Out-of-core analytics is read-only; reload the jobs dataset instead")
+
+    def remove_jobs(self, labels: List[int]) -> int:
+        raise ReadOnlyAnalyticsError("Out-of-core analytics is read-only; reload the jobs dataset instead")
+
+    def active_rows(self) -> int:
+        return 0 if self.reader is None else self.reader.n_rows
+
+    @property
+    def skills(self) -> Optional[SkillMatrix]:
+        """Not kept in memory (see reader.skills)"""
+        return None
+
+    def _matching_rows(self, skill_ids: Optional[set]) -> RowGroupScan:
+        """Scan the row groups that list any of skill_ids (None means every row) in parallel"""
+        ids = None if skill_ids is None else np.array(sorted(skill_ids), dtype=np.int32)
+        groups = [
+            group for group, present in zip(self.row_groups, self.group_skills)
+            if ids is None or np.isin(ids, present, assume_unique=True).any()
+        ]
+        scans = _scan_executor().map(lambda group: _scan_row_group(self.reader, *group, ids), groups)
+        return RowGroupScan.merge(list(scans))
+
+    def _rows_within(self, rows: RowGroupScan, low: Optional[int], high: Optional[int]) -> RowGroupScan:
+        return rows.within(low, high)
+
+    def _exact_salary_stats(self, rows: RowGroupScan) -> Optional[Dict[str, Any]]:
+        """The statistics CareerAnalytics computes with pandas, from (salary, count) pairs"""
+        has_salary = np.isfinite(rows.pairs[:, 1])
+        values, inverse = np.unique(rows.pairs[has_salary, 1], return_inverse=True)
+        counts = np.bincount(inverse.ravel(), weights=rows.pair_counts[has_salary], minlength=len(values))
+        counts = counts.astype(np.int64)
+        n = int(counts.sum())
+        if n == 0:
+            return None
+        cumulative = np.cumsum(counts)
+
+        def quantile(q: float) -> float:
+            # Linear interpolation between the neighbouring order statistics, via numpy for identical rounding
+            position = (n - 1) * q
+            below = math.floor(position)
+            neighbours = [_order_statistic(values, cumulative, below),
+                          _order_statistic(values, cumulative, min(below + 1, n - 1))]
+            return float(np.quantile(np.array(neighbours), position - below))
+
+        middle = [_order_statistic(values, cumulative, (n - 1) // 2), _order_statistic(values, cumulative, n // 2)]
+        return {
+            'median': float(np.median(np.array(middle))),
+            'mean': float(np.dot(values, counts) / n),
+            'min': float(values[0]),
+            'max': float(values[-1]),
+            'percentile_25': quantile(0.25),
+            'percentile_75': quantile(0.75),
+            'sample_size': n,
+            'method': 'exact'
+        }
+
+    def _distributions(self, rows: RowGroupScan) -> Dict[str, Any]:
+        """Industry and role distributions from the merged category counts"""
+        return {
+            'industry_distribution': self._top_counts('Industry', rows, 10),
+            'role_distribution': self._top_counts('Role Category', rows, 10)
+        }
+
+    def _top_counts(self, column: str, rows: RowGroupScan, n: int) -> Dict[Any, int]:
+        counts = rows.code_counts.get(column)
+        if counts is None:
+            return {}
+        top = np.argsort(-counts, kind='stable')[:n]
+        categories = self.reader.categories[column].categories
+        return {categories[i]: int(counts[i]) for i in top.tolist() if counts[i] > 0}
+
+
+def create_analytics(jobs_csv_path: Optional[str] = None) -> CareerAnalytics:
+    """The analytics service for the configured mode (out-of-core needs the jobs cache)"""
+    if settings.ANALYTICS_OUT_OF_CORE:
+        if settings.JOBS_CACHE_DIR:
+            return OutOfCoreAnalytics(jobs_csv_path)
+        print("ANALYTICS_OUT_OF_CORE needs JOBS_CACHE_DIR; loading the jobs frame in memory")
+    return CareerAnalytics(jobs_csv_path)
@@ -2,167 +2,659 @@
 RAG Engine service for job matching
 Adapted from AI-Resume-Summarizer---Career-Navigator-main/src/rag_engine.py
 """
+import asyncio
+import os
+import threading
+import time
+import uuid
 import chromadb
-import pandas as pd
-from typing import List, Dict, Any, Optional
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
 from app.config import settings
+from app.services.career.bm25_index import BM25Index, reciprocal_rank_fusion
+from app.services.career.context_builder import build_jobs_context, format_job_line
+from app.services.career.index_snapshot import SnapshotIndex
+from app.services.career.ingestion import ingest_jobs, print_dedup_report
+from app.services.career.job_filters import MetadataColumns, build_where, clean_filters
+from app.services.career.search_cache import QueryResultCache, make_key
+from app.services.career.skill_matcher import SkillMatcher
+from app.services.career.vector_sidecar import VectorSidecarClient
 from app.services.llm.llm_service import LLMService
 
+# Optional: fcntl (POSIX) elects the one process that rebuilds the shared store
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_STAGING_SUFFIX = '_staging'
+_RETIRED_SUFFIX = '_retired'
+
 
 class RAGEngine:
     """RAG engine for job matching and career insights"""
     
-    def __init__(self, data_sources: Optional[List[str]] = None):
+    def __init__(
+        self,
+        data_sources: Optional[List[str]] = None,
+        auto_ingest: bool = True,
+        progress: Optional[Callable[..., None]] = None,
+        use_sidecar: Optional[bool] = None,
+        client=None,
+        encoder=None,
+        staging: bool = False
+    ):
         """
         Initialize RAG engine
         
         Args:
             data_sources: List of data source paths (CSV files)
+            auto_ingest: Build the vector store on start-up if it does not exist
+            progress: Optional callback(stage, done=None, total=None) for start-up progress
+            use_sidecar: Delegate embedding and search to the vector sidecar
+                (defaults to whether VECTOR_SIDECAR_SOCKET is set)
+            client: Chroma client to reuse instead of opening the store again
+            encoder: Loaded sentence encoder to reuse
+            staging: Build into a staging collection and keyword index file
+                of its own (see build_replacement)
         """
         self.data_sources = data_sources or []
-        self.client = chromadb.PersistentClient(path=settings.CHROMA_DB_PATH)
+        self._progress = progress or (lambda stage, done=None, total=None: None)
+        self.client = None
         self.collection = None
-        self.encoder = SentenceTransformer(settings.EMBEDDING_MODEL)
-        self.jobs_df = None
-        self.llm_service = LLMService()
+        self.encoder = None
+        # Each staging build gets unique names, so two builds never share (or delete) each other's files
+        suffix = f'{_STAGING_SUFFIX}_{uuid.uuid4().hex[:12]}' if staging else ''
+        self.collection_name = settings.VECTOR_DB_COLLECTION + suffix
+        self.keyword_index_path = settings.BM25_INDEX_PATH + suffix
+        self.sidecar: Optional[VectorSidecarClient] = None
+        self.keyword_index: Optional[BM25Index] = None
+        self._keyword_columns: Optional[MetadataColumns] = None
+        self.corpus_version: Optional[str] = None
+        self._refresh_lock = threading.Lock()
+        self._corpus_checked_at = float('-inf')  # time.monotonic() of the last refresh_corpus_version read
+        self._skill_matcher: Optional[SkillMatcher] = None
+        self._skill_matcher_version: Optional[str] = None
+        self.search_cache = QueryResultCache(
+            max_entries=settings.RAG_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.RAG_CACHE_TTL_SECONDS
+        )
+        self._llm_service: Optional[LLMService] = None
         
-        self._initialize_vector_store()
+        if use_sidecar is None:
+            use_sidecar = bool(settings.VECTOR_SIDECAR_SOCKET)
+        if use_sidecar:
+            # The sidecar process owns the index and encoder
+            self._progress('waiting_for_sidecar')
+            self.sidecar = VectorSidecarClient(settings.VECTOR_SIDECAR_SOCKET)
+            status = self.sidecar.wait_until_ready(settings.VECTOR_SIDECAR_CONNECT_TIMEOUT)
+            self.corpus_version = status['corpus_version']
+            return
+        
+        self._progress('opening_vector_store')
+        # Replicas serving a snapshot never touch the Chroma store
+        if client is not None:
+            self.client = client
+        elif not settings.JOB_INDEX_SNAPSHOT_PATH:
+            self.client = chromadb.PersistentClient(path=settings.CHROMA_DB_PATH)
+        self._progress('loading_encoder')
+        self.encoder = encoder if encoder is not None else SentenceTransformer(settings.EMBEDDING_MODEL)
+        
+        if auto_ingest:
+            self._initialize_vector_store()
+    
+    @property
+    def llm_service(self) -> LLMService:
+        """LLM client, created on first use (the vector sidecar never needs one)"""
+        if self._llm_service is None:
+            self._llm_service = LLMService()
+        return self._llm_service
     
-    def _load_multiple_files(self) -> pd.DataFrame:
-        """Load and combine multiple CSV files"""
-        dataframes = []
+    @property
+    def has_index(self) -> bool:
+        return self.collection is not None or self.sidecar is not None
+    
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with the engine's sentence encoder"""
+        if self.sidecar is not None:
+            return self.sidecar.embed(texts)
+        return self.encoder.encode(texts, show_progress_bar=False).tolist()
+    
+    def get_or_create_collection(self):
+        """Return the job collection, creating it if needed"""
+        self.collection = self.client.get_or_create_collection(
+            name=self.collection_name,
+            metadata={"description": "Job listings with skills and requirements"}
+        )
+        return self.collection
+    
+    def mark_corpus_changed(self, source: Optional[str] = None) -> str:
+        """
+        Stamp a new corpus version on the collection; cached searches for older versions are dropped
         
-        for file_path in self.data_sources:
-            try:
-                if file_path.endswith('.csv') and Path(file_path).exists():
-                    df = pd.read_csv(file_path)
-                    df['source_file'] = file_path
-                    dataframes.append(df)
-            except Exception as e:
-                print(f"Error loading {file_path}: {e}")
+        Args:
+            source: Identifies the jobs data the corpus was built from (see indexed_source)
+        """
+        self.corpus_version = uuid.uuid4().hex[:12]
+        if self.collection is not None:
+            metadata = dict(self.collection.metadata or {})
+            metadata['corpus_version'] = self.corpus_version
+            if source is not None:
+                metadata['jobs_source'] = source
+            self.collection.modify(metadata=metadata)
+        return self.corpus_version
+    
+    def indexed_source(self) -> Optional[str]:
+        """The `source` stamped on the live collection by the build that produced it"""
+        try:
+            return (self.client.get_collection(settings.VECTOR_DB_COLLECTION).metadata or {}).get('jobs_source')
+        except Exception:
+            return None
+    
+    def refresh_corpus_version(self, max_age: float = 0.0) -> Optional[str]:
+        """
+        Re-read the corpus version stamped on the Chroma collection
         
-        if not dataframes:
-            return pd.DataFrame()  # Return empty DataFrame if no files
+        Another process (the ingestion CLI, or the worker that rebuilt and
+        promoted the index on a jobs reload) may have changed the corpus
+        since it was loaded. A new version reopens the collection under this
+        engine's name, drops the cached searches and reloads the keyword
+        index from disk.
         
-        return pd.concat(dataframes, ignore_index=True, sort=False)
+        Args:
+            max_age: Skip the read (a Chroma round-trip) if the last one was
+                less than this many seconds ago; 0 always reads
+        """
+        if self.client is None or self.collection is None:
+            return self.corpus_version  # Snapshots never change; the sidecar tracks its own
+        now = time.monotonic()
+        if now - self._corpus_checked_at < max_age:
+            return self.corpus_version
+        self._corpus_checked_at = now
+        try:
+            collection = self.client.get_collection(self.collection_name)
+        except Exception:
+            return self.corpus_version
+        version = (collection.metadata or {}).get('corpus_version', 'initial')
+        if version != self.corpus_version:
+            with self._refresh_lock:
+                if version != self.corpus_version:
+                    print(f"Job corpus changed ({self.corpus_version} -> {version}), reopening the job index")
+                    self.collection = collection
+                    self._load_keyword_index()
+                    self.corpus_version = version
+        return version
+    
+    def load_existing_collection(self) -> bool:
+        """Open the configured snapshot or the existing Chroma collection; False if there is none"""
+        if settings.JOB_INDEX_SNAPSHOT_PATH:
+            self.collection = SnapshotIndex(settings.JOB_INDEX_SNAPSHOT_PATH)
+            self.keyword_index = self.collection.load_keyword_index()
+            self._keyword_columns = None
+            self.corpus_version = self.collection.metadata['corpus_version']
+            print(f"Loaded job index snapshot ({self.collection.count()} jobs)")
+            return True
+        try:
+            self.collection = self.client.get_collection(self.collection_name)
+        except Exception:
+            return False
+        print("Loaded existing job database")
+        self.corpus_version = (self.collection.metadata or {}).get('corpus_version', 'initial')
+        self._load_keyword_index()
+        return True
     
     def _initialize_vector_store(self):
         """Initialize or load the vector store with job data"""
-        try:
-            # Try to get existing collection
-            self.collection = self.client.get_collection(settings.VECTOR_DB_COLLECTION)
-            print("Loaded existing job database")
-        except:
-            # Create new collection if it doesn't exist
-            if self.data_sources or settings.JOBS_CSV_PATH:
-                self._create_vector_store()
-    
-    def _create_vector_store(self):
-        """Create vector store from data sources"""
+        # Create new collection if it doesn't exist
+        if not self.load_existing_collection() and (self.data_sources or settings.JOBS_CSV_PATH):
+            self._create_vector_store()
+    
+    def _create_vector_store(self, source: Optional[str] = None):
+        """Create vector store from data sources, streaming the CSVs in chunks"""
         print("Creating new job database...")
         
         # Load jobs data
-        if settings.JOBS_CSV_PATH and Path(settings.JOBS_CSV_PATH).exists():
+        if (settings.JOBS_CSV_PATH and Path(settings.JOBS_CSV_PATH).exists()
+                and settings.JOBS_CSV_PATH not in self.data_sources):
             self.data_sources.append(settings.JOBS_CSV_PATH)
         
-        self.jobs_df = self._load_multiple_files()
-        
-        if self.jobs_df.empty:
+        if not any(Path(p).exists() for p in self.data_sources):
             print("No job data available. Vector store not created.")
             return
         
-        # Create collection
-        self.collection = self.client.create_collection(
-            name=settings.VECTOR_DB_COLLECTION,
-            metadata={"description": "Job listings with skills and requirements"}
+        self.get_or_create_collection()
+        self.keyword_index = BM25Index()
+        self._keyword_columns = None
+        stats = ingest_jobs(
+            self.data_sources,
+            collection=self.collection,
+            embed=self.embed,
+            keyword_index=self.keyword_index,
+            batch_size=settings.RAG_BATCH_SIZE,
+            progress=self._report_ingest_progress
         )
+        self.keyword_index.save(self.keyword_index_path)
+        self.mark_corpus_changed(source)
         
-        # Process jobs in batches
-        batch_size = settings.RAG_BATCH_SIZE
-        for i in range(0, len(self.jobs_df), batch_size):
-            batch = self.jobs_df.iloc[i:i+batch_size]
-            
-            documents = []
-            metadatas = []
-            ids = []
-            
-            for idx, row in batch.iterrows():
-                # Create document text combining job info
-                doc_text = f"""
-                Job Title: {row.get('Job Title', 'N/A')}
-                Key Skills: {row.get('Key Skills', 'N/A')}
-                Experience Required: {row.get('Job Experience Required', 'N/A')}
-                Role Category: {row.get('Role Category', 'N/A')}
-                Functional Area: {row.get('Functional Area', 'N/A')}
-                Industry: {row.get('Industry', 'N/A')}
-                Salary: {row.get('Job Salary', 'N/A')}
-                """
-                
-                documents.append(doc_text.strip())
-                metadatas.append({
-                    'job_title': str(row.get('Job Title', 'N/A')),
-                    'skills': str(row.get('Key Skills', 'N/A')),
-                    'experience': str(row.get('Job Experience Required', 'N/A')),
-                    'role_category': str(row.get('Role Category', 'N/A')),
-                    'industry': str(row.get('Industry', 'N/A')),
-                    'salary': str(row.get('Job Salary', 'N/A'))
-                })
-                ids.append(f"job_{idx}")
-            
-            # Add to collection
-            self.collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
+        print(f"Job database created successfully! "
+              f"({stats['rows']} jobs, {stats['rows_per_second']:,.0f} rows/s)")
+        if 'dedup' in stats:
+            print_dedup_report(stats['dedup'])
+    
+    def _report_ingest_progress(self, done: int, total: int):
+        print(f"Processed {done}/{total} jobs")
+        self._progress('ingesting', done, total)
+
+    @property
+    def can_rebuild(self) -> bool:
+        """Whether build_replacement works (the engine owns a local Chroma store)"""
+        return self.client is not None and self.sidecar is None
+
+    @contextmanager
+    def rebuild_lock(self, blocking: bool = True) -> Iterator[bool]:
+        """
+        Hold the store-wide rebuild lock; yields whether this process got it
+
+        Every server worker shares the Chroma store, so only the holder of
+        this lock (an fcntl lock file beside the store) may build staging
+        collections, promote them or clean up after interrupted builds.
+        Without fcntl the process is assumed to be the only one.
+
+        Args:
+            blocking: Wait for the lock rather than yield False at once
+        """
+        if fcntl is None:
+            yield True
+            return
+        path = Path(settings.CHROMA_DB_PATH) / '.rebuild.lock'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as handle:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def drop_stale_staging(self):
+        """Delete staging collections and keyword index files left by interrupted builds (hold rebuild_lock)"""
+        prefix = settings.VECTOR_DB_COLLECTION + _STAGING_SUFFIX
+        try:
+            names = [getattr(c, 'name', c) for c in self.client.list_collections()]
+        except Exception:
+            names = []
+        for name in names:
+            if name.startswith(prefix):
+                try:
+                    self.client.delete_collection(name)
+                except Exception:
+                    pass
+        index_path = Path(settings.BM25_INDEX_PATH)
+        for leftover in index_path.parent.glob(index_path.name + _STAGING_SUFFIX + '*'):
+            leftover.unlink(missing_ok=True)
+
+    def build_replacement(
+        self,
+        data_sources: Optional[List[str]] = None,
+        source: Optional[str] = None
+    ) -> 'RAGEngine':
+        """
+        Build a new engine over fresh job data while this one keeps serving
+
+        The new engine shares this engine's Chroma client and encoder and
+        ingests into a staging collection and keyword index file of its own;
+        call promote() on it to make them the live ones. Hold rebuild_lock
+        across both.
+
+        Args:
+            data_sources: Job CSVs to ingest
+            source: Stamp identifying the jobs data (see indexed_source)
+        """
+        if not self.can_rebuild:
+            raise RuntimeError("Only engines backed by the local Chroma store can be rebuilt")
+        engine = RAGEngine(
+            data_sources=list(data_sources or []),
+            auto_ingest=False,
+            use_sidecar=False,
+            client=self.client,
+            encoder=self.encoder,
+            staging=True
+        )
+        self.drop_stale_staging()
+        engine._create_vector_store(source)
+        return engine
+
+    def promote(self, live: Optional['RAGEngine'] = None):
+        """
+        Rename this staging engine's collection and keyword index to the live names
+
+        The live engine's collection is renamed aside rather than deleted, so
+        requests still holding it (here or in other workers, which reopen the
+        promoted collection on their next search) finish normally; it is
+        dropped on the next promotion. The keyword index file is replaced
+        first, so a worker that sees the new collection loads the new index.
+        """
+        live_name = settings.VECTOR_DB_COLLECTION
+        retired_name = live_name + _RETIRED_SUFFIX
+        if Path(self.keyword_index_path).exists():
+            os.replace(self.keyword_index_path, settings.BM25_INDEX_PATH)
+        self.keyword_index_path = settings.BM25_INDEX_PATH
+        try:
+            self.client.delete_collection(retired_name)
+        except Exception:
+            pass
+        if live is not None and live.collection is not None and live.collection_name == live_name:
+            live.collection.modify(name=retired_name)
+            live.collection_name = retired_name
+        else:
+            try:
+                self.client.delete_collection(live_name)
+            except Exception:
+                pass
+        self.collection.modify(name=live_name)
+        self.collection_name = live_name
+    
+    def _load_keyword_index(self):
+        """Load the persisted BM25 index, rebuilding it from the collection if missing"""
+        self.keyword_index = BM25Index.load(self.keyword_index_path)
+        self._keyword_columns = None
+        if self.keyword_index is not None or self.collection is None:
+            return
+        
+        print("Building keyword index from existing job database...")
+        self._progress('building_keyword_index')
+        self.keyword_index = BM25Index()
+        page_size = settings.INGEST_CHUNK_SIZE
+        offset = 0
+        while True:
+            page = self.collection.get(
+                include=['documents', 'metadatas'],
+                limit=page_size,
+                offset=offset
             )
-            
-            print(f"Processed {min(i+batch_size, len(self.jobs_df))}/{len(self.jobs_df)} jobs")
+            if not page['ids']:
+                break
+            self.keyword_index.add_many(page['ids'], page['documents'], page['metadatas'])
+            offset += len(page['ids'])
+        self.keyword_index.save(self.keyword_index_path)
+    
+    @staticmethod
+    def _format_job(metadata: Dict[str, Any], score: float) -> Dict[str, Any]:
+        """Shape stored job metadata into a search result"""
+        return {
+            'job_title': metadata['job_title'],
+            'skills': metadata['skills'],
+            'experience': metadata['experience'],
+            'role_category': metadata['role_category'],
+            'industry': metadata['industry'],
+            'salary': metadata['salary'],
+            'relevance_score': score
+        }
+    
+    def _vector_search(
+        self,
+        queries: List[str],
+        n_results: int,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[tuple]]:
+        """Return (id, metadata, similarity) hits per query, embedding all queries in one batch"""
+        results = self.collection.query(
+            query_embeddings=self.embed(queries),
+            n_results=n_results,
+            where=build_where(filters)
+        )
+        return [
+            [
+                (doc_id, metadata, 1 - distance)  # Convert distance to similarity
+                for doc_id, metadata, distance in zip(ids, metadatas, distances)
+            ]
+            for ids, metadatas, distances in zip(
+                results['ids'], results['metadatas'], results['distances']
+            )
+        ]
+    
+    def _keyword_candidates(self, filters: Optional[Dict[str, Any]]):
+        """Boolean pre-filter mask over the keyword index, or None when unfiltered"""
+        if self.keyword_index is None or not clean_filters(filters):
+            return None
+        if self._keyword_columns is None or self._keyword_columns.size != len(self.keyword_index):
+            self._keyword_columns = MetadataColumns(self.keyword_index.metadatas)
+        return self._keyword_columns.mask(filters)
+    
+    def _keyword_search(self, query: str, n_results: int, candidates=None) -> List[tuple]:
+        """Return (id, metadata, bm25_score) hits from the keyword index"""
+        if self.keyword_index is None:
+            return []
+        return [
+            (doc_id, self.keyword_index.get_metadata(doc_id), score)
+            for doc_id, score in self.keyword_index.search(query, n_results, candidates=candidates)
+        ]
+    
+    def search_hits(
+        self,
+        queries: List[str],
+        n_results: int,
+        mode: Optional[str],
+        filters: Optional[Dict[str, Any]]
+    ) -> List[List[tuple]]:
+        """
+        Return ranked (id, metadata, score) hits per query, served from the cache when possible
         
-        print("Job database created successfully!")
+        Without a sidecar, the collection's corpus version is re-read first
+        (at most every RAG_CORPUS_CHECK_SECONDS), so cached hits from before
+        an out-of-process re-ingest stop being served within that interval.
+        """
+        mode = mode or settings.RAG_SEARCH_MODE
+        if self.keyword_index is None and self.sidecar is None and mode != 'vector':
+            mode = 'vector'
+        filters = clean_filters(filters)
+        if self.sidecar is not None:
+            # The sidecar caches its results; a second cache here would miss its corpus changes
+            return self._run_search(queries, n_results, mode, filters)
+        
+        version = self.refresh_corpus_version(settings.RAG_CORPUS_CHECK_SECONDS)
+        keys = [make_key(query, n_results, mode, filters) for query in queries]
+        results = [self.search_cache.get(key, version) for key in keys]
+        missing = [i for i, hits in enumerate(results) if hits is None]
+        if missing:
+            fresh = self._run_search([queries[i] for i in missing], n_results, mode, filters)
+            for i, hits in zip(missing, fresh):
+                results[i] = hits
+                self.search_cache.set(keys[i], hits, version)
+        return results
+    
+    def _run_search(
+        self,
+        queries: List[str],
+        n_results: int,
+        mode: str,
+        filters: Dict[str, Any]
+    ) -> List[List[tuple]]:
+        """Run one search per query against the indexes"""
+        if self.sidecar is not None:
+            response = self.sidecar.search(queries, n_results, mode, filters)
+            self.corpus_version = response['corpus_version']
+            return [[tuple(hit) for hit in hits] for hits in response['hits']]
+        
+        depth = n_results if mode == 'vector' else n_results * settings.RAG_FUSION_DEPTH
+        vector_lists = (
+            self._vector_search(queries, depth, filters) if mode != 'keyword'
+            else [[] for _ in queries]
+        )
+        if mode == 'vector':
+            return vector_lists
+        
+        candidates = self._keyword_candidates(filters)
+        hits_per_query = []
+        for query, vector_hits in zip(queries, vector_lists):
+            keyword_hits = self._keyword_search(query, depth, candidates)
+            if mode == 'keyword':
+                hits_per_query.append(keyword_hits[:n_results])
+                continue
+            metadata_by_id = {doc_id: metadata for doc_id, metadata, _ in keyword_hits + vector_hits}
+            fused = reciprocal_rank_fusion([
+                [doc_id for doc_id, _, _ in vector_hits],
+                [doc_id for doc_id, _, _ in keyword_hits]
+            ])
+            hits_per_query.append([
+                (doc_id, metadata_by_id[doc_id], score)
+                for doc_id, score in fused[:n_results]
+            ])
+        return hits_per_query
     
-    def search_relevant_jobs(self, query: str, n_results: int = 10) -> List[Dict]:
+    def search_relevant_jobs(
+        self,
+        query: str,
+        n_results: int = 10,
+        mode: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict]:
         """
         Search for relevant jobs based on query
         
         Args:
             query: Search query
             n_results: Number of results to return
+            mode: 'vector', 'keyword' or 'hybrid' (defaults to settings.RAG_SEARCH_MODE).
+                relevance_score is the vector similarity unless hybrid is
+                requested, which fuses both rankings with reciprocal-rank
+                fusion and reports the fused score instead.
+            filters: Optional pre-filters (industry, role_category,
+                experience_min/max, salary_min/max) applied inside each index
             
         Returns:
             List of relevant jobs
         """
-        if self.collection is None:
+        if not self.has_index:
             return []
         
         try:
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=n_results
-            )
-            
-            relevant_jobs = []
-            for i, metadata in enumerate(results['metadatas'][0]):
-                relevant_jobs.append({
-                    'job_title': metadata['job_title'],
-                    'skills': metadata['skills'],
-                    'experience': metadata['experience'],
-                    'role_category': metadata['role_category'],
-                    'industry': metadata['industry'],
-                    'salary': metadata['salary'],
-                    'relevance_score': 1 - results['distances'][0][i]  # Convert distance to similarity
-                })
+            hits = self.search_hits([query], n_results, mode, filters)[0]
+            return [self._format_job(metadata, score) for _, metadata, score in hits]
+        except Exception as e:
+            print(f"Error searching jobs: {e}")
+            return []
+    
+    def search_many(
+        self,
+        queries: List[str],
+        n_results: int = 10,
+        mode: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        deduplicate: bool = True
+    ) -> List[List[Dict]]:
+        """
+        Search for several queries at once
+        
+        All queries are embedded in one encoder batch and sent to the vector
+        store as a single multi-query lookup.
+        
+        Args:
+            queries: Search queries
+            n_results: Number of results per query
+            mode: Search mode, as in search_relevant_jobs
+            filters: Pre-filters shared by all queries
+            deduplicate: Keep each job only under the query where it scores best
             
-            return relevant_jobs
+        Returns:
+            One list of relevant jobs per query, in query order
+        """
+        if not self.has_index or not queries:
+            return [[] for _ in queries]
+        
+        try:
+            hits_per_query = self.search_hits(queries, n_results, mode, filters)
         except Exception as e:
             print(f"Error searching jobs: {e}")
+            return [[] for _ in queries]
+        
+        if deduplicate:
+            best = {}
+            for qi, hits in enumerate(hits_per_query):
+                for doc_id, _, score in hits:
+                    if doc_id not in best or score > best[doc_id][1]:
+                        best[doc_id] = (qi, score)
+            hits_per_query = [
+                [hit for hit in hits if best[hit[0]][0] == qi]
+                for qi, hits in enumerate(hits_per_query)
+            ]
+        
+        return [
+            [self._format_job(metadata, score) for _, metadata, score in hits]
+            for hits in hits_per_query
+        ]
+    
+    def _job_vectors(self, hits: List[tuple]) -> List[List[float]]:
+        """Stored embeddings for search hits, re-encoding any the store cannot return"""
+        vectors = {}
+        if self.sidecar is None and self.collection is not None:
+            try:
+                stored = self.collection.get(ids=[doc_id for doc_id, _, _ in hits], include=['embeddings'])
+                vectors = dict(zip(stored['ids'], stored['embeddings']))
+            except Exception as e:
+                print(f"Could not fetch stored job embeddings: {e}")
+        missing = [hit for hit in hits if hit[0] not in vectors]
+        if missing:
+            encoded = self.embed([format_job_line(self._format_job(metadata, score)) for _, metadata, score in missing])
+            vectors.update(zip((doc_id for doc_id, _, _ in missing), encoded))
+        return [vectors[doc_id] for doc_id, _, _ in hits]
+    
+    def build_jobs_context(self, search_query: str, hits: List[tuple]) -> tuple:
+        """
+        Pack retrieved jobs into the prompt with MMR diversification
+        
+        Near-duplicate postings are dropped and the rest are packed up to
+        settings.RAG_CONTEXT_TOKEN_BUDGET.
+        
+        Returns:
+            (context text, packing report)
+        """
+        jobs = [self._format_job(metadata, score) for _, metadata, score in hits]
+        if not jobs:
+            return "", build_jobs_context([], [], [], settings.RAG_CONTEXT_TOKEN_BUDGET)[2]
+        context, _, report = build_jobs_context(
+            jobs,
+            self._job_vectors(hits),
+            self.embed([search_query])[0],
+            token_budget=settings.RAG_CONTEXT_TOKEN_BUDGET,
+            mmr_lambda=settings.RAG_MMR_LAMBDA,
+            duplicate_threshold=settings.RAG_NEAR_DUPLICATE_THRESHOLD
+        )
+        return context, report
+    
+    def _insights_hits(self, search_query: str) -> List[tuple]:
+        """Candidate hits for the insights prompt (empty when the index is missing or search fails)"""
+        if not self.has_index:
             return []
+        try:
+            return self.search_hits([search_query], settings.RAG_INSIGHTS_CANDIDATES, None, None)[0]
+        except Exception as e:
+            print(f"Error searching jobs: {e}")
+            return []
+    
+    def match_skills(self, text: str, limit: int = 30) -> List[str]:
+        """Find known job-market skills in text without an LLM call"""
+        if self.sidecar is not None:
+            return self.sidecar.match_skills(text, limit=limit)
+        if self.keyword_index is None:
+            return []
+        if self._skill_matcher is None or self._skill_matcher_version != self.corpus_version:
+            self._skill_matcher = SkillMatcher.from_skill_strings(
+                m.get('skills', '') for m in self.keyword_index.metadatas
+            )
+            self._skill_matcher_version = self.corpus_version
+        return self._skill_matcher.match(text, limit=limit)
     
     async def get_career_insights(
         self,
         resume_text: str,
-        user_query: Optional[str] = None
+        user_query: Optional[str] = None,
+        fast: bool = False
     ) -> Dict[str, Any]:
         """
         Generate comprehensive career insights using RAG
@@ -170,27 +662,39 @@ class RAGEngine:
         Args:
             resume_text: Resume text content
             user_query: Optional user query
+            fast: Skip the LLM skill-extraction hop. Retrieval uses the resume
+                text directly while skills are matched locally, both in
+                parallel, and only the final insights call hits the LLM.
             
         Returns:
             Dictionary with career insights
         """
-        # Extract key skills and experience from resume
-        skills_analysis = await self.llm_service.extract_skills(resume_text)
-        
-        # Search for relevant jobs
-        search_query = f"{skills_analysis} {user_query or ''}"
-        relevant_jobs = self.search_relevant_jobs(search_query, n_results=15)
+        if fast:
+            search_query = f"{resume_text[:4000]} {user_query or ''}"
+            hits, matched_skills = await asyncio.gather(
+                asyncio.to_thread(self._insights_hits, search_query),
+                asyncio.to_thread(self.match_skills, resume_text)
+            )
+            skills_analysis = f"Skills: {', '.join(matched_skills) or 'not detected'}"
+            resume_context = f"Resume Excerpt: {resume_text[:1500]}"
+        else:
+            # Extract key skills and experience from resume
+            skills_analysis = await self.llm_service.extract_skills(resume_text)
+            
+            # Search for relevant jobs
+            search_query = f"{skills_analysis} {user_query or ''}"
+            hits = self._insights_hits(search_query)
+            resume_context = ""
         
-        # Generate insights based on relevant jobs
-        jobs_context = "\n".join([
-            f"Job: {job['job_title']} | Skills: {job['skills']} | Experience: {job['experience']} | Industry: {job['industry']}"
-            for job in relevant_jobs[:10]
-        ])
+        # Generate insights based on a diverse, token-budgeted slice of the relevant jobs
+        relevant_jobs = [self._format_job(metadata, score) for _, metadata, score in hits]
+        jobs_context, context_stats = await asyncio.to_thread(self.build_jobs_context, search_query, hits)
         
         insights_prompt = f"""
         Based on the resume analysis and current job market data, provide comprehensive career insights:
         
         Resume Analysis: {skills_analysis}
+        {resume_context}
         
         Relevant Job Market Data:
         {jobs_context}
@@ -215,5 +719,6 @@ class RAGEngine:
         return {
             'insights': insights,
             'relevant_jobs': relevant_jobs,
-            'skills_analysis': skills_analysis
+            'skills_analysis': skills_analysis,
+            'context_stats': context_stats
         }
@@ -0,0 +1,90 @@
+"""
+LRU + TTL cache for job search results
+Entries are tagged with the corpus version they were computed against, so a
+re-ingest invalidates everything without an explicit flush.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so trivially different queries share a cache entry"""
+    return " ".join(str(query).lower().split())
+
+
+def make_key(query: str, n_results: int, mode: str, filters: Optional[Dict[str, Any]]) -> Tuple:
+    """Build a hashable cache key from a search request"""
+    filter_items = tuple(sorted((k, v) for k, v in (filters or {}).items() if v is not None))
+    return (normalize_query(query), n_results, mode, filter_items)
+
+
+class QueryResultCache:
+    """Thread-safe LRU cache with per-entry TTL and hit-rate metrics"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _sync_version(self, version: Optional[str]):
+        """Drop all entries when the corpus version changes (caller holds the lock)"""
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def get(self, key: Hashable, version: Optional[str] = None) -> Optional[Any]:
+        """Return the cached value, or None on miss/expiry"""
+        with self._lock:
+            self._sync_version(version)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, version: Optional[str] = None):
+        """Store a value, evicting the least recently used entry when full"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._sync_version(version)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate and size metrics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'corpus_version': self._version
+            }
@@ -0,0 +1,189 @@
+"""
+Skill co-occurrence for "skills to learn next"
+SkillCooccurrence counts, for every pair of skills, the active job rows that
+list both, stored symmetrically in CSR form (skill -> neighbour ids and
+counts). With each skill's document frequency this gives confidence
+P(b | a), lift and PMI, so adjacent skills a user lacks are ranked from the
+precomputed counts instead of an LLM call.
+"""
+import math
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.services.career.skill_index import SkillMatrix
+
+_CHUNK_ENTRIES = 2_000_000  # Skill entries expanded into pairs at a time
+
+
+def _pair_keys(rows: SkillMatrix, n_skills: int) -> np.ndarray:
+    """key = a * n_skills + b for every ordered pair of distinct skills sharing a row"""
+    row_ids = rows.row_ids()
+    entries = np.unique(row_ids * n_skills + rows.indices)  # One entry per (row, skill)
+    row_ids, skills = np.divmod(entries, n_skills)
+    if not len(entries):
+        return np.empty(0, dtype=np.int64)
+    row_starts = np.flatnonzero(np.r_[True, row_ids[1:] != row_ids[:-1]])
+    row_lengths = np.diff(np.r_[row_starts, len(entries)])
+    entry_lengths = np.repeat(row_lengths, row_lengths)
+    entry_starts = np.repeat(row_starts, row_lengths)
+
+    # Entry e pairs with every entry of its row
+    total = int(entry_lengths.sum())
+    offsets = np.arange(total) - np.repeat(np.cumsum(entry_lengths) - entry_lengths, entry_lengths)
+    left = np.repeat(skills, entry_lengths)
+    right = skills[np.repeat(entry_starts, entry_lengths) + offsets]
+    keep = left != right
+    return left[keep] * n_skills + right[keep]
+
+
+def _sum_by_key(keys: np.ndarray, counts: np.ndarray):
+    keys, inverse = np.unique(keys, return_inverse=True)
+    return keys, np.bincount(inverse, weights=counts, minlength=len(keys)).astype(np.int64)
+
+
+class SkillCooccurrence:
+    """Symmetric skill x skill co-occurrence counts over active job rows"""
+
+    def __init__(self, n_skills: int = 0):
+        self.n_skills = n_skills
+        self.n_rows = 0
+        self.doc_freq = np.zeros(n_skills, dtype=np.int64)
+        self.indptr = np.zeros(n_skills + 1, dtype=np.int64)
+        self.neighbors = np.empty(0, dtype=np.int32)
+        self.counts = np.empty(0, dtype=np.int32)
+
+    @classmethod
+    def from_matrix(cls, skills: SkillMatrix, removed: Optional[np.ndarray] = None) -> 'SkillCooccurrence':
+        """Count co-occurrences over every (non-removed) row of a skill matrix"""
+        cooccurrence = cls(len(skills.vocab))
+        rows = np.arange(skills.n_rows) if removed is None else np.flatnonzero(~removed)
+        cooccurrence.update(skills, rows)
+        return cooccurrence
+
+    def update(self, skills: SkillMatrix, rows: np.ndarray, sign: int = 1):
+        """Add (sign=1) or subtract (sign=-1) the given rows' pairs, growing to the current vocabulary"""
+        n_skills = len(skills.vocab)
+        rows = np.asarray(rows, dtype=np.int64)
+        if n_skills > self.n_skills:
+            self.doc_freq = np.concatenate([self.doc_freq, np.zeros(n_skills - self.n_skills, dtype=np.int64)])
+            self.indptr = np.concatenate([self.indptr, np.full(n_skills - self.n_skills, self.indptr[-1])])
+        # Existing counts as keys under the (possibly larger) vocabulary
+        sources = np.repeat(np.arange(self.n_skills, dtype=np.int64), np.diff(self.indptr[:self.n_skills + 1]))
+        key_parts = [sources * n_skills + self.neighbors]
+        count_parts = [self.counts.astype(np.int64)]
+        self.n_skills = n_skills
+
+        lengths = np.diff(skills.indptr)[rows]
+        bounds = np.searchsorted(np.cumsum(lengths), np.arange(0, int(lengths.sum()), _CHUNK_ENTRIES), side='right')
+        for start, end in zip(np.r_[0, bounds[1:]].tolist(), np.r_[bounds[1:], len(rows)].tolist()):
+            chunk = skills.take(rows[start:end])
+            distinct = np.unique(chunk.row_ids() * n_skills + chunk.indices) % n_skills
+            self.doc_freq += sign * np.bincount(distinct, minlength=n_skills)
+            keys, counts = np.unique(_pair_keys(chunk, n_skills), return_counts=True)
+            key_parts.append(keys)
+            count_parts.append(sign * counts)
+        self.n_rows += sign * len(rows)
+        self._store(key_parts, count_parts)
+
+    def merge(self, other: 'SkillCooccurrence') -> 'SkillCooccurrence':
+        """Add counts taken over other rows of the same vocabulary (e.g. another row group) and return self"""
+        n_skills = max(self.n_skills, other.n_skills)
+        key_parts, count_parts = [], []
+        doc_freq = np.zeros(n_skills, dtype=np.int64)
+        for part in (self, other):
+            sources = np.repeat(np.arange(part.n_skills, dtype=np.int64), np.diff(part.indptr))
+            key_parts.append(sources * n_skills + part.neighbors)
+            count_parts.append(part.counts.astype(np.int64))
+            doc_freq[:part.n_skills] += part.doc_freq
+        self.n_skills, self.doc_freq = n_skills, doc_freq
+        self.n_rows += other.n_rows
+        self._store(key_parts, count_parts)
+        return self
+
+    def _store(self, key_parts: List[np.ndarray], count_parts: List[np.ndarray]):
+        """Sum (source * n_skills + neighbour) keyed counts into the CSR arrays, dropping zeros"""
+        n_skills = self.n_skills
+        keys, counts = _sum_by_key(np.concatenate(key_parts), np.concatenate(count_parts))
+        keys, counts = keys[counts > 0], counts[counts > 0]
+        sources, neighbors = np.divmod(keys, n_skills)
+        self.indptr = np.zeros(n_skills + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n_skills), out=self.indptr[1:])
+        self.neighbors = neighbors.astype(np.int32)
+        self.counts = counts.astype(np.int32)
+
+    def neighbors_of(self, skill_id: int):
+        """(neighbour ids, co-occurrence counts) of one skill"""
+        start, end = self.indptr[skill_id], self.indptr[skill_id + 1]
+        return self.neighbors[start:end], self.counts[start:end]
+
+    def lift(self, a: int, b: int) -> float:
+        """P(a, b) / (P(a) P(b)); 1.0 means independent"""
+        neighbors, counts = self.neighbors_of(a)
+        match = np.flatnonzero(neighbors == b)
+        if not len(match) or not self.doc_freq[a] or not self.doc_freq[b]:
+            return 0.0
+        return float(counts[match[0]]) * self.n_rows / (self.doc_freq[a] * self.doc_freq[b])
+
+    def recommend(
+        self,
+        skill_ids: Iterable[int],
+        vocab: List[str],
+        limit: int = 10,
+        min_count: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Skills that co-occur with skill_ids more than chance, best first
+
+        Candidates must share at least min_count rows with one of the user's
+        skills and have lift > 1 with it. They are ranked by the mean
+        confidence P(candidate | user skill) over the user's skills, which
+        favours skills that are both strongly associated and in demand.
+        """
+        skill_ids = sorted(set(skill_ids))
+        if not skill_ids or not self.n_rows:
+            return []
+        candidates, confidences, lifts, owners, shared = [], [], [], [], []
+        for a in skill_ids:
+            neighbors, counts = self.neighbors_of(a)
+            if not self.doc_freq[a] or not len(neighbors):
+                continue
+            counts = counts.astype(np.float64)
+            lift = counts * self.n_rows / (self.doc_freq[a] * np.maximum(self.doc_freq[neighbors], 1))
+            keep = (counts >= min_count) & (lift > 1.0)
+            candidates.append(neighbors[keep])
+            confidences.append(counts[keep] / self.doc_freq[a])
+            lifts.append(lift[keep])
+            shared.append(counts[keep])
+            owners.append(np.full(int(keep.sum()), a))
+        if not candidates:
+            return []
+        candidates, confidences = np.concatenate(candidates), np.concatenate(confidences)
+        lifts, owners, shared = np.concatenate(lifts), np.concatenate(owners), np.concatenate(shared)
+        lacking = ~np.isin(candidates, skill_ids)
+        candidates, confidences, lifts, owners, shared = (
+            candidates[lacking], confidences[lacking], lifts[lacking], owners[lacking], shared[lacking]
+        )
+
+        unique, inverse = np.unique(candidates, return_inverse=True)
+        scores = np.bincount(inverse, weights=confidences, minlength=len(unique)) / len(skill_ids)
+        best_lift = np.zeros(len(unique))
+        np.maximum.at(best_lift, inverse, lifts)
+        order = np.lexsort((-self.doc_freq[unique], -scores))[:limit]
+
+        recommendations = []
+        for i in order.tolist():
+            related = inverse == i
+            recommendations.append({
+                'skill': vocab[unique[i]],
+                'score': round(float(scores[i]), 4),
+                'lift': round(float(best_lift[i]), 3),
+                'pmi': round(math.log(best_lift[i]), 3),
+                'demand': int(self.doc_freq[unique[i]]),
+                'co_occurrences': int(shared[related].sum()),
+                'related_to': [vocab[a] for a in owners[related].tolist()]
+            })
+        return recommendations
+
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.neighbors.nbytes + self.counts.nbytes + self.doc_freq.nbytes
@@ -0,0 +1,312 @@
+"""
+Skill index for the analytics job frame
+SkillMatrix stores each row's skills as interned ids in CSR form; SkillIndex
+inverts it into compressed per-skill posting lists plus a trigram index over
+the skill vocabulary, so "rows mentioning any of these skills" is a handful of
+posting-list unions instead of a scan over every row.
+VocabularyTrigrams is the substring lookup shared with the title index.
+"""
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+class VocabularyTrigrams:
+    """Trigram -> term id postings for substring lookups over a growing vocabulary"""
+
+    def __init__(self):
+        self._grams: Dict[str, np.ndarray] = {}
+
+    def add(self, terms: Iterable[str], first_id: int):
+        """Index terms numbered from first_id"""
+        grams = defaultdict(list)
+        for term_id, term in enumerate(terms, first_id):
+            for gram in {term[j:j + 3] for j in range(len(term) - 2)}:
+                grams[gram].append(term_id)
+        for gram, ids in grams.items():
+            known = self._grams.get(gram)
+            ids = np.asarray(ids, dtype=np.int32)
+            self._grams[gram] = ids if known is None else np.concatenate([known, ids])
+
+    def matching(self, query: str, terms: List[str]) -> List[int]:
+        """Ids of terms containing query (queries under three characters scan the vocabulary)"""
+        if len(query) < 3:
+            return [i for i, term in enumerate(terms) if query in term]
+        candidates = None
+        for gram in {query[j:j + 3] for j in range(len(query) - 2)}:
+            ids = self._grams.get(gram)
+            if ids is None:
+                return []
+            candidates = ids if candidates is None else np.intersect1d(candidates, ids, assume_unique=True)
+        return [int(i) for i in candidates if query in terms[i]]
+
+    def nbytes(self) -> int:
+        return sum(ids.nbytes for ids in self._grams.values())
+
+
+class SkillMatrix:
+    """Row -> skill ids in CSR layout over an interned, lower-cased vocabulary"""
+
+    def __init__(self, vocab: List[str], indptr: np.ndarray, indices: np.ndarray):
+        self.vocab = vocab
+        self.indptr = indptr
+        self.indices = indices
+        self._ids: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_skill_lists(cls, skill_lists: Iterable) -> 'SkillMatrix':
+        """Build from per-row lists of normalized skills (non-lists count as empty rows)"""
+        ids: Dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        for skills in skill_lists:
+            if isinstance(skills, list):
+                indices.extend(ids.setdefault(skill, len(ids)) for skill in skills)
+            indptr.append(len(indices))
+        matrix = cls(
+            list(ids),
+            np.asarray(indptr, dtype=np.int64),
+            np.asarray(indices, dtype=np.int32)
+        )
+        matrix._ids = ids
+        return matrix
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.indptr) - 1
+
+    def append(self, rows: 'SkillMatrix') -> 'SkillMatrix':
+        """
+        Append another matrix's rows, interning its skills into this vocabulary
+
+        Returns:
+            The appended rows as a matrix over this vocabulary
+        """
+        ids = self.skill_ids
+        remap = np.empty(len(rows.vocab), dtype=np.int32)
+        for i, skill in enumerate(rows.vocab):
+            if skill not in ids:
+                ids[skill] = len(self.vocab)
+                self.vocab.append(skill)
+            remap[i] = ids[skill]
+        added = SkillMatrix(self.vocab, rows.indptr, remap[rows.indices])
+        self.indptr = np.concatenate([self.indptr, self.indptr[-1] + added.indptr[1:]])
+        self.indices = np.concatenate([self.indices, added.indices])
+        return added
+
+    def extend(self, skill_lists: Iterable) -> 'SkillMatrix':
+        """Append rows given as skill lists and return a matrix of just the new rows"""
+        return self.append(SkillMatrix.from_skill_lists(skill_lists))
+
+    @classmethod
+    def concat(cls, matrices: List['SkillMatrix']) -> 'SkillMatrix':
+        """Stack matrices built over separate vocabularies"""
+        result = cls([], np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32))
+        for matrix in matrices:
+            result.append(matrix)
+        return result
+
+    def nbytes(self) -> int:
+        """Size of the CSR arrays plus the vocabulary strings"""
+        return (
+            self.indptr.nbytes + self.indices.nbytes
+            + sys.getsizeof(self.vocab) + sum(sys.getsizeof(skill) for skill in self.vocab)
+        )
+
+    @property
+    def skill_ids(self) -> Dict[str, int]:
+        if self._ids is None:
+            self._ids = {skill: i for i, skill in enumerate(self.vocab)}
+        return self._ids
+
+    def row_skills(self, row: int) -> List[str]:
+        return [self.vocab[i] for i in self.indices[self.indptr[row]:self.indptr[row + 1]]]
+
+    def to_lists(self) -> List[List[str]]:
+        """Per-row skill lists (the inverse of from_skill_lists)"""
+        flat = np.asarray(self.vocab, dtype=object)[self.indices].tolist()
+        bounds = self.indptr.tolist()
+        return [flat[bounds[i]:bounds[i + 1]] for i in range(self.n_rows)]
+
+    def take(self, rows: np.ndarray) -> 'SkillMatrix':
+        """The given rows as a matrix over the same vocabulary"""
+        rows = np.asarray(rows, dtype=np.int64)
+        lengths = self.indptr[rows + 1] - self.indptr[rows]
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        positions = np.repeat(self.indptr[rows] - indptr[:-1], lengths) + np.arange(indptr[-1])
+        return SkillMatrix(self.vocab, indptr, self.indices[positions])
+
+    def row_ids(self) -> np.ndarray:
+        """Row number of every entry in `indices`"""
+        return np.repeat(np.arange(self.n_rows, dtype=np.int64), np.diff(self.indptr))
+
+
+class SkillIndex:
+    """Inverted skill -> row index with substring lookup over the vocabulary"""
+
+    def __init__(self, matrix: SkillMatrix):
+        self.matrix = matrix
+        self.n_rows = 0
+        self._postings: List[np.ndarray] = []
+        self._last_row = np.empty(0, dtype=np.int64)  # Last row of each posting, for appending deltas
+        self._trigrams = VocabularyTrigrams()
+        # Global frequency tables over the vocabulary, kept current on add/remove
+        self.occurrences = np.empty(0, dtype=np.int64)  # Mentions per skill (repeats on a row count)
+        self._doc_freq = np.empty(0, dtype=np.int64)  # Active rows per skill
+        self.removed: Optional[np.ndarray] = None  # Tombstones for removed rows
+        self.version = 0
+        self._top: Optional[tuple] = None  # (version, n, top skills)
+        self._index_rows(matrix, 0)
+
+    def _index_rows(self, rows: SkillMatrix, first_row: int):
+        """Add the postings and vocabulary trigrams for rows numbered from first_row"""
+        vocab = self.matrix.vocab
+        new_skills = range(len(self._postings), len(vocab))
+
+        # Postings: rows per skill, sorted, delta-encoded in the narrowest dtype that fits
+        row_numbers = rows.row_ids() + first_row
+        order = np.lexsort((row_numbers, rows.indices))
+        sorted_skills, sorted_rows = rows.indices[order], row_numbers[order]
+        distinct = np.ones(len(order), dtype=bool)  # A skill listed twice on one row counts once
+        distinct[1:] = (sorted_skills[1:] != sorted_skills[:-1]) | (sorted_rows[1:] != sorted_rows[:-1])
+        sorted_skills, sorted_rows = sorted_skills[distinct], sorted_rows[distinct]
+
+        grow = np.zeros(len(new_skills), dtype=np.int64)
+        self.occurrences = np.concatenate([self.occurrences, grow])
+        self._doc_freq = np.concatenate([self._doc_freq, grow])
+        self.occurrences += np.bincount(rows.indices, minlength=len(vocab))
+        self._doc_freq += np.bincount(sorted_skills, minlength=len(vocab))
+        if self.removed is not None:
+            self.removed = np.concatenate([self.removed, np.zeros(rows.n_rows, dtype=bool)])
+
+        self._postings.extend(np.empty(0, dtype=np.uint8) for _ in new_skills)
+        self._last_row = np.concatenate([self._last_row, np.zeros(len(new_skills), dtype=np.int64)])
+        bounds = np.r_[0, np.flatnonzero(np.diff(sorted_skills)) + 1, len(sorted_skills)]
+        for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            if start == end:
+                continue
+            skill_id = int(sorted_skills[start])
+            skill_rows = sorted_rows[start:end]
+            deltas = np.diff(skill_rows, prepend=self._last_row[skill_id])
+            dtype = np.result_type(self._postings[skill_id].dtype, np.min_scalar_type(int(deltas.max())))
+            self._postings[skill_id] = np.concatenate([self._postings[skill_id], deltas]).astype(dtype)
+            self._last_row[skill_id] = skill_rows[-1]
+        self.n_rows = first_row + rows.n_rows
+
+        # Trigrams -> vocabulary ids, for substring queries of three or more characters
+        self._trigrams.add(vocab[new_skills.start:], new_skills.start)
+
+    def add_rows(self, rows: SkillMatrix) -> range:
+        """Append rows (a matrix over its own vocabulary) to the matrix and the index, returning their row numbers"""
+        first_row = self.n_rows
+        self._index_rows(self.matrix.append(rows), first_row)
+        self.version += 1
+        return range(first_row, self.n_rows)
+
+    def remove_rows(self, rows: Iterable[int]) -> np.ndarray:
+        """
+        Tombstone rows so they stop matching and leave the frequency tables
+
+        Returns:
+            Ids of the skills listed on the removed rows
+        """
+        if self.removed is None:
+            self.removed = np.zeros(self.n_rows, dtype=bool)
+        rows = np.unique(np.asarray(list(rows), dtype=np.int64))
+        rows = rows[~self.removed[rows]]
+        if not len(rows):
+            return np.empty(0, dtype=np.int32)
+        indptr, indices = self.matrix.indptr, self.matrix.indices
+        entries = [indices[indptr[row]:indptr[row + 1]] for row in rows.tolist()]
+        mentioned = np.concatenate(entries)
+        distinct = np.concatenate([np.unique(skills) for skills in entries])
+        self.occurrences -= np.bincount(mentioned, minlength=len(self.occurrences))
+        self._doc_freq -= np.bincount(distinct, minlength=len(self._doc_freq))
+        self.removed[rows] = True
+        self.version += 1
+        return np.unique(distinct)
+
+    @classmethod
+    def from_skill_lists(cls, skill_lists: Iterable) -> 'SkillIndex':
+        return cls(SkillMatrix.from_skill_lists(skill_lists))
+
+    @classmethod
+    def from_frequencies(cls, vocab: List[str], occurrences: np.ndarray, doc_freq: np.ndarray) -> 'SkillIndex':
+        """
+        Vocabulary lookup and frequency tables without rows or postings
+
+        For callers that count rows elsewhere (the out-of-core analytics merges
+        per row-group counts); row filters are not available on such an index.
+        """
+        index = cls(SkillMatrix(vocab, np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32)))
+        index.occurrences = np.asarray(occurrences, dtype=np.int64)
+        index._doc_freq = np.asarray(doc_freq, dtype=np.int64)
+        return index
+
+    def posting(self, skill_id: int) -> np.ndarray:
+        """Decoded, sorted row numbers for one skill (including removed rows)"""
+        return np.cumsum(self._postings[skill_id], dtype=np.int64)
+
+    def document_frequency(self, skill_id: int) -> int:
+        """Number of active rows listing the skill"""
+        return int(self._doc_freq[skill_id])
+
+    def skill_count(self, skill: str) -> int:
+        """Mentions of an exact (normalized) skill across active rows"""
+        skill_id = self.matrix.skill_ids.get(skill)
+        return 0 if skill_id is None else int(self.occurrences[skill_id])
+
+    def top_skills(self, n: int = 20) -> List[tuple]:
+        """
+        (skill, mentions) pairs, most mentioned first, cached per index version
+
+        Ties keep first-seen order, matching Counter.most_common.
+        """
+        if self._top is None or self._top[:2] != (self.version, n):
+            order = np.argsort(-self.occurrences, kind='stable')[:n]
+            top = [(self.matrix.vocab[i], int(self.occurrences[i])) for i in order.tolist() if self.occurrences[i] > 0]
+            self._top = (self.version, n, top)
+        return self._top[2]
+
+    def matching_skills(self, query: str) -> List[int]:
+        """Ids of vocabulary skills containing query as a substring"""
+        return self._trigrams.matching(query, self.matrix.vocab)
+
+    def matched_skill_ids(self, user_skills: Iterable[str]) -> Optional[set]:
+        """Vocabulary ids matched by any of user_skills, or None when an empty skill matches every row"""
+        queries = {str(skill).strip().lower() for skill in user_skills}
+        if '' in queries:
+            return None
+        return {i for query in queries for i in self.matching_skills(query)}
+
+    def rows_matching(self, user_skills: Iterable[str]) -> np.ndarray:
+        """
+        Sorted row numbers whose skills contain any of user_skills as a
+        case-insensitive substring (the partial-match rule the analytics
+        filters have always used)
+        """
+        return self.rows_with_skills(self.matched_skill_ids(user_skills))
+
+    def rows_with_skills(self, skill_ids: Optional[set]) -> np.ndarray:
+        """Sorted active rows listing any of skill_ids (None means every row)"""
+        if skill_ids is None:
+            mask = np.ones(self.n_rows, dtype=bool)
+        elif not skill_ids:
+            return np.empty(0, dtype=np.int64)
+        else:
+            mask = np.zeros(self.n_rows, dtype=bool)
+            for skill_id in skill_ids:
+                mask[self.posting(skill_id)] = True
+        if self.removed is not None:
+            mask &= ~self.removed
+        return np.flatnonzero(mask)
+
+    def nbytes(self) -> int:
+        """Approximate size of the posting lists and trigram index"""
+        return (
+            sum(p.nbytes for p in self._postings)
+            + self._trigrams.nbytes()
+        )
@@ -0,0 +1,59 @@
+"""
+Local skill matcher
+Finds known job-market skills in free text with n-gram dictionary lookups,
+as a zero-latency stand-in for LLM skill extraction.
+"""
+import re
+from typing import Dict, Iterable, List
+
+from app.services.career.bm25_index import tokenize
+
+_SKILL_SPLIT_RE = re.compile(r'[|,;]+')
+
+
+class SkillMatcher:
+    """Dictionary matcher over a vocabulary of skill phrases"""
+
+    def __init__(self, skills: Iterable[str], max_ngram: int = 4):
+        self.max_ngram = max_ngram
+        self._counts: Dict[str, int] = {}
+        for skill in skills:
+            key = " ".join(tokenize(skill))
+            if len(key) < 2 or len(key.split()) > max_ngram:
+                continue
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    @classmethod
+    def from_skill_strings(cls, skill_strings: Iterable[str], max_ngram: int = 4) -> 'SkillMatcher':
+        """Build from raw 'Key Skills' strings like 'Python | SQL, Excel'"""
+        return cls(
+            (part for text in skill_strings for part in _SKILL_SPLIT_RE.split(str(text or ''))),
+            max_ngram=max_ngram
+        )
+
+    def match(self, text: str, limit: int = 30) -> List[str]:
+        """
+        Find vocabulary skills mentioned in text
+
+        Longer phrases win over the words they contain ("machine learning"
+        is reported instead of "learning").
+
+        Returns:
+            Matched skills, most in-demand first
+        """
+        tokens = tokenize(text)
+        found = set()
+        i = 0
+        while i < len(tokens):
+            for n in range(min(self.max_ngram, len(tokens) - i), 0, -1):
+                phrase = " ".join(tokens[i:i + n])
+                if phrase in self._counts:
+                    found.add(phrase)
+                    i += n
+                    break
+            else:
+                i += 1
+        return sorted(found, key=lambda s: (-self._counts[s], s))[:limit]
@@ -0,0 +1,228 @@
+"""
+Title index for career progression lookups
+Job titles are interned into clusters (one per distinct title) with a trigram
+index over their lower-cased form, and each (title, experience bucket) keeps
+precomputed aggregates: row count, salary sum/count and skill mention counts.
+A progression lookup probes the trigram index for the titles containing the
+role and merges the aggregates of those few clusters instead of scanning,
+re-filtering and re-counting every row.
+"""
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.career.skill_index import SkillMatrix, VocabularyTrigrams
+
+EXPERIENCE_BUCKETS = ('0-2', '3-5', '6-10', '10+')
+
+# (rows, salary sum, salary count, skill ids, skill mentions, first mention position)
+Aggregate = Tuple[int, float, int, np.ndarray, np.ndarray, np.ndarray]
+
+
+def experience_buckets(years: np.ndarray) -> np.ndarray:
+    """Bucket number (position in EXPERIENCE_BUCKETS) per row, -1 when outside every bucket"""
+    buckets = np.full(len(years), -1, dtype=np.int8)
+    buckets[years <= 2] = 0
+    buckets[(years >= 3) & (years <= 5)] = 1
+    buckets[(years >= 6) & (years <= 10)] = 2
+    buckets[years > 10] = 3
+    return buckets
+
+
+def _merge_skill_counts(parts: List[Aggregate]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sum the skill mentions of several aggregates, keeping each skill's earliest position"""
+    skills = np.concatenate([part[3] for part in parts])
+    counts = np.concatenate([part[4] for part in parts])
+    first = np.concatenate([part[5] for part in parts])
+    if len(parts) == 1 or not len(skills):
+        return skills, counts, first
+    order = np.argsort(skills, kind='stable')
+    skills, counts, first = skills[order], counts[order], first[order]
+    starts = np.flatnonzero(np.r_[True, skills[1:] != skills[:-1]])
+    return skills[starts], np.add.reduceat(counts, starts), np.minimum.reduceat(first, starts)
+
+
+class TitleIndex:
+    """Title clusters with trigram lookup and per experience-bucket aggregates"""
+
+    def __init__(self, skills: SkillMatrix):
+        self.skills = skills
+        self.titles: List[str] = []
+        self._keys: List[str] = []  # Lower-cased titles, what queries are matched against
+        self._ids: Dict[str, int] = {}
+        self._trigrams = VocabularyTrigrams()
+        self.row_titles = np.empty(0, dtype=np.int32)  # Title id per row, -1 when missing
+        self.row_buckets = np.empty(0, dtype=np.int8)
+        self.salaries = np.empty(0, dtype=np.float64)
+        self.removed = np.empty(0, dtype=bool)
+        self.aggregates: Dict[Tuple[int, int], Aggregate] = {}
+
+    @classmethod
+    def from_frame(cls, jobs_df: pd.DataFrame, skills: SkillMatrix) -> 'TitleIndex':
+        """Index a preprocessed jobs frame whose rows line up with the skill matrix"""
+        index = cls(skills)
+        index.add_rows(jobs_df)
+        return index
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.row_titles)
+
+    def _intern(self, titles: pd.Series) -> np.ndarray:
+        """Title id per row, adding unseen titles to the clusters and the trigram index"""
+        codes, uniques = pd.factorize(titles)
+        if not len(uniques):
+            return np.full(len(codes), -1, dtype=np.int32)
+        first_id = len(self.titles)
+        ids = np.empty(len(uniques), dtype=np.int32)
+        for i, title in enumerate(uniques):
+            title = str(title)
+            if title not in self._ids:
+                self._ids[title] = len(self.titles)
+                self.titles.append(title)
+                self._keys.append(title.lower())
+            ids[i] = self._ids[title]
+        self._trigrams.add(self._keys[first_id:], first_id)
+        return np.where(codes < 0, -1, ids[np.maximum(codes, 0)]).astype(np.int32)
+
+    def add_rows(self, jobs_df: pd.DataFrame):
+        """Index preprocessed rows appended to the skill matrix (in the same order)"""
+        first_row = self.n_rows
+        titles = jobs_df['Job Title'] if 'Job Title' in jobs_df else pd.Series(np.nan, index=jobs_df.index)
+        self.row_titles = np.concatenate([self.row_titles, self._intern(titles)])
+        years = jobs_df['experience_years'].to_numpy(dtype=np.float64)
+        self.row_buckets = np.concatenate([self.row_buckets, experience_buckets(years)])
+        self.salaries = np.concatenate([self.salaries, jobs_df['salary_clean'].to_numpy(dtype=np.float64)])
+        self.removed = np.concatenate([self.removed, np.zeros(len(jobs_df), dtype=bool)])
+
+        self._merge_aggregates(self._aggregate(np.arange(first_row, self.n_rows)))
+
+    def add_aggregates(self, titles: List[str], aggregates: Dict[Tuple[int, int], Aggregate], entry_offset: int = 0):
+        """
+        Merge aggregates built by another index (e.g. over one row group of a larger corpus)
+
+        Only the aggregates are kept, so rows merged this way cannot be removed.
+
+        Args:
+            titles: The other index's titles (its title ids index this list)
+            aggregates: Its aggregates
+            entry_offset: Position of its first skill entry in the full skill matrix
+        """
+        ids = self._intern(pd.Series(titles, dtype=object))
+        self._merge_aggregates({
+            (int(ids[title_id]), bucket): (*aggregate[:5], aggregate[5] + entry_offset)
+            for (title_id, bucket), aggregate in aggregates.items()
+        })
+
+    def _merge_aggregates(self, aggregates: Dict[Tuple[int, int], Aggregate]):
+        for key, aggregate in aggregates.items():
+            known = self.aggregates.get(key)
+            if known is not None:
+                aggregate = (known[0] + aggregate[0], known[1] + aggregate[1], known[2] + aggregate[2],
+                             *_merge_skill_counts([known, aggregate]))
+            self.aggregates[key] = aggregate
+
+    def remove_rows(self, rows: Iterable[int]):
+        """Drop rows and recompute the aggregates of the title clusters they belonged to"""
+        rows = np.asarray(list(rows), dtype=np.int64)
+        rows = rows[~self.removed[rows]]
+        if not len(rows):
+            return
+        self.removed[rows] = True
+        titles = np.unique(self.row_titles[rows])
+        titles = titles[titles >= 0]
+        for title_id in titles.tolist():
+            for bucket in range(len(EXPERIENCE_BUCKETS)):
+                self.aggregates.pop((title_id, bucket), None)
+        affected = np.flatnonzero(np.isin(self.row_titles, titles) & ~self.removed)
+        self.aggregates.update(self._aggregate(affected))
+
+    def _aggregate(self, rows: np.ndarray) -> Dict[Tuple[int, int], Aggregate]:
+        """Aggregates of the given rows, grouped by (title, bucket)"""
+        rows = rows[(self.row_titles[rows] >= 0) & (self.row_buckets[rows] >= 0)]
+        n_buckets = len(EXPERIENCE_BUCKETS)
+        keys = self.row_titles[rows].astype(np.int64) * n_buckets + self.row_buckets[rows]
+        groups, key_of_row = np.unique(keys, return_inverse=True)
+        row_counts = np.bincount(key_of_row, minlength=len(groups))
+        salaries = self.salaries[rows]
+        has_salary = ~np.isnan(salaries)
+        salary_sums = np.bincount(key_of_row[has_salary], weights=salaries[has_salary], minlength=len(groups))
+        salary_counts = np.bincount(key_of_row[has_salary], minlength=len(groups))
+
+        # Skill entries of those rows; the entry's position in the matrix orders first mentions
+        indptr = self.skills.indptr
+        lengths = indptr[rows + 1] - indptr[rows]
+        entry_group = np.repeat(key_of_row, lengths)
+        positions = np.repeat(indptr[rows] - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        entry_skills = self.skills.indices[positions]
+        order = np.lexsort((positions, entry_skills, entry_group))
+        entry_group, entry_skills, positions = entry_group[order], entry_skills[order], positions[order]
+        boundary = np.ones(len(order), dtype=bool)
+        boundary[1:] = (entry_group[1:] != entry_group[:-1]) | (entry_skills[1:] != entry_skills[:-1])
+        starts = np.flatnonzero(boundary)
+        pair_groups, pair_skills, pair_first = entry_group[starts], entry_skills[starts], positions[starts]
+        pair_counts = np.diff(np.r_[starts, len(order)])
+        bounds = np.searchsorted(pair_groups, np.arange(len(groups) + 1))
+
+        aggregates = {}
+        for g, key in enumerate(groups.tolist()):
+            lo, hi = bounds[g], bounds[g + 1]
+            aggregates[divmod(key, n_buckets)] = (
+                int(row_counts[g]), float(salary_sums[g]), int(salary_counts[g]),
+                pair_skills[lo:hi], pair_counts[lo:hi], pair_first[lo:hi]
+            )
+        return aggregates
+
+    def matching_titles(self, role: str) -> List[int]:
+        """
+        Ids of titles matched by `role` the way `Series.str.contains(role, case=False)` matches
+
+        Plain text goes through the trigram index; a role containing regex
+        syntax is matched as a pattern against the distinct titles (and as
+        literal text if it is not a valid pattern).
+        """
+        if re.escape(role) != role:
+            try:
+                pattern = re.compile(role, flags=re.IGNORECASE)
+                return [i for i, title in enumerate(self.titles) if pattern.search(title)]
+            except re.error:
+                pass
+        return self._trigrams.matching(role.lower(), self._keys)
+
+    def progression(self, role: str) -> Dict[str, Any]:
+        """Common titles, average salary and top skills per experience bucket for titles matching role"""
+        titles = self.matching_titles(role)
+        progression_data = {}
+        for bucket, exp_range in enumerate(EXPERIENCE_BUCKETS):
+            parts = [(title_id, self.aggregates[(title_id, bucket)]) for title_id in titles
+                     if (title_id, bucket) in self.aggregates]
+            if not parts:
+                continue
+            title_counts = Counter({title_id: part[0] for title_id, part in parts})
+            common_titles = {self.titles[title_id]: count
+                             for title_id, count in sorted(title_counts.items(), key=lambda item: -item[1])[:5]}
+            salary_count = sum(part[2] for _, part in parts)
+            avg_salary = sum(part[1] for _, part in parts) / salary_count if salary_count else None
+
+            skills, counts, first = _merge_skill_counts([part for _, part in parts])
+            top = np.lexsort((first, -counts))[:10]
+            vocab = self.skills.vocab
+            top_skills = [(vocab[skills[i]], int(counts[i])) for i in top.tolist()]
+
+            progression_data[exp_range] = {
+                'common_titles': common_titles,
+                'avg_salary': float(avg_salary) if avg_salary else None,
+                'top_skills': top_skills
+            }
+        return progression_data
+
+    def nbytes(self) -> int:
+        """Approximate size of the row arrays, trigram index and aggregates"""
+        return (
+            self.row_titles.nbytes + self.row_buckets.nbytes + self.salaries.nbytes + self.removed.nbytes
+            + self._trigrams.nbytes()
+            + sum(a[3].nbytes + a[4].nbytes + a[5].nbytes for a in self.aggregates.values())
+        )
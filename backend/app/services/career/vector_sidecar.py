@@ -0,0 +1,249 @@
+"""
+Vector search sidecar
+A single local process owns the job index and sentence encoder; every uvicorn
+worker talks to it over a Unix socket instead of opening its own Chroma client
+and model. Memory then stays flat as workers scale, and only one process
+writes to the SQLite-backed store.
+
+Protocol: newline-delimited JSON requests/responses over one persistent
+connection per client thread.
+    {"op": "embed", "texts": [...]}
+    {"op": "search", "queries": [...], "n_results": 10, "mode": null, "filters": {}}
+    {"op": "match_skills", "text": "...", "limit": 30}
+    {"op": "status"}
+
+Usage:
+    python -m app.services.career.vector_sidecar [--socket /tmp/pathfinder-vectors.sock]
+"""
+import argparse
+import asyncio
+import json
+import os
+import queue
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+
+_STREAM_LIMIT = 64 * 1024 * 1024  # Largest single JSON message
+
+
+class SidecarError(Exception):
+    """Raised when the sidecar reports an error or cannot be reached"""
+
+
+class _EmbedBatcher:
+    """Coalesces concurrent embed requests into one encoder call"""
+
+    def __init__(self, engine, executor, window_seconds: float = 0.005, max_texts: int = 256):
+        self.engine = engine
+        self.executor = executor
+        self.window_seconds = window_seconds
+        self.max_texts = max_texts
+        self._pending: List[tuple] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.requests = 0
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((texts, future))
+        self.requests += 1
+        if sum(len(t) for t, _ in self._pending) >= self.max_texts:
+            await self._flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        return await future
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window_seconds)
+        self._flush_task = None
+        await self._flush()
+
+    async def _flush(self):
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        all_texts = [text for texts, _ in pending for text in texts]
+        self.batches += 1
+        try:
+            vectors = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.engine.embed, all_texts
+            )
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+        offset = 0
+        for texts, future in pending:
+            future.set_result(vectors[offset:offset + len(texts)])
+            offset += len(texts)
+
+
+class VectorSidecarServer:
+    """Serves embedding and search requests for one RAGEngine"""
+
+    def __init__(self, engine, socket_path: str, threads: int = 4):
+        self.engine = engine
+        self.socket_path = socket_path
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="sidecar")
+        self.batcher = _EmbedBatcher(engine, self.executor)
+        self.started_at = time.monotonic()
+        self.connections = 0
+        self.served = 0
+
+    async def _dispatch(self, request: Dict[str, Any]) -> Any:
+        op = request.get('op')
+        loop = asyncio.get_running_loop()
+        if op == 'embed':
+            return await self.batcher.embed(request['texts'])
+        if op == 'search':
+            hits = await loop.run_in_executor(
+                self.executor,
+                lambda: self.engine.search_hits(
+                    request['queries'],
+                    request.get('n_results', 10),
+                    request.get('mode'),
+                    request.get('filters')
+                )
+            )
+            return {'hits': hits, 'corpus_version': self.engine.corpus_version}
+        if op == 'match_skills':
+            return await loop.run_in_executor(
+                self.executor, self.engine.match_skills, request['text'], request.get('limit', 30)
+            )
+        if op == 'status':
+            return {
+                'corpus_version': self.engine.corpus_version,
+                'uptime_seconds': round(time.monotonic() - self.started_at, 1),
+                'connections': self.connections,
+                'requests_served': self.served,
+                'embed_requests': self.batcher.requests,
+                'embed_batches': self.batcher.batches,
+                'search_cache': self.engine.search_cache.stats(),
+            }
+        raise ValueError(f"Unknown op: {op}")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    result = await self._dispatch(json.loads(line))
+                    response = {'ok': True, 'result': result}
+                except Exception as e:
+                    response = {'ok': False, 'error': str(e)}
+                self.served += 1
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def serve_forever(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_path, limit=_STREAM_LIMIT)
+        os.chmod(self.socket_path, 0o660)
+        print(f"Vector sidecar listening on {self.socket_path}")
+        async with server:
+            await server.serve_forever()
+
+
+class VectorSidecarClient:
+    """Thread-safe client with pooled, reused Unix-socket connections"""
+
+    def __init__(self, socket_path: str, timeout: float = 30.0, pool_size: int = 8):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._pool: "queue.LifoQueue" = queue.LifoQueue(maxsize=pool_size)
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        return sock, sock.makefile('rb')
+
+    def _release(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn[1].close()
+            conn[0].close()
+
+    def call(self, op: str, **payload) -> Any:
+        """Send one request, reusing a pooled connection (reconnects once on a stale socket)"""
+        message = json.dumps({'op': op, **payload}).encode() + b'\n'
+        for attempt in range(2):
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                try:
+                    conn = self._connect()
+                except OSError as e:
+                    raise SidecarError(f"Vector sidecar unreachable at {self.socket_path}: {e}")
+            try:
+                conn[0].sendall(message)
+                line = conn[1].readline()
+                if not line:
+                    raise ConnectionError("connection closed by sidecar")
+            except (OSError, ConnectionError):
+                conn[1].close()
+                conn[0].close()
+                if attempt:
+                    raise SidecarError("Lost connection to vector sidecar")
+                continue
+            self._release(conn)
+            response = json.loads(line)
+            if not response['ok']:
+                raise SidecarError(response['error'])
+            return response['result']
+
+    def wait_until_ready(self, timeout: float, poll_seconds: float = 1.0) -> Dict[str, Any]:
+        """Poll the sidecar until it answers (it binds only once its index is warm)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self.call('status')
+            except SidecarError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(poll_seconds)
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return self.call('embed', texts=texts)
+
+    def search(self, queries: List[str], n_results: int, mode: Optional[str],
+               filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Return {'hits': per-query [id, metadata, score] lists, 'corpus_version': str}"""
+        return self.call('search', queries=queries, n_results=n_results, mode=mode, filters=filters)
+
+    def match_skills(self, text: str, limit: int = 30) -> List[str]:
+        return self.call('match_skills', text=text, limit=limit)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Run the shared vector search sidecar")
+    parser.add_argument('--socket', default=settings.VECTOR_SIDECAR_SOCKET or '/tmp/pathfinder-vectors.sock')
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    from app.services.career.rag_service import RAGEngine
+    engine = RAGEngine(use_sidecar=False)
+    engine.embed(["warm-up"])
+    try:
+        asyncio.run(VectorSidecarServer(engine, args.socket, threads=args.threads).serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
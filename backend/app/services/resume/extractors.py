@@ -0,0 +1,310 @@
+"""
+Document text extractors
+Plain synchronous functions over a file path, one per format. They are
+CPU-bound, so callers run them through DocumentParsePool (see parse_pool.py)
+rather than on the event loop; they live at module level so worker
+processes can import them by name. Results are plain str/list values.
+"""
+import os
+import warnings
+from typing import List, Optional
+
+# Worker processes do not run app.main, so repeat its pypdf/cryptography ARC4 warning filter
+warnings.filterwarnings("ignore", message=".*ARC4.*", category=DeprecationWarning, module=".*cryptography.*")
+
+from pypdf import PdfReader
+
+# Optional: cv2, pdf2image, pytesseract for OCR (skip on LinuxONE/s390x)
+_cv2 = _pdf2image = _pdfinfo = _pytesseract = _np = None
+try:
+    import cv2 as _cv2
+    import numpy as _np
+    from pdf2image import convert_from_path as _pdf2image, pdfinfo_from_path as _pdfinfo
+    import pytesseract as _pytesseract
+except ImportError:
+    pass
+
+_MAX_SKEW_DEGREES = 10.0  # Tilt searched for when deskewing scans
+_MIN_SKEW_DEGREES = 0.1  # Straighter pages are left as they are
+_MIN_INK_PIXELS = 100  # Fewer (a near-blank page) gives no usable angle
+_MAX_INK_PIXELS = 200_000  # Ink pixels sampled for the angle search
+
+
+def ocr_available() -> bool:
+    return _cv2 is not None and _pdf2image is not None and _pytesseract is not None
+
+
+def pdf_text(file_path: str, preserve_case: bool = False) -> str:
+    """
+    Extract text from all pages of a PDF with pypdf
+
+    Args:
+        file_path: Path to PDF file
+        preserve_case: If True, do not lowercase (use for transcripts/grade reports).
+    """
+    try:
+        reader = PdfReader(file_path)
+        data = ""
+        for page in reader.pages:
+            data = data + (page.extract_text() or "") + "\n"
+        data = data.strip()
+        if not preserve_case:
+            data = data.lower()
+        return data
+    except Exception as e:
+        raise Exception(f"Error extracting text from PDF: {str(e)}")
+
+
+def pdf_page_count(file_path: str) -> int:
+    """Pages in a PDF according to poppler's pdfinfo (0 when it cannot be read)"""
+    if not ocr_available():
+        return 0
+    try:
+        return int(_pdfinfo(file_path)["Pages"])
+    except Exception:
+        return 0
+
+
+def pdf_ocr_page(file_path: str, page: int, dpi: int = 200, deskew_max_side: int = 0) -> Optional[str]:
+    """
+    OCR one page of an image PDF (requires opencv, pdf2image, pytesseract)
+
+    Only this page is rendered, in grayscale at `dpi`; it is deskewed (angle
+    estimated on a copy no larger than deskew_max_side) and read by
+    tesseract. Returns None if the page cannot be rendered or read (as
+    opposed to "" for a page without text), so callers can tell a failed
+    page from a blank one.
+
+    Args:
+        file_path: Path to PDF file
+        page: 1-based page number
+    """
+    if not ocr_available():
+        return None
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")  # Pages run in parallel processes; one tesseract thread each
+    try:
+        images = _pdf2image(file_path, dpi=dpi, first_page=page, last_page=page, grayscale=True)
+        if not images:
+            return None
+        return _pytesseract.image_to_string(deskew(_np.asarray(images[0]), deskew_max_side))
+    except Exception:
+        return None
+
+
+def skew_angle(ink) -> float:
+    """
+    Rotation (degrees, counter-clockwise) that levels the text lines of a binary ink image
+
+    Projection profile: the ink pixels are projected onto the rows for
+    candidate angles within _MAX_SKEW_DEGREES, coarse then fine, and the angle
+    whose row histogram is sharpest (lines and gaps most distinct) wins.
+    Scattered speckle only adds a flat floor, so it does not sway the result.
+    """
+    ys, xs = _np.nonzero(ink)
+    if len(ys) < _MIN_INK_PIXELS:
+        return 0.0
+    stride = max(1, len(ys) // _MAX_INK_PIXELS)
+    ys = ys[::stride] - ink.shape[0] / 2
+    xs = xs[::stride] - ink.shape[1] / 2
+
+    def sharpest(angles):
+        scores = []
+        for angle in angles:
+            radians = _np.deg2rad(angle)
+            rows = _np.rint(ys * _np.cos(radians) - xs * _np.sin(radians)).astype(_np.int64)
+            counts = _np.bincount(rows - rows.min()).astype(_np.float64)
+            scores.append(float(_np.dot(counts, counts)))
+        return float(angles[int(_np.argmax(scores))])
+
+    coarse = sharpest(_np.arange(-_MAX_SKEW_DEGREES, _MAX_SKEW_DEGREES + 1e-9, 0.5))
+    return sharpest(_np.arange(coarse - 0.5, coarse + 0.5 + 1e-9, 0.05))
+
+
+def deskew(image, max_side: int = 0) -> "np.ndarray":
+    """
+    Deskew the given image to correct any tilt
+
+    Args:
+        image: Grayscale or RGB image array
+        max_side: Estimate the angle on a copy scaled down to this many
+            pixels on its longest side (0 = full size); the rotation is
+            applied to the full image
+
+    Returns:
+        Deskewed image
+    """
+    if _cv2 is None or _np is None:
+        return image
+    gray = image if image.ndim == 2 else _cv2.cvtColor(image, _cv2.COLOR_RGB2GRAY)
+    (h, w) = gray.shape
+    if max_side and max(h, w) > max_side:
+        scale = max_side / max(h, w)
+        gray = _cv2.resize(gray, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=_cv2.INTER_AREA)
+    _, ink = _cv2.threshold(gray, 0, 255, _cv2.THRESH_BINARY_INV | _cv2.THRESH_OTSU)
+    angle = skew_angle(ink)
+    if abs(angle) < _MIN_SKEW_DEGREES:
+        return image
+    center = (w // 2, h // 2)
+    M = _cv2.getRotationMatrix2D(center, angle, 1.0)
+    rotated = _cv2.warpAffine(
+        image, M, (w, h),
+        flags=_cv2.INTER_CUBIC,
+        borderMode=_cv2.BORDER_REPLICATE
+    )
+    return rotated
+
+
+def image_text(image) -> str:
+    """Extract text from an image array using OCR"""
+    if _pytesseract is None:
+        return ""
+    try:
+        return _pytesseract.image_to_string(image)
+    except Exception:
+        return ""
+
+
+def pdfplumber_text(file_path: str) -> str:
+    """Fallback PDF text extraction using pdfplumber (often better for complex layouts)."""
+    try:
+        import pdfplumber
+        parts = []
+        with pdfplumber.open(file_path) as pdf:
+            for page in pdf.pages:
+                t = page.extract_text()
+                if t and t.strip():
+                    parts.append(t.strip())
+        return "\n".join(parts).strip()
+    except Exception:
+        return ""
+
+
+def pdfplumber_tables(file_path: str) -> Optional[List[List[List[Optional[str]]]]]:
+    """Every table pdfplumber finds, page by page, as rows of cell strings (None for empty cells); None on failure"""
+    try:
+        import pdfplumber
+        tables = []
+        with pdfplumber.open(file_path) as pdf:
+            for page in pdf.pages:
+                tables.extend(page.extract_tables() or [])
+        return tables
+    except Exception:
+        return None
+
+
+def _shape_text(shape) -> str:
+    """Recursively extract text from a shape (handles groups, tables)."""
+    parts = []
+    try:
+        from pptx.enum.shapes import MSO_SHAPE_TYPE
+        if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+            for child in shape.shapes:
+                t = _shape_text(child)
+                if t:
+                    parts.append(t)
+        else:
+            if shape.has_text_frame:
+                for para in shape.text_frame.paragraphs:
+                    if para.text and para.text.strip():
+                        parts.append(para.text.strip())
+            if shape.has_table:
+                for row in shape.table.rows:
+                    for cell in row.cells:
+                        if cell.text and cell.text.strip():
+                            parts.append(cell.text.strip())
+    except Exception:
+        pass
+    return "\n".join(p for p in parts if p)
+
+
+def _pptx_xml_text(file_path: str) -> str:
+    """Fallback: extract text from PPTX as ZIP + XML when python-pptx returns empty."""
+    import zipfile
+    import xml.etree.ElementTree as ET
+    parts = []
+    try:
+        with zipfile.ZipFile(file_path, "r") as zf:
+            for name in sorted(zf.namelist()):
+                if name.startswith("ppt/slides/slide") and name.endswith(".xml"):
+                    try:
+                        with zf.open(name) as f:
+                            root = ET.parse(f).getroot()
+                            for elem in root.iter():
+                                if elem.tag.endswith("}t"):
+                                    if elem.text:
+                                        t = elem.text.strip()
+                                        if t:
+                                            parts.append(t)
+                                    for child in elem:
+                                        if child.tail and child.tail.strip():
+                                            parts.append(child.tail.strip())
+                    except Exception:
+                        pass
+                if name.startswith("ppt/notesSlides/notesSlide") and name.endswith(".xml"):
+                    try:
+                        with zf.open(name) as f:
+                            root = ET.parse(f).getroot()
+                            for elem in root.iter():
+                                if elem.tag.endswith("}t"):
+                                    if elem.text:
+                                        t = elem.text.strip()
+                                        if t:
+                                            parts.append(t)
+                    except Exception:
+                        pass
+        return "\n".join(parts).strip() if parts else ""
+    except Exception:
+        return ""
+
+
+def pptx_text(file_path: str) -> str:
+    """Extract text from all slides, notes, and shapes in a .pptx file."""
+    try:
+        from pptx import Presentation
+        prs = Presentation(file_path)
+        parts = []
+        for slide in prs.slides:
+            for shape in slide.shapes:
+                t = _shape_text(shape)
+                if t:
+                    parts.append(t)
+            # Extract slide notes
+            try:
+                if slide.has_notes_slide and slide.notes_slide.notes_text_frame:
+                    notes = slide.notes_slide.notes_text_frame.text
+                    if notes and notes.strip():
+                        parts.append(notes.strip())
+            except Exception:
+                pass
+        text = "\n".join(p for p in parts if p).strip()
+        if text:
+            return text
+        # Fallback: extract from PPTX as ZIP + XML (handles shapes python-pptx misses)
+        return _pptx_xml_text(file_path)
+    except Exception:
+        return _pptx_xml_text(file_path)
+
+
+def docx_text(file_path: str) -> str:
+    """Extract text from a .docx file. Tries docx2txt first (pure Python), then python-docx."""
+    # Try docx2txt first - lightweight, no external deps
+    try:
+        import docx2txt
+        text = docx2txt.process(file_path)
+        if text and text.strip():
+            return text.strip()
+    except Exception:
+        pass
+    # Fallback to python-docx
+    try:
+        from docx import Document
+        doc = Document(file_path)
+        parts = [p.text for p in doc.paragraphs if p.text.strip()]
+        for table in doc.tables:
+            for row in table.rows:
+                for cell in row.cells:
+                    if cell.text.strip():
+                        parts.append(cell.text)
+        return "\n".join(parts).strip()
+    except Exception:
+        return ""
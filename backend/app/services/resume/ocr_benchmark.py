@@ -0,0 +1,171 @@
+"""
+OCR benchmark on scanned PDFs
+Times the original serial OCR path (every page rendered up front in colour
+at pdf2image's default 200 DPI, deskewed at full size and read one page after
+another) against ResumeParser's page pipeline (pages rendered one at a time
+in grayscale, deskew angle taken from a downsampled copy, pages read in
+parallel by the parse pool) at each requested DPI. Reports total time, time
+to the first streamed page and word recall. Without PDF arguments it writes
+sample scanned transcripts (rendered text, slightly rotated, with scanner
+speckle) whose words are known; for other PDFs recall is measured against
+the serial path's text.
+
+Usage:
+    python -m app.services.resume.ocr_benchmark [scan.pdf ...] [--pages 10] [--dpi 150 200 300] [--workers 4]
+"""
+import argparse
+import asyncio
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.services.resume import extractors
+
+_COURSES = [
+    "Data Structures and Algorithms", "Machine Learning", "Database Systems", "Operating Systems",
+    "Computer Networks", "Software Engineering", "Cloud Computing", "Statistics for Data Science",
+    "Distributed Systems", "Natural Language Processing", "Computer Vision", "Information Security",
+]
+_GRADES = ["A", "A-", "B+", "B", "B-", "C+", "IP"]
+_FONTS = ["DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "Arial.ttf"]
+
+
+def _font(size: int):
+    from PIL import ImageFont
+    for name in _FONTS:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def write_sample_scan(path: str, pages: int, seed: int = 0, dpi: int = 200) -> str:
+    """Write an image-only transcript PDF of `pages` letter pages; returns its text"""
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(seed)
+    font = _font(dpi * 11 // 72)  # 11pt
+    line_height = dpi * 16 // 72
+    width, height = int(8.5 * dpi), 11 * dpi
+    images, lines = [], []
+    for page in range(pages):
+        image = Image.new("L", (width, height), 255)
+        draw = ImageDraw.Draw(image)
+        y = dpi
+        draw.text((dpi, y), f"Official Transcript - Page {page + 1}", fill=0, font=font)
+        lines.append(f"Official Transcript - Page {page + 1}")
+        y += 2 * line_height
+        while y < height - dpi:
+            line = (f"CS{rng.randint(100, 699)} {rng.choice(_COURSES)} "
+                    f"{rng.choice(['3.0', '4.0', '2.0'])} {rng.choice(_GRADES)}")
+            draw.text((dpi, y), line, fill=0, font=font)
+            lines.append(line)
+            y += line_height
+        image = image.rotate(rng.uniform(-3, 3), resample=Image.BICUBIC, fillcolor=255)
+        pixels = np.asarray(image).copy()
+        speckle = np.random.default_rng(seed + page).random(pixels.shape) < 0.002
+        pixels[speckle] = 0
+        images.append(Image.fromarray(pixels).convert("RGB"))
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=dpi)
+    return "\n".join(lines)
+
+
+def _words(text: str) -> Counter:
+    return Counter(re.findall(r"[a-z0-9][a-z0-9.+-]*", text.lower()))
+
+
+def word_recall(reference: str, text: str) -> float:
+    """Share of the reference's words (with multiplicity) found in text"""
+    expected = _words(reference)
+    if not expected:
+        return 1.0
+    return sum((expected & _words(text)).values()) / sum(expected.values())
+
+
+def serial_ocr(file_path: str) -> Tuple[str, float]:
+    """The original OCR path; returns (text, seconds to its first page)"""
+    started = time.perf_counter()
+    first_page = None
+    texts = []
+    for page in extractors._pdf2image(file_path):
+        texts.append(extractors.image_text(extractors.deskew(np.array(page))))
+        first_page = first_page or time.perf_counter() - started
+    return "\n".join(texts).strip().lower(), first_page or 0.0
+
+
+async def pipeline_ocr(parser, file_path: str, dpi: int) -> Tuple[str, float]:
+    """ResumeParser's streamed page pipeline; returns (text, seconds to its first page)"""
+    started = time.perf_counter()
+    first_page = None
+    texts = []
+    async for _, text in parser.stream_ocr_pages(file_path, dpi=dpi):
+        texts.append(text or "")
+        first_page = first_page or time.perf_counter() - started
+    return "\n".join(texts).strip().lower(), first_page or 0.0
+
+
+async def _run(pdfs: List[Tuple[str, Optional[str]]], dpis: List[int], workers: int):
+    from app.services.resume.parse_pool import DocumentParsePool
+    from app.services.resume.parser import ResumeParser
+
+    pool = DocumentParsePool(workers=workers, max_pending=2 * workers, timeout=600)
+    parser = ResumeParser(pool)
+    # Start every worker before timing
+    await asyncio.gather(*[pool.run(extractors.pdf_page_count, pdfs[0][0]) for _ in range(workers)])
+    print(f"{'document':<28} {'mode':<16} {'dpi':>4} {'seconds':>8} {'first page':>10} {'pages/s':>8} {'recall':>7}")
+    try:
+        for path, truth in pdfs:
+            pages = extractors.pdf_page_count(path)
+            name = os.path.basename(path)
+            started = time.perf_counter()
+            serial_text, first_page = serial_ocr(path)
+            seconds = time.perf_counter() - started
+            reference = truth if truth is not None else serial_text
+            print(f"{name:<28} {'serial':<16} {200:>4} {seconds:8.2f} {first_page:10.2f} "
+                  f"{pages / seconds:8.2f} {word_recall(reference, serial_text):7.1%}")
+            for dpi in dpis:
+                started = time.perf_counter()
+                text, first_page = await pipeline_ocr(parser, path, dpi)
+                seconds = time.perf_counter() - started
+                print(f"{name:<28} {f'pipeline x{workers}':<16} {dpi:>4} {seconds:8.2f} {first_page:10.2f} "
+                      f"{pages / seconds:8.2f} {word_recall(reference, text):7.1%}")
+    finally:
+        pool.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Print serial vs pipelined OCR timings for each PDF"""
+    parser = argparse.ArgumentParser(description="Benchmark OCR of scanned PDFs: serial vs page pipeline")
+    parser.add_argument('pdfs', nargs='*', help="Scanned PDFs (default: generated sample transcripts)")
+    parser.add_argument('--pages', type=int, default=10, help="Pages per generated sample")
+    parser.add_argument('--samples', type=int, default=2, help="Generated samples when no PDFs are given")
+    parser.add_argument('--dpi', type=int, nargs='+', default=[150, 200, 300], help="Pipeline render DPIs")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Parse pool processes")
+    args = parser.parse_args(argv)
+
+    if not extractors.ocr_available():
+        print("OCR needs opencv, pdf2image (poppler) and pytesseract (tesseract)")
+        return 1
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.pdfs:
+            pdfs = [(path, None) for path in args.pdfs]
+        else:
+            pdfs = []
+            for i in range(args.samples):
+                path = os.path.join(tmp, f"sample_scan_{i + 1}.pdf")
+                pdfs.append((path, write_sample_scan(path, args.pages, seed=i)))
+            print(f"Generated {args.samples} sample scans of {args.pages} pages")
+        asyncio.run(_run(pdfs, args.dpi, max(args.workers, 1)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
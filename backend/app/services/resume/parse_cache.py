@@ -0,0 +1,128 @@
+"""
+Cache of parsed uploads
+Students upload the same resume or transcript many times. DocumentParseCache
+keeps each parse result (text, pdfplumber tables, whether OCR produced the
+text) under the SHA-256 of the uploaded bytes plus the parser options, so a
+repeat upload skips the disk write and the parse. It is an LRU bounded by
+entries and by bytes, with a TTL so uploaded documents are not held in
+memory indefinitely.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from app.config import settings
+
+_ENTRY_OVERHEAD = 256  # Rough bytes of bookkeeping per entry
+
+
+class ParsedDocument(NamedTuple):
+    """Result of parsing one uploaded document"""
+    text: str
+    tables: Optional[List[list]]  # pdfplumber tables, when requested
+    ocr: bool  # The text came from OCR
+
+
+def parse_cache_key(content: bytes, **options) -> Tuple:
+    """SHA-256 of the bytes plus the (sorted) parser options"""
+    return (hashlib.sha256(content).hexdigest(),) + tuple(sorted(options.items()))
+
+
+def _nbytes(document: ParsedDocument) -> int:
+    size = _ENTRY_OVERHEAD + len(document.text)
+    for table in document.tables or ():
+        for row in table:
+            size += sum(len(cell or "") for cell in row) + 8 * len(row)
+    return size
+
+
+class DocumentParseCache:
+    """Thread-safe LRU of ParsedDocument bounded by entries and bytes, with TTL and metrics"""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        """
+        Args:
+            max_entries: Documents kept (defaults to DOCUMENT_CACHE_MAX_ENTRIES; 0 disables)
+            max_bytes: Approximate text bytes kept (defaults to DOCUMENT_CACHE_MAX_BYTES)
+            ttl_seconds: Lifetime of an entry (defaults to DOCUMENT_CACHE_TTL_SECONDS)
+        """
+        self.max_entries = settings.DOCUMENT_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.max_bytes = settings.DOCUMENT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.ttl_seconds = settings.DOCUMENT_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        # key -> (expires_at, nbytes, parse_seconds, document)
+        self._entries: "OrderedDict[Tuple, Tuple[float, int, float, ParsedDocument]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.seconds_saved = 0.0  # Parse time the hits did not spend
+
+    def get(self, key: Tuple) -> Optional[ParsedDocument]:
+        """Return the cached document, or None on miss/expiry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                    self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.seconds_saved += entry[2]
+            return entry[3]
+
+    def set(self, key: Tuple, document: ParsedDocument, parse_seconds: float = 0.0):
+        """Store a document, evicting least recently used ones until within both bounds"""
+        nbytes = _nbytes(document)
+        if self.max_entries <= 0 or nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, nbytes, parse_seconds, document)
+            self.nbytes += nbytes
+            while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: Tuple):
+        """Drop one entry (caller holds the lock)"""
+        self.nbytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate, size and eviction metrics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'size': len(self._entries),
+                'bytes': self.nbytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'parse_seconds_saved': round(self.seconds_saved, 3),
+            }
+
+
+# Shared by every ResumeParser
+document_parse_cache = DocumentParseCache()
@@ -0,0 +1,280 @@
+"""
+Process pool for document parsing
+DocumentParsePool runs the CPU-bound extractors (pypdf, pdfplumber,
+docx2txt, python-pptx, OCR; see extractors.py) in worker processes, so a
+40-page transcript no longer stalls the event loop. Work is bounded twice:
+at most `workers` documents parse at once and at most `max_pending` wait or
+parse; beyond that run() raises DocumentParseBusy. Every task has a deadline
+covering its wait and its parse. A task that overruns it, or whose request
+is cancelled, has its worker process killed and replaced, so a pathological
+document cannot hold a worker forever.
+"""
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import numpy as np
+
+from app.config import settings
+
+_POLL_SECONDS = 0.05  # How often a waiting task checks its deadline and cancel flag
+_SAMPLES = 512  # Recent durations kept per document kind for the percentiles
+
+# Task outcomes
+COMPLETED = 'completed'
+FAILED = 'failed'
+TIMED_OUT = 'timed_out'
+CANCELLED = 'cancelled'
+
+
+class DocumentParseBusy(Exception):
+    """Too many documents are already waiting or parsing"""
+
+
+class DocumentParseTimeout(TimeoutError):
+    """A document did not parse before its deadline"""
+
+
+def _worker_main(conn):
+    """Worker process loop: run (fn, args) tasks from the pipe until it closes"""
+    conn.send(None)  # Ready: imports are done
+    while True:
+        try:
+            fn, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            reply = (True, fn(*args))
+        except Exception as e:
+            reply = (False, e)
+        try:
+            conn.send(reply)
+        except Exception as e:  # Unpicklable result or exception
+            conn.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker:
+    """One parser process and the parent's end of its pipe"""
+
+    def __init__(self, context, generation: int):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child,), name="document-parse", daemon=True)
+        self.process.start()
+        child.close()
+        self.generation = generation
+        self.conn.recv()  # Wait for the ready message, so start-up counts as queue wait rather than parse time
+
+    def stop(self, kill: bool = False):
+        """Close the pipe (the worker exits on EOF); kill it outright when it may be mid-task"""
+        if kill:
+            self.process.kill()
+        self.conn.close()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+
+def _summary(samples) -> Dict[str, Any]:
+    if not samples:
+        return {'samples': 0}
+    values = np.fromiter(samples, dtype=np.float64)
+    p50, p95 = np.percentile(values, [50, 95])
+    return {
+        'samples': len(values),
+        'mean': round(float(values.mean()), 4),
+        'p50': round(float(p50), 4),
+        'p95': round(float(p95), 4),
+        'max': round(float(values.max()), 4),
+    }
+
+
+class DocumentParsePool:
+    """Bounded pool of parser processes with per-task deadlines, cancellation and metrics"""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Worker processes are spawned on first use, not here.
+
+        Args:
+            workers: Parser processes (defaults to DOCUMENT_PARSE_WORKERS; 0
+                parses in threads, which keeps the event loop free but cannot
+                stop a parse that overruns)
+            max_pending: Documents allowed to wait or parse at once (defaults
+                to DOCUMENT_PARSE_MAX_PENDING)
+            timeout: Default per-document deadline in seconds, wait included
+                (defaults to DOCUMENT_PARSE_TIMEOUT_SECONDS)
+        """
+        self.workers = settings.DOCUMENT_PARSE_WORKERS if workers is None else workers
+        max_pending = settings.DOCUMENT_PARSE_MAX_PENDING if max_pending is None else max_pending
+        self.max_pending = max(max_pending, self.workers, 1)
+        self.timeout = settings.DOCUMENT_PARSE_TIMEOUT_SECONDS if timeout is None else timeout
+        self._context = multiprocessing.get_context('spawn')  # The server has threads; never fork it
+        self._lock = threading.Condition()
+        self._idle: List[_Worker] = []
+        self._alive = 0
+        self._waiting = 0
+        self._running = 0
+        self._generation = 0  # Bumped by close(); workers of older generations are stopped when released
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self.counts = {COMPLETED: 0, FAILED: 0, TIMED_OUT: 0, CANCELLED: 0, 'rejected': 0, 'recycled': 0}
+        self._wait_seconds: Deque[float] = deque(maxlen=_SAMPLES)
+        self._parse_seconds: Dict[str, Deque[float]] = {}
+
+    async def run(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None) -> Any:
+        """
+        Run fn(*args) in a parser process and return its result
+
+        fn must be a module-level function (workers import it by name) and
+        its arguments and result must pickle. Exceptions raised by fn are
+        re-raised here.
+
+        Raises:
+            DocumentParseBusy: max_pending documents are already queued or parsing
+            DocumentParseTimeout: No result within `timeout` seconds of the call
+        """
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            if self._waiting + self._running >= self.max_pending:
+                self.counts['rejected'] += 1
+                raise DocumentParseBusy(
+                    f"{self._waiting + self._running} documents are already being parsed. Retry shortly."
+                )
+            self._waiting += 1
+            if self._threads is None:
+                # One thread per admitted task waits on its worker's pipe
+                self._threads = ThreadPoolExecutor(max_workers=self.max_pending, thread_name_prefix="document-parse")
+            threads = self._threads
+        cancel = threading.Event()
+        task = threads.submit(self._execute, fn, args, time.monotonic() + timeout, timeout, cancel)
+        try:
+            return await asyncio.wrap_future(task)
+        except asyncio.CancelledError:
+            cancel.set()  # A running task kills its worker and returns
+            if task.cancel():  # Never started
+                self._finish(None, False, fn.__name__, CANCELLED, started=False)
+            raise
+
+    def _execute(self, fn, args, deadline: float, timeout: float, cancel: threading.Event):
+        kind = fn.__name__
+        queued_at = time.monotonic()
+        worker = self._acquire(kind, deadline, timeout, cancel)
+        started_at = time.monotonic()
+        healthy, outcome = False, FAILED
+        try:
+            if worker is None:
+                value = fn(*args)
+                healthy, outcome = True, COMPLETED
+                return value
+            worker.conn.send((fn, args))
+            while not worker.conn.poll(_POLL_SECONDS):
+                if cancel.is_set():
+                    outcome = CANCELLED
+                    return None
+                if time.monotonic() >= deadline:
+                    outcome = TIMED_OUT
+                    raise DocumentParseTimeout(f"Parsing the document ({kind}) took longer than {timeout:g}s")
+            try:
+                ok, value = worker.conn.recv()
+            except (EOFError, OSError):
+                raise RuntimeError(f"Document parser process exited while running {kind}") from None
+            healthy = True
+            if not ok:
+                raise value
+            outcome = COMPLETED
+            return value
+        finally:
+            self._finish(worker, healthy, kind, outcome, started_at - queued_at, time.monotonic() - started_at)
+
+    def _acquire(self, kind: str, deadline: float, timeout: float, cancel: threading.Event) -> Optional[_Worker]:
+        """Wait for an idle worker (spawning one while under `workers`); None in thread mode"""
+        with self._lock:
+            while self.workers > 0 and not self._idle and self._alive >= self.workers:
+                remaining = deadline - time.monotonic()
+                if cancel.is_set() or remaining <= 0:
+                    self._waiting -= 1
+                    if cancel.is_set():
+                        self.counts[CANCELLED] += 1
+                        raise asyncio.CancelledError()
+                    self.counts[TIMED_OUT] += 1
+                    raise DocumentParseTimeout(f"No document parser was free within {timeout:g}s")
+                self._lock.wait(min(remaining, _POLL_SECONDS))
+            self._waiting -= 1
+            self._running += 1
+            if self.workers <= 0:
+                return None
+            if self._idle:
+                return self._idle.pop()
+            self._alive += 1
+            generation = self._generation
+        try:
+            return _Worker(self._context, generation)  # Spawn outside the lock
+        except Exception:
+            with self._lock:
+                self._alive -= 1
+            self._finish(None, False, kind, FAILED)
+            raise
+
+    def _finish(self, worker: Optional[_Worker], healthy: bool, kind: str, outcome: str,
+                wait_seconds: Optional[float] = None, parse_seconds: Optional[float] = None,
+                started: bool = True):
+        """Return (or replace) a task's worker and record its outcome"""
+        if worker is not None and not healthy:
+            worker.stop(kill=True)  # Mid-task or dead; a replacement is spawned on demand
+        with self._lock:
+            retire = worker is not None and (not healthy or worker.generation != self._generation)
+            if started:
+                self._running -= 1
+            else:
+                self._waiting -= 1
+            if worker is not None:
+                if retire:
+                    self._alive -= 1
+                    self.counts['recycled'] += not healthy
+                else:
+                    self._idle.append(worker)
+            self.counts[outcome] += 1
+            if wait_seconds is not None:
+                self._wait_seconds.append(wait_seconds)
+            if outcome == COMPLETED and parse_seconds is not None:
+                self._parse_seconds.setdefault(kind, deque(maxlen=_SAMPLES)).append(parse_seconds)
+            self._lock.notify()
+        if retire and healthy:
+            worker.stop()
+
+    def close(self):
+        """Stop idle workers now and busy ones once their task finishes; the pool respawns on next use"""
+        with self._lock:
+            self._generation += 1
+            idle, self._idle = self._idle, []
+            self._alive -= len(idle)
+        for worker in idle:
+            worker.stop()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, outcome counts and wait/parse-time percentiles (seconds) per document kind"""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'alive': self._alive,
+                'busy': self._running,
+                'queue_depth': self._waiting,
+                'max_pending': self.max_pending,
+                'timeout_seconds': self.timeout,
+                **self.counts,
+                'wait_seconds': _summary(self._wait_seconds),
+                'parse_seconds': {kind: _summary(samples) for kind, samples in sorted(self._parse_seconds.items())},
+            }
+
+
+# Shared by every ResumeParser; processes start on the first upload
+document_parse_pool = DocumentParsePool()
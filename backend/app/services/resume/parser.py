@@ -1,30 +1,29 @@
 """
 Resume parser service - extracts text from PDF and images
 Adapted from resume-analyzer-main/src/file_reader.py
+The extraction itself (extractors.py) runs in the shared document parse
+pool, off the event loop.
 """
+import asyncio
 import os
-from pathlib import Path
-from typing import Optional
-from pypdf import PdfReader
+import time
+import uuid
+from collections import deque
+from typing import AsyncIterator, List, Optional, Tuple
 from app.config import settings
-
-# Optional: cv2, pdf2image, pytesseract for OCR (skip on LinuxONE/s390x)
-_cv2 = _pdf2image = _pytesseract = _np = None
-try:
-    import cv2 as _cv2
-    import numpy as _np
-    from pdf2image import convert_from_path as _pdf2image
-    import pytesseract as _pytesseract
-except ImportError:
-    pass
+from app.services.resume import extractors
+from app.services.resume.parse_cache import DocumentParseCache, ParsedDocument, document_parse_cache, parse_cache_key
+from app.services.resume.parse_pool import DocumentParsePool, document_parse_pool
 
 
 class ResumeParser:
     """Parse resumes from PDF and image files"""
-    
-    def __init__(self):
+
+    def __init__(self, pool: Optional[DocumentParsePool] = None, cache: Optional[DocumentParseCache] = None):
         self.upload_dir = settings.UPLOAD_DIR
-    
+        self.pool = pool or document_parse_pool
+        self.cache = cache or document_parse_cache
+
     async def extract_text_from_pdf(self, file_path: str, preserve_case: bool = False) -> str:
         """
         Extract text from PDF file (all pages).
@@ -36,36 +35,77 @@ class ResumeParser:
         Returns:
             Extracted text content
         """
-        try:
-            reader = PdfReader(file_path)
-            data = ""
-            for page in reader.pages:
-                data = data + (page.extract_text() or "") + "\n"
-            data = data.strip()
-            if not preserve_case:
-                data = data.lower()
-            return data
-        except Exception as e:
-            raise Exception(f"Error extracting text from PDF: {str(e)}")
-    
+        return await self.pool.run(extractors.pdf_text, file_path, preserve_case)
+
     async def extract_text_from_image(self, file_path: str) -> str:
         """
         Extract text from image PDF using OCR (requires opencv, pdf2image, pytesseract).
         Returns empty string if OCR libs unavailable (e.g. LinuxONE minimal build).
         """
-        if _cv2 is None or _pdf2image is None or _pytesseract is None:
-            return ""
+        return (await self._ocr_text(file_path))[0]
+
+    async def _ocr_text(self, file_path: str) -> Tuple[str, bool]:
+        """(OCR text of all pages, whether every page was read)"""
+        if not extractors.ocr_available():
+            return "", False
+        pages, complete = [], True
+        async for _, text in self.stream_ocr_pages(file_path):
+            if text is None:
+                complete = False
+            else:
+                pages.append(text)
+        return "\n".join(pages).strip().lower(), complete
+
+    async def stream_ocr_pages(self, file_path: str, dpi: Optional[int] = None) -> AsyncIterator[Tuple[int, Optional[str]]]:
+        """
+        OCR an image PDF page by page, yielding (page number, text) in page order
+
+        The text is None for a page that could not be rendered or read.
+
+        Each page is rendered, deskewed and read in the parse pool, with one
+        page per pool worker in flight, so early pages arrive while later
+        ones are still being read. Leaving the loop early cancels the rest.
+
+        Args:
+            file_path: Path to PDF file
+            dpi: Render resolution (defaults to OCR_DPI)
+        """
+        if not extractors.ocr_available():
+            return
+        dpi = dpi or settings.OCR_DPI
+        page_count = await self.pool.run(extractors.pdf_page_count, file_path)
+        in_flight = max(self.pool.workers, 1)
+        pending = deque()
+        next_page = 1
         try:
-            pages = _pdf2image(file_path)
-            extracted_text = []
-            for page in pages:
-                preprocessed_image = self._deskew(_np.array(page))
-                text = self._get_text_from_image(preprocessed_image)
-                extracted_text.append(text)
-            return "\n".join(extracted_text).strip().lower()
-        except Exception:
-            return ""
-    
+            while next_page <= page_count or pending:
+                while next_page <= page_count and len(pending) < in_flight:
+                    pending.append((next_page, asyncio.ensure_future(self.pool.run(
+                        extractors.pdf_ocr_page, file_path, next_page, dpi, settings.OCR_DESKEW_MAX_SIDE
+                    ))))
+                    next_page += 1
+                page, task = pending.popleft()
+                yield page, await task
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def extract_text_with_pdfplumber(self, file_path: str) -> str:
+        """PDF text via pdfplumber (often better for complex layouts); empty on failure"""
+        return await self.pool.run(extractors.pdfplumber_text, file_path)
+
+    async def extract_pdf_tables(self, file_path: str) -> Optional[List[list]]:
+        """Tables found by pdfplumber, as rows of cell strings; None on failure"""
+        return await self.pool.run(extractors.pdfplumber_tables, file_path)
+
+    async def extract_text_from_docx(self, file_path: str) -> str:
+        """Text of a .docx file (docx2txt, then python-docx); empty on failure"""
+        return await self.pool.run(extractors.docx_text, file_path)
+
+    async def extract_text_from_pptx(self, file_path: str) -> str:
+        """Text of all slides, notes and shapes of a .pptx file; empty on failure"""
+        return await self.pool.run(extractors.pptx_text, file_path)
+
     async def parse_resume(self, file_path: str, preserve_case: bool = False) -> str:
         """
         Parse resume or transcript file (PDF or image).
@@ -77,63 +117,85 @@ class ResumeParser:
         Returns:
             Extracted text content
         """
+        return (await self._parse_pdf(file_path, preserve_case))[0]
+
+    async def _parse_pdf(self, file_path: str, preserve_case: bool) -> Tuple[str, bool, bool]:
+        """(text, whether OCR produced it, whether every OCR page was read)"""
         # Try PDF text extraction first
         data = await self.extract_text_from_pdf(file_path, preserve_case=preserve_case)
         # If extraction yields very little text, try OCR (resume parser uses lowercased OCR)
         if len(data) <= 100:
-            data = await self.extract_text_from_image(file_path)
-            if preserve_case:
-                data = data  # OCR already returns mixed case
-            # else keep .lower() from extract_text_from_image
-        return data
-    
-    @staticmethod
-    def _deskew(image) -> "np.ndarray":
+            text, complete = await self._ocr_text(file_path)
+            return text, True, complete
+        return data, False, True
+
+    async def parse_upload(
+        self,
+        content: bytes,
+        suffix: str,
+        preserve_case: bool = False,
+        with_tables: bool = False,
+        file_path: Optional[str] = None
+    ) -> ParsedDocument:
         """
-        Deskew the given image to correct any tilt
-        
+        Parse uploaded bytes, reusing the result of an identical earlier upload
+
+        PDFs go through parse_resume (pypdf, then OCR), then pdfplumber when
+        both find nothing; .docx and .pptx through their own extractors.
+        Results are cached on the SHA-256 of the bytes plus these options,
+        unless the text came out empty or part of the document could not be
+        read (an OCR page or the tables failed), so a retry parses again.
+
         Args:
-            image: Image array
-            
-        Returns:
-            Deskewed image
+            content: Uploaded file bytes
+            suffix: File extension (".pdf", ".docx", ".pptx")
+            preserve_case: If True, do not lowercase PDF text
+            with_tables: Also extract PDF tables with pdfplumber
+            file_path: Where the bytes are already saved; otherwise they are
+                written to a temporary upload file for the parse and removed
         """
-        if _cv2 is None or _np is None:
-            return image
-        gray = _cv2.cvtColor(image, _cv2.COLOR_BGR2GRAY)
-        gray = _cv2.bitwise_not(gray)
-        coords = _np.column_stack(_np.where(gray > 0))
-        if len(coords) == 0:
-            return image
-        angle = _cv2.minAreaRect(coords)[-1]
-        if angle < -45:
-            angle = -(90 + angle)
-        else:
-            angle = -angle
-        (h, w) = image.shape[:2]
-        center = (w // 2, h // 2)
-        M = _cv2.getRotationMatrix2D(center, angle, 1.0)
-        rotated = _cv2.warpAffine(
-            image, M, (w, h),
-            flags=_cv2.INTER_CUBIC,
-            borderMode=_cv2.BORDER_REPLICATE
+        suffix = suffix.lower()
+        key = await asyncio.to_thread(
+            parse_cache_key, content, suffix=suffix, preserve_case=preserve_case,
+            tables=with_tables, ocr_dpi=settings.OCR_DPI
         )
-        return rotated
-    
-    @staticmethod
-    def _get_text_from_image(image) -> str:
-        """
-        Extract text from image using OCR
-        
-        Args:
-            image: Image array
-            
-        Returns:
-            Extracted text
-        """
-        if _pytesseract is None:
-            return ""
+        document = self.cache.get(key)
+        if document is not None:
+            return document
+
+        started = time.monotonic()
+        path = file_path or str(self.upload_dir / f"parse_{uuid.uuid4().hex}{suffix}")
         try:
-            return _pytesseract.image_to_string(image)
-        except Exception:
-            return ""
+            if file_path is None:
+                with open(path, "wb") as f:
+                    f.write(content)
+            document, complete = await self._parse_file(path, suffix, preserve_case, with_tables)
+        finally:
+            if file_path is None and os.path.exists(path):
+                try:
+                    os.remove(path)
+                except Exception:
+                    pass
+        if complete and document.text.strip():
+            self.cache.set(key, document, time.monotonic() - started)
+        return document
+
+    async def _parse_file(
+        self, file_path: str, suffix: str, preserve_case: bool, with_tables: bool
+    ) -> Tuple[ParsedDocument, bool]:
+        """(document, whether every part of it was read)"""
+        if suffix == ".docx":
+            return ParsedDocument(await self.extract_text_from_docx(file_path), None, False), True
+        if suffix == ".pptx":
+            return ParsedDocument(await self.extract_text_from_pptx(file_path), None, False), True
+        text, ocr, complete = await self._parse_pdf(file_path, preserve_case)
+        if not text.strip():
+            text, ocr = await self.extract_text_with_pdfplumber(file_path), False
+            if not preserve_case:
+                text = text.lower()
+        tables = None
+        if with_tables:
+            tables = await self.extract_pdf_tables(file_path)
+            if tables is None:
+                tables, complete = [], False
+        return ParsedDocument(text, tables, ocr), complete